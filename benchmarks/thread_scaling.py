@@ -0,0 +1,110 @@
+"""Measure how calendar queries scale with threads sharing one calendar.
+
+Runs is_business_day and add_business_days on a single shared Calendar from 1 to N threads,
+and reports the throughput and its scaling relative to one thread. On CPython builds with the
+GIL, throughput stays flat as threads are added; on free-threaded builds (3.13t and later) it
+should grow close to linearly with the number of cores:
+
+    $ python benchmarks/thread_scaling.py --load-path lib/calendars --calendar bacs --threads 8
+
+Without --calendar, a calendar with a holiday every first weekday of the month from 1990 to
+2050 is used.
+"""
+import argparse
+import datetime
+import os
+import sys
+import threading
+import time
+from typing import Callable, List, Optional
+
+from business.calendar import Calendar
+from business.cli import load_definition
+
+
+def _queries(calendar: Calendar, operation: str) -> Callable[[int], None]:
+    start = datetime.date(2020, 1, 1)
+    dates = [start + datetime.timedelta(days=i) for i in range(366)]
+    if operation == "is_business_day":
+
+        def run(count: int) -> None:
+            for i in range(count):
+                calendar.is_business_day(dates[i % 366])
+
+    else:
+
+        def run(count: int) -> None:
+            for i in range(count):
+                calendar.add_business_days(dates[i % 366], i % 20 + 1)
+
+    return run
+
+
+def measure(run: Callable[[int], None], threads: int, count: int) -> float:
+    """Return the number of queries per second answered by the threads together."""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker() -> None:
+        barrier.wait()
+        run(count)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * count / (time.perf_counter() - started)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calendar", help="name of the calendar to load")
+    parser.add_argument(
+        "--load-path",
+        action="append",
+        default=[],
+        help="directory containing calendar files, may be repeated",
+    )
+    parser.add_argument("--engine", default="reference", help="calculation engine")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--count", type=int, default=20000, help="queries per thread")
+    parser.add_argument("--memoize", type=int, help="enable memoization with this size")
+    args = parser.parse_args(argv)
+
+    if args.calendar:
+        definition = load_definition(args.calendar, args.load_path)
+    else:
+        definition = {
+            "holidays": [
+                datetime.date(year, month, 1)
+                for year in range(1990, 2051)
+                for month in range(1, 13)
+            ]
+        }
+    calendar = Calendar(
+        holidays=definition.get("holidays"),
+        working_days=definition.get("working_days"),
+        extra_working_dates=definition.get("extra_working_dates"),
+        engine=args.engine,
+    )
+    if args.memoize:
+        calendar.memoize(args.memoize)
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    for operation in ["is_business_day", "add_business_days"]:
+        run = _queries(calendar, operation)
+        run(1000)  # warm up
+        print(f"\n{operation}\n{'threads':>8} {'queries/s':>12} {'scaling':>8}")
+        baseline = None
+        for threads in range(1, args.threads + 1):
+            throughput = measure(run, threads, args.count)
+            baseline = baseline or throughput
+            print(f"{threads:>8} {throughput:>12,.0f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
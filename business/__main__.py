@@ -0,0 +1,6 @@
+"""Run the command line interface with `python -m business`."""
+import sys
+
+from business.cli import main
+
+sys.exit(main())
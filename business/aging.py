@@ -0,0 +1,116 @@
+"""Business day ages of many dates against a single as-of date.
+
+Ageing reports count the business days from each open item's date to the same as-of date,
+for many items at once. Calling business_days_between for each item searches the holidays
+again for every one of them. Instead, business_age sorts the distinct dates once and walks
+the calendar's holidays and extra working dates alongside them in a single pass:
+
+>>> calendar = Calendar.load("bacs")
+>>> calendar.business_age(["2022-12-23", "2022-12-28", "2022-12-30"], "2023-01-03")
+    [4, 3, 1]
+>>> calendar.bucket_by_business_age(
+...     ["2022-12-23", "2022-12-28", "2022-12-30"], "2023-01-03", [1, 6, 31]
+... )
+    [0, 3, 0, 0]  # ages below 1, 1 to 5, 6 to 30, and 31 or more
+
+Dates given as a NumPy ``datetime64`` array are aged with vectorised operations instead,
+returning an array of ages.
+"""
+import bisect
+import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover
+    from business.calendar import CalendarData
+
+# ordinal of 1970-01-01, the epoch of NumPy's datetime64 values
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def is_array(dates: Any) -> bool:
+    """Return true if the dates are a NumPy array, to be aged with the vectorised path."""
+    return hasattr(dates, "dtype") and hasattr(dates, "shape")
+
+
+def business_ages(
+    data: "CalendarData", dates: Sequence[datetime.date], as_of: datetime.date
+) -> List[int]:
+    """Count the business days from start of each date to start of as_of.
+
+    Dates after as_of have negative ages, as with business_days_between.
+    """
+    week = data.week
+    working_holidays = data.working_holidays
+    extra_working_dates = data.extra_working_dates
+    # business days in [0001-01-01, as_of), less those in [0001-01-01, d) for each date d
+    as_of_count = (
+        week.count(as_of.toordinal())
+        + bisect.bisect_left(extra_working_dates, as_of)
+        - bisect.bisect_left(working_holidays, as_of)
+    )
+
+    ages: Dict[datetime.date, int] = {}
+    h = e = 0
+    for d in sorted(set(dates)):
+        while h < len(working_holidays) and working_holidays[h] < d:
+            h += 1
+        while e < len(extra_working_dates) and extra_working_dates[e] < d:
+            e += 1
+        ages[d] = as_of_count - (week.count(d.toordinal()) + e - h)
+    return [ages[d] for d in dates]
+
+
+def business_ages_array(data: "CalendarData", dates: Any, as_of: datetime.date) -> Any:
+    """Count the business days from each date of a datetime64 array to as_of, with NumPy."""
+    import numpy as np
+
+    if np.isnat(dates).any():
+        raise ValueError("Cannot age missing (NaT) dates")
+    ordinals = dates.astype("datetime64[D]").astype(np.int64) + EPOCH_ORDINAL
+
+    week = data.week
+    starts = np.array(week.starts, dtype=np.int64)
+    segment = np.maximum(np.searchsorted(starts, ordinals, side="right") - 1, 0)
+    weeks, days = np.divmod(ordinals - 1, 7)
+    # WorkingWeek.count, for every ordinal at once
+    weekly = (
+        np.array(week._counts, dtype=np.int64)[segment]
+        + weeks * np.array([len(p) for p in week.patterns], dtype=np.int64)[segment]
+        + np.array(week._prefixes, dtype=np.int64)[segment, days]
+        - np.array(
+            [week._weekly_count(i, start) for i, start in enumerate(week.starts)],
+            dtype=np.int64,
+        )[segment]
+    )
+
+    def count_before(sorted_dates: List[datetime.date]) -> Any:
+        values = np.array([d.toordinal() for d in sorted_dates], dtype=np.int64)
+        return np.searchsorted(values, ordinals, side="left")
+
+    as_of_count = (
+        week.count(as_of.toordinal())
+        + bisect.bisect_left(data.extra_working_dates, as_of)
+        - bisect.bisect_left(data.working_holidays, as_of)
+    )
+    return as_of_count - (
+        weekly + count_before(data.extra_working_dates) - count_before(data.working_holidays)
+    )
+
+
+def bucket_counts(ages: Any, buckets: Sequence[int]) -> List[int]:
+    """Count the ages in each bucket delimited by ascending bounds.
+
+    Bucket 0 holds ages below buckets[0], bucket i ages in [buckets[i - 1], buckets[i]), and
+    the last bucket ages of buckets[-1] or more.
+    """
+    if any(a >= b for a, b in zip(buckets, buckets[1:])):
+        raise ValueError(f"Bucket bounds must be strictly ascending: {list(buckets)}")
+    if is_array(ages):
+        import numpy as np
+
+        indexes = np.searchsorted(np.array(buckets, dtype=np.int64), ages, side="right")
+        return [int(c) for c in np.bincount(indexes, minlength=len(buckets) + 1)]
+    counts = [0] * (len(buckets) + 1)
+    for age in ages:
+        counts[bisect.bisect_right(buckets, age)] += 1
+    return counts
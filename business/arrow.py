@@ -0,0 +1,256 @@
+"""Vectorised calendar operations over Apache Arrow date columns.
+
+This module needs the optional ``pyarrow`` and ``numpy`` packages. Functions take ``date32``
+arrays (or chunked arrays, e.g. a column of a ``pyarrow.Table``) and read their data buffers
+without copying them. Results have the same length and nulls as their inputs.
+
+As with their methods, calendar windows raise OutsideWindowError when a date or result is
+outside the window, or answer with the full calendar if created with fallback=True.
+
+>>> import pyarrow as pa
+>>> from business import arrow
+>>> dates = pa.array([datetime.date(2020, 1, 1), datetime.date(2020, 1, 4)], pa.date32())
+>>> arrow.add_business_days(calendar, dates, 1)
+    [2020-01-02, 2020-01-07]
+"""
+import datetime
+import functools
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union, cast
+
+try:
+    import numpy as np
+    import pyarrow as pa
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "business.arrow requires the optional pyarrow and numpy packages: "
+        "pip install pyarrow numpy"
+    ) from e
+
+from business.calendar import Calendar
+from business.window import CalendarWindow, OutsideWindowError, WindowData
+
+# a pyarrow.Array or pyarrow.ChunkedArray of dates
+ArrowDates = Any
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+EPOCH = datetime.date(1970, 1, 1)
+# 1970-01-01 was a Thursday
+EPOCH_WEEKDAY = EPOCH.weekday()
+
+
+def _to_days(input_date: datetime.date) -> int:
+    """Convert a date to days since the epoch, as stored in date32 arrays."""
+    return (input_date - EPOCH).days
+
+
+def to_arrow(calendar: Calendar) -> Dict[str, Any]:
+    """Export a calendar's data as Arrow arrays.
+
+    Returns ``holidays`` and ``extra_working_dates`` as sorted date32 arrays, and
+    ``working_days`` as a boolean array of length 7, indexed by weekday (Monday is 0).
+    Calendars whose working week changes over time are not supported, nor calendar windows,
+    whose holidays outside the window are unknown.
+    """
+    if isinstance(calendar, CalendarWindow):
+        raise ValueError("Calendar windows cannot be exported to Arrow")
+    if calendar.working_days_from:
+        raise ValueError("Calendars with working_days_from cannot be exported to Arrow")
+    return {
+        "holidays": pa.array(calendar.holidays, pa.date32()),
+        "extra_working_dates": pa.array(calendar.extra_working_dates, pa.date32()),
+        "working_days": pa.array([d in calendar.working_days for d in Calendar.DAY_NAMES]),
+    }
+
+
+def _values(dates: ArrowDates) -> Tuple[Any, Optional[Any]]:
+    """Return the days since epoch of a date32 array, and its null mask if it has nulls.
+
+    The values are a view on the array's data buffer; null slots hold arbitrary values.
+    """
+    if dates.type != pa.date32():
+        dates = dates.cast(pa.date32())
+    buffer = dates.buffers()[1]
+    values = np.frombuffer(buffer, dtype=np.int32, count=dates.offset + len(dates))
+    values = values[dates.offset :]
+    mask = dates.is_null().to_numpy(zero_copy_only=False) if dates.null_count else None
+    return values, mask
+
+
+class _DenseIndex:
+    """Business day flags for every day of a range, as used by the functions below."""
+
+    def __init__(self, calendar: Calendar, start: int, end: int) -> None:
+        """Build the index for days since epoch in [start, end)."""
+        self.start = start
+        days = np.arange(start, end, dtype=np.int64)
+        weekdays = (days + EPOCH_WEEKDAY) % 7
+        self.flags = np.zeros(len(days), dtype=bool)
+        # the working days of the week can change from the start of each segment
+        for first_ordinal, working in calendar.data.week.segments:
+            in_segment = days >= first_ordinal - EPOCH.toordinal()
+            self.flags[in_segment] = np.array(working)[weekdays[in_segment]]
+        for dates, flag in (
+            (calendar.extra_working_dates, True),
+            (calendar.holidays, False),
+        ):
+            exceptions = np.array([_to_days(d) for d in dates], dtype=np.int64)
+            exceptions = exceptions[(exceptions >= start) & (exceptions < end)]
+            self.flags[exceptions - start] = flag
+        self.business_days = days[self.flags]
+
+    def is_business_day(self, values: Any) -> Any:
+        """Flag the business days among days since epoch."""
+        return self.flags[values - self.start]
+
+    def ordinal(self, values: Any) -> Any:
+        """Count the business days of the index before each of the days since epoch."""
+        return np.searchsorted(self.business_days, values, side="left")
+
+
+def _bounds(*arrays: Tuple[Any, Optional[Any]]) -> Tuple[int, int]:
+    """Return the smallest and largest non-null value of some day arrays."""
+    valid = [values if mask is None else values[~mask] for values, mask in arrays]
+    valid = [values for values in valid if len(values)]
+    if not valid:
+        return 0, 0
+    return min(int(v.min()) for v in valid), max(int(v.max()) for v in valid)
+
+
+def _check_window(
+    calendar: Calendar, *arrays: Tuple[Any, Optional[Any]], counted_to: bool = False
+) -> None:
+    """Raise OutsideWindowError if a calendar window does not hold some days since epoch.
+
+    Dates counted up to (counted_to) may also be the day after the window.
+    """
+    data = calendar.data
+    if not isinstance(data, WindowData):
+        return
+    valid = [values if mask is None else values[~mask] for values, mask in arrays]
+    if not any(len(values) for values in valid):
+        return
+    for days in _bounds(*arrays):
+        d = EPOCH + datetime.timedelta(days=days)
+        data.check(d - datetime.timedelta(days=1) if counted_to and d > data.end else d)
+
+
+def _fallback(function: F) -> F:
+    """Answer with a window's full calendar when the dates are outside the window."""
+
+    @functools.wraps(function)
+    def wrapper(calendar: Calendar, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return function(calendar, *args, **kwargs)
+        except OutsideWindowError:
+            fallback = getattr(calendar, "fallback", None)
+            if fallback is None:
+                raise
+            return function(fallback, *args, **kwargs)
+
+    return cast(F, wrapper)
+
+
+def _union(*masks: Optional[Any]) -> Optional[Any]:
+    """Combine null masks, any of which may be missing."""
+    result = None
+    for mask in masks:
+        if mask is not None:
+            result = mask if result is None else result | mask
+    return result
+
+
+def _contiguous(dates: ArrowDates) -> ArrowDates:
+    """Return a plain array; chunked arrays with several chunks are concatenated (copied)."""
+    if isinstance(dates, pa.ChunkedArray):
+        if dates.num_chunks == 1:
+            return dates.chunk(0)
+        return dates.combine_chunks()
+    return dates
+
+
+def _like(dates: ArrowDates, result: ArrowDates) -> ArrowDates:
+    """Return the result as a chunked array if the input was chunked."""
+    return pa.chunked_array([result]) if isinstance(dates, pa.ChunkedArray) else result
+
+
+@_fallback
+def is_business_day(calendar: Calendar, dates: ArrowDates) -> ArrowDates:
+    """Return a boolean array flagging the business days of a date array."""
+    values, mask = _values(_contiguous(dates))
+    _check_window(calendar, (values, mask))
+    start, end = _bounds((values, mask))
+    index = _DenseIndex(calendar, start, end + 1)
+    filled = values if mask is None else np.where(mask, start, values)
+    return _like(dates, pa.array(index.is_business_day(filled), pa.bool_(), mask=mask))
+
+
+@_fallback
+def business_days_between(
+    calendar: Calendar, from_dates: ArrowDates, to_dates: ArrowDates
+) -> ArrowDates:
+    """Count the business days from the start of each from date to the start of each to date.
+
+    If a from date is after its to date, the count is negative.
+    """
+    from_values, from_mask = _values(_contiguous(from_dates))
+    to_values, to_mask = _values(_contiguous(to_dates))
+    if len(from_values) != len(to_values):
+        raise ValueError("from_dates and to_dates must have the same length")
+    _check_window(calendar, (from_values, from_mask), (to_values, to_mask), counted_to=True)
+    start, end = _bounds((from_values, from_mask), (to_values, to_mask))
+    index = _DenseIndex(calendar, start, end + 1)
+    mask = _union(from_mask, to_mask)
+    if mask is not None:
+        from_values = np.where(mask, start, from_values)
+        to_values = np.where(mask, start, to_values)
+    result = index.ordinal(to_values) - index.ordinal(from_values)
+    return _like(from_dates, pa.array(result, pa.int64(), mask=mask))
+
+
+@_fallback
+def add_business_days(
+    calendar: Calendar, dates: ArrowDates, delta: Union[int, ArrowDates]
+) -> ArrowDates:
+    """Add or subtract a number of business days to each date.
+
+    ``delta`` is either a single integer or an integer array of the same length as ``dates``.
+    As with Calendar.add_business_days, non-business days are first rolled forward (when
+    adding) or backward (when subtracting), and a delta of zero returns the date unchanged.
+    """
+    values, mask = _values(_contiguous(dates))
+    if isinstance(delta, int):
+        deltas = np.full(len(values), delta, dtype=np.int64)
+    else:
+        delta_array = _contiguous(delta)
+        if len(delta_array) != len(values):
+            raise ValueError("delta must have the same length as dates")
+        mask = _union(mask, delta_array.is_null().to_numpy(zero_copy_only=False))
+        deltas = delta_array.fill_null(0).to_numpy().astype(np.int64)
+
+    _check_window(calendar, (values, mask))
+    start, end = _bounds((values, mask))
+    if mask is not None:
+        values = np.where(mask, start, values)
+        deltas = np.where(mask, 0, deltas)
+
+    # the index must reach far enough either side for the largest offsets
+    max_delta = int(np.abs(deltas).max()) if len(deltas) else 0
+    padding = 7 * (max_delta // max(calendar.data.week.fewest_days_per_week, 1) + 1) + 7
+    while True:
+        index = _DenseIndex(calendar, start - padding, end + padding + 1)
+        forward = np.searchsorted(index.business_days, values, side="left") + deltas
+        backward = np.searchsorted(index.business_days, values, side="right") - 1 + deltas
+        positions = np.where(deltas > 0, forward, np.where(deltas < 0, backward, 0))
+        count = len(index.business_days)
+        if not len(positions) or (positions.min() >= 0 and positions.max() < count):
+            break
+        if padding > 366 * 10000:
+            raise ValueError("Calendar has no business days in range")
+        padding *= 2
+
+    moved = index.business_days[np.clip(positions, 0, max(count - 1, 0))] if count else values
+    result = np.where(deltas == 0, values, moved).astype(np.int32)
+    # the index only knows the window's holidays, so results must be within it
+    _check_window(calendar, (result, mask))
+    return _like(dates, pa.array(result, pa.date32(), mask=mask))
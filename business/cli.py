@@ -0,0 +1,192 @@
+r"""Command line interface for bulk date calculations.
+
+Rows are streamed from CSV or JSON lines input, one calendar operation is applied to named
+columns of each row and the rows are written back out with an extra result column:
+
+    $ python -m business add_business_days --calendar bacs --load-path lib/calendars \\
+        --date-column charge_date --delta 3 --output-column due_date payments.csv > out.csv
+"""
+import argparse
+import csv
+import datetime
+import itertools
+import json
+import sys
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from business import parallel
+from business.calendar import Calendar
+from business.sources import Definition, DirectorySource
+
+BUFFER_SIZE = 1 << 20
+
+OPERATIONS = ["add_business_days", "business_days_between", "is_business_day", "roll_forward"]
+FORMATS = ["csv", "jsonl"]
+
+Row = Dict[str, Any]
+
+
+def parse_date(value: Any) -> datetime.date:
+    """Parse an input date, with a fast path for ISO 8601 (YYYY-MM-DD) strings."""
+    if isinstance(value, str) and len(value) == 10:
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            pass
+    return Calendar.parse_date(value)
+
+
+def format_result(value: Any) -> Any:
+    """Format a result for output, dates as ISO 8601 strings."""
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m business",
+        description="Apply a business calendar operation to every row of CSV or JSONL input.",
+    )
+    parser.add_argument("operation", choices=OPERATIONS)
+    parser.add_argument("files", nargs="*", help="input files (default: stdin)")
+    parser.add_argument("--calendar", required=True, help="name of the calendar to load")
+    parser.add_argument(
+        "--load-path",
+        action="append",
+        default=[],
+        help="directory containing calendar files, may be repeated",
+    )
+    parser.add_argument("--format", choices=FORMATS, help="input and output format")
+    parser.add_argument("--date-column", default="date", help="column holding the input date")
+    parser.add_argument(
+        "--to-column", default="to_date", help="end date column for business_days_between"
+    )
+    delta = parser.add_mutually_exclusive_group()
+    delta.add_argument("--delta", type=int, help="business days to add to every date")
+    delta.add_argument(
+        "--delta-column", default="delta", help="column holding the business days to add"
+    )
+    parser.add_argument("--output-column", default="result", help="column to write results to")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="number of worker processes (default: 1)"
+    )
+    parser.add_argument("--chunksize", type=int, default=10000, help="rows per chunk")
+    return parser
+
+
+def _open_inputs(paths: Sequence[str]) -> Iterator[IO[str]]:
+    """Open each input path in turn, reading stdin when no paths are given."""
+    if not paths:
+        yield sys.stdin
+        return
+    for path in paths:
+        with open(path, "r", newline="", buffering=BUFFER_SIZE) as fh:
+            yield fh
+
+
+def _read_rows(paths: Sequence[str], fmt: str) -> Iterator[Row]:
+    """Stream rows from the inputs."""
+    for fh in _open_inputs(paths):
+        if fmt == "csv":
+            yield from csv.DictReader(fh)
+        else:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _arguments(args: argparse.Namespace) -> Callable[[Row], Tuple[Any, ...]]:
+    """Build a function extracting the operation's arguments from a row."""
+    date_column = args.date_column
+    if args.operation == "add_business_days":
+        if args.delta is not None:
+            delta: int = args.delta
+            return lambda row: (parse_date(row[date_column]), delta)
+        delta_column = args.delta_column
+        return lambda row: (parse_date(row[date_column]), int(row[delta_column]))
+    elif args.operation == "business_days_between":
+        to_column = args.to_column
+        return lambda row: (parse_date(row[date_column]), parse_date(row[to_column]))
+    else:
+        return lambda row: (parse_date(row[date_column]),)
+
+
+def _write_rows(rows: Iterable[Row], fmt: str, output: IO[str]) -> None:
+    """Write rows to the output as they are produced."""
+    if fmt == "jsonl":
+        for row in rows:
+            output.write(json.dumps(row))
+            output.write("\n")
+        return
+
+    writer: Optional["csv.DictWriter[str]"] = None
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(output, fieldnames=list(row.keys()), lineterminator="\n")
+            writer.writeheader()
+        writer.writerow(row)
+
+
+def load_definition(name: str, load_paths: Sequence[str]) -> Definition:
+    """Fetch a calendar's definition from the given directories, else from Calendar's source.
+
+    Calendar.load_paths and Calendar.source are left unchanged.
+    """
+    if load_paths:
+        try:
+            return DirectorySource(load_paths).get(name)
+        except ValueError:
+            pass
+    return Calendar.get_source().get(name)
+
+
+def load_calendar(name: str, load_paths: Sequence[str]) -> Calendar:
+    """Load a calendar from the given directories, else from Calendar.load_cache."""
+    if load_paths:
+        try:
+            definition = DirectorySource(load_paths).get(name)
+        except ValueError:
+            pass
+        else:
+            return Calendar.from_definition(definition)
+    return Calendar.load_cache(name)
+
+
+def run(args: argparse.Namespace, output: IO[str]) -> None:
+    """Apply the requested operation to every input row and write the results."""
+    calendar = load_calendar(args.calendar, args.load_path)
+
+    fmt = args.format
+    if fmt is None:
+        jsonl = args.files and all(p.endswith((".jsonl", ".ndjson")) for p in args.files)
+        fmt = "jsonl" if jsonl else "csv"
+
+    arguments = _arguments(args)
+    rows, pending_rows = itertools.tee(_read_rows(args.files, fmt))
+    inputs = (arguments(row) for row in rows)
+    results = parallel.map(
+        calendar, args.operation, inputs, workers=args.workers, chunksize=args.chunksize
+    )
+
+    output_column = args.output_column
+
+    def with_results() -> Iterator[Row]:
+        for row, result in zip(pending_rows, results):
+            row[output_column] = format_result(result)
+            yield row
+
+    _write_rows(with_results(), fmt, output)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line interface."""
+    args = build_parser().parse_intermixed_args(argv)
+    try:
+        run(args, sys.stdout)
+    except (ValueError, KeyError, TypeError) as e:
+        sys.stdout.flush()
+        print(f"error: {e!r}", file=sys.stderr)
+        return 1
+    return 0
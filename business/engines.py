@@ -0,0 +1,322 @@
+"""Calculation engines for business day arithmetic.
+
+A calendar delegates business_days_between and add_business_days to an engine. Engines are
+registered by name:
+
+- "reference" walks through the dates involved. It is the original implementation and the
+  definition of correct results.
+- "intervals" uses a binary search over run-length intervals (see business.intervals).
+
+The shadow engine factory serves results from one engine while checking a sample of calls
+against another one, logging any mismatch and keeping timing statistics, so that a faster
+engine can be verified against live traffic before switching to it:
+
+>>> calendar = Calendar(holidays=holidays, engine=shadow("reference", "intervals", 0.01))
+>>> calendar.engine.stats.mismatches
+    0
+"""
+import datetime
+import logging
+import random
+import time
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, Type, Union
+
+from business.intervals import IntervalIndex
+from business.utils import day_interval
+
+if TYPE_CHECKING:  # pragma: no cover
+    from business.calendar import Calendar
+
+logger = logging.getLogger("business")
+
+
+class Engine:
+    """Base class for calculation engines.
+
+    Engines receive dates which have already been parsed by the calendar.
+    """
+
+    name = ""
+
+    def __init__(self, calendar: "Calendar") -> None:
+        """Initialise the engine for a calendar."""
+        self.calendar = calendar
+
+    def business_days_between(self, from_date: datetime.date, to_date: datetime.date) -> int:
+        """Count the business days from start of from_date to start of to_date."""
+        raise NotImplementedError
+
+    def add_business_days(self, input_date: datetime.date, delta: int) -> datetime.date:
+        """Add or subtract a number of business days to a date."""
+        raise NotImplementedError
+
+
+EngineFactory = Callable[["Calendar"], Engine]
+ENGINES: Dict[str, Type[Engine]] = {}
+
+
+def register_engine(engine: Type[Engine]) -> Type[Engine]:
+    """Register an engine class under its name, so calendars can select it by name."""
+    if not engine.name:
+        raise ValueError(f"Engine {engine.__name__} has no name")
+    ENGINES[engine.name] = engine
+    return engine
+
+
+def get_engine_factory(engine: Union[str, EngineFactory]) -> EngineFactory:
+    """Return the factory for an engine name, or the factory itself."""
+    if callable(engine):
+        return engine
+    if engine not in ENGINES:
+        raise ValueError(f"Invalid engine: {engine} (valid: {', '.join(ENGINES)})")
+    return ENGINES[engine]
+
+
+@register_engine
+class ReferenceEngine(Engine):
+    """Engine walking through the dates, as the calendar always did."""
+
+    name = "reference"
+
+    def business_days_between(self, from_date: datetime.date, to_date: datetime.date) -> int:
+        """Count the business days from start of from_date to start of to_date.
+
+        To optimise this method we split the range into full weeks and a remaining period.
+        We then calculate business days in the full weeks period by counting the working days of
+        the week with the working week's segment index (the working days of the week can change
+        within the range), removing holidays and adding extra working dates, both counted with a
+        binary search over the sorted date lists.
+
+        For the remaining period, we just loop through each day and check whether it is a business day.
+
+        If to_date is before from_date, the result is minus the count from to_date to from_date.
+        """
+        if to_date < from_date:
+            return -self.business_days_between(to_date, from_date)
+        # read the calendar's dates once, so a concurrent change cannot be seen half-way
+        data = self.calendar.data
+        # Calculate number of full weeks and remaining days
+        days_between_from_to = (to_date - from_date).days
+        remaining_days = days_between_from_to % 7
+        remaining_to_date = to_date - (day_interval * remaining_days)
+        # First estimate for full week range based on # biz days in a week
+        num_biz_days = data.week.count_between(from_date, remaining_to_date)
+
+        # Find and remove holidays in full weeks range
+        num_holidays = data.count_working_holidays(from_date, remaining_to_date)
+
+        # Add extra working dates in full weeks range
+        num_extra_working_dates = data.count_extra_working_dates(from_date, remaining_to_date)
+
+        remaining_range = range((to_date - remaining_to_date).days)
+        remaining_days_range = (remaining_to_date + (day_interval * i) for i in remaining_range)
+        # Loop through each day in remaining_range and count if a business day
+        remaining_business_days = sum(
+            1 for date in remaining_days_range if data.is_business_day(date)
+        )
+        return num_biz_days - num_holidays + num_extra_working_dates + remaining_business_days
+
+    def add_business_days(self, input_date: datetime.date, delta: int) -> datetime.date:
+        """Add or subtract a number of business days, one business day at a time."""
+        data = self.calendar.data
+        if delta == 0:
+            return input_date
+        step = -day_interval if delta < 0 else day_interval
+        # roll to a business day, then step over abs(delta) more business days
+        while not data.is_business_day(input_date):
+            input_date += step
+        for i in range(abs(delta)):
+            input_date += step
+            while not data.is_business_day(input_date):
+                input_date += step
+        return input_date
+
+
+@register_engine
+class IntervalEngine(Engine):
+    """Engine using a binary search over run-length intervals of holidays.
+
+    The index is kept with the calendar's dates, and updated with them when they change.
+    """
+
+    name = "intervals"
+
+    def __init__(self, calendar: "Calendar") -> None:
+        """Build the interval index of the calendar."""
+        super().__init__(calendar)
+        calendar.data.intervals
+
+    @property
+    def index(self) -> IntervalIndex:
+        """Return the interval index of the calendar's current dates."""
+        return self.calendar.data.intervals
+
+    def business_days_between(self, from_date: datetime.date, to_date: datetime.date) -> int:
+        """Count the business days from start of from_date to start of to_date."""
+        return self.index.business_days_between(from_date, to_date)
+
+    def add_business_days(self, input_date: datetime.date, delta: int) -> datetime.date:
+        """Add or subtract a number of business days to a date."""
+        return self.index.add_business_days(input_date, delta)
+
+
+class ShadowStats:
+    """Counters kept by a shadow engine.
+
+    Unsampled calls are counted without a lock, so calls may miss a few counts when several
+    threads use the engine at once; the other counters are exact.
+    """
+
+    def __init__(self) -> None:
+        """Initialise all counters to zero."""
+        self.calls = 0
+        self.sampled = 0
+        self.mismatches = 0
+        self.errors = 0
+        self.primary_time = 0.0
+        self.candidate_time = 0.0
+
+    @property
+    def speedup(self) -> Optional[float]:
+        """Return how many times faster the candidate was than the primary on sampled calls."""
+        if not self.candidate_time:
+            return None
+        return self.primary_time / self.candidate_time
+
+    def __repr__(self) -> str:
+        """Summarise the counters."""
+        return (
+            f"ShadowStats(calls={self.calls}, sampled={self.sampled}, "
+            f"mismatches={self.mismatches}, errors={self.errors}, speedup={self.speedup})"
+        )
+
+
+MismatchHandler = Callable[[str, Tuple[Any, ...], Any, Any], None]
+
+
+class ShadowEngine(Engine):
+    """Engine serving results from a primary engine, checking samples against a candidate.
+
+    Mismatches are logged as warnings on the "business" logger and passed to on_mismatch
+    (if given) as (method name, arguments, primary result, candidate result). An exception
+    raised by the candidate counts as an error and is never propagated.
+    """
+
+    name = "shadow"
+
+    def __init__(
+        self,
+        calendar: "Calendar",
+        primary: Union[str, EngineFactory],
+        candidate: Union[str, EngineFactory],
+        sample_rate: float = 1.0,
+        on_mismatch: Optional[MismatchHandler] = None,
+    ) -> None:
+        """Initialise both engines for a calendar."""
+        super().__init__(calendar)
+        self.primary = get_engine_factory(primary)(calendar)
+        self.candidate = get_engine_factory(candidate)(calendar)
+        self.sample_rate = sample_rate
+        self.on_mismatch = on_mismatch
+        self.stats = ShadowStats()
+        self._lock = Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Return the state to pickle, without the lock."""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a pickled engine, with a new lock."""
+        self.__dict__.update(state)
+        self._lock = Lock()
+
+    def _call(self, method: str, *args: Any) -> Any:
+        """Call the primary engine, and the candidate engine for a sample of calls."""
+        sampled = random.random() < self.sample_rate
+        if not sampled:
+            # kept lock-free, as most calls are not sampled
+            self.stats.calls += 1
+            return getattr(self.primary, method)(*args)
+
+        start = time.perf_counter()
+        expected = getattr(self.primary, method)(*args)
+        primary_time = time.perf_counter() - start
+
+        error = None
+        start = time.perf_counter()
+        try:
+            result = getattr(self.candidate, method)(*args)
+        except Exception as e:
+            error = result = e
+        candidate_time = time.perf_counter() - start
+
+        with self._lock:
+            self.stats.calls += 1
+            self.stats.sampled += 1
+            self.stats.primary_time += primary_time
+            self.stats.candidate_time += candidate_time
+            if error is not None:
+                self.stats.errors += 1
+            elif result != expected:
+                self.stats.mismatches += 1
+
+        if error is not None or result != expected:
+            logger.warning(
+                f"Engine {self.candidate.name} {method}{args} returned {result!r}, "
+                f"engine {self.primary.name} returned {expected!r}"
+            )
+            if self.on_mismatch is not None:
+                self.on_mismatch(method, args, expected, result)
+        return expected
+
+    def business_days_between(self, from_date: datetime.date, to_date: datetime.date) -> int:
+        """Count the business days from start of from_date to start of to_date."""
+        result: int = self._call("business_days_between", from_date, to_date)
+        return result
+
+    def add_business_days(self, input_date: datetime.date, delta: int) -> datetime.date:
+        """Add or subtract a number of business days to a date."""
+        result: datetime.date = self._call("add_business_days", input_date, delta)
+        return result
+
+
+class ShadowFactory:
+    """Factory of shadow engines with the same settings, as returned by shadow.
+
+    A class rather than a closure, so that calendars using it can be pickled, e.g. to be sent
+    to the worker processes of business.parallel.
+    """
+
+    def __init__(
+        self,
+        primary: Union[str, EngineFactory],
+        candidate: Union[str, EngineFactory],
+        sample_rate: float = 1.0,
+        on_mismatch: Optional[MismatchHandler] = None,
+    ) -> None:
+        """Keep the settings of the engines."""
+        self.primary = primary
+        self.candidate = candidate
+        self.sample_rate = sample_rate
+        self.on_mismatch = on_mismatch
+
+    def __call__(self, calendar: "Calendar") -> Engine:
+        """Return a shadow engine for a calendar."""
+        return ShadowEngine(
+            calendar, self.primary, self.candidate, self.sample_rate, self.on_mismatch
+        )
+
+
+def shadow(
+    primary: Union[str, EngineFactory],
+    candidate: Union[str, EngineFactory],
+    sample_rate: float = 1.0,
+    on_mismatch: Optional[MismatchHandler] = None,
+) -> EngineFactory:
+    """Return a factory for a shadow engine, to pass as a calendar's engine."""
+    if not 0 <= sample_rate <= 1:
+        raise ValueError(f"sample_rate must be between 0 and 1: {sample_rate}")
+    return ShadowFactory(primary, candidate, sample_rate, on_mismatch)
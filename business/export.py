@@ -0,0 +1,186 @@
+r"""Export of business day dimension tables.
+
+A dimension table has one row per day of a range, with its business day attributes, so that
+databases can answer business day questions with joins rather than calling back into Python:
+
+>>> with open("business_days.csv", "w", newline="") as fh:
+...     write_csv(Calendar.load("bacs"), "2000-01-01", "2049-12-31", fh)
+
+The columns are:
+
+- date,
+- is_business_day,
+- business_day_ordinal: the number of business days in the table before the date, so that
+  the business days between two dates is the difference of their ordinals,
+- business_day_of_month: as given by Calendar.get_business_day_of_month,
+- next_business_day and previous_business_day: as given by Calendar.next_business_day and
+  Calendar.previous_business_day.
+
+Rows are computed in a single pass over the range and written as they are produced, so ranges
+of any length can be exported with constant memory. From the command line:
+
+    $ python -m business.export --load-path lib/calendars --calendar bacs \
+        --start 2000-01-01 --end 2049-12-31 --sqlite calendars.db --table bacs_days
+"""
+import argparse
+import csv
+import datetime
+import itertools
+import sqlite3
+import sys
+from typing import IO, Iterator, List, NamedTuple, Optional
+
+from business.calendar import INPUT_TYPES, Calendar
+from business.cli import load_calendar
+from business.utils import day_interval
+
+COLUMNS = [
+    "date",
+    "is_business_day",
+    "business_day_ordinal",
+    "business_day_of_month",
+    "next_business_day",
+    "previous_business_day",
+]
+
+
+class DimensionRow(NamedTuple):
+    """A row of a business day dimension table."""
+
+    date: datetime.date
+    is_business_day: bool
+    business_day_ordinal: int
+    business_day_of_month: int
+    next_business_day: datetime.date
+    previous_business_day: datetime.date
+
+
+def dimension_rows(
+    calendar: Calendar, start: INPUT_TYPES, end: INPUT_TYPES
+) -> Iterator[DimensionRow]:
+    """Yield the rows of the dimension table of [start, end], in date order."""
+    start = calendar.parse_date(start)
+    end = calendar.parse_date(end)
+    if end < start:
+        return
+    data = calendar.data
+    previous = calendar.previous_business_day(start)
+    of_month = calendar.business_days_between(start.replace(day=1), start)
+    ordinal = 0
+
+    # rows waiting for the next business day to be known
+    pending: List[DimensionRow] = []
+    day = start
+    while day <= end:
+        if day.day == 1:
+            of_month = 0
+        is_business_day = data.is_business_day(day)
+        if is_business_day:
+            for row in pending:
+                yield row._replace(next_business_day=day)
+            pending = []
+            of_month += 1
+        # the next business day is a placeholder until known
+        pending.append(DimensionRow(day, is_business_day, ordinal, of_month, day, previous))
+        if is_business_day:
+            ordinal += 1
+            previous = day
+        day += day_interval
+
+    following = calendar.next_business_day(end)
+    for row in pending:
+        yield row._replace(next_business_day=following)
+
+
+def _formatted(row: DimensionRow) -> List[object]:
+    """Return the values of a row, with dates as ISO strings and flags as integers."""
+    return [
+        row.date.isoformat(),
+        int(row.is_business_day),
+        row.business_day_ordinal,
+        row.business_day_of_month,
+        row.next_business_day.isoformat(),
+        row.previous_business_day.isoformat(),
+    ]
+
+
+def write_csv(calendar: Calendar, start: INPUT_TYPES, end: INPUT_TYPES, output: IO[str]) -> int:
+    """Write the dimension table of [start, end] as CSV, returning the number of rows."""
+    writer = csv.writer(output)
+    writer.writerow(COLUMNS)
+    count = 0
+    for row in dimension_rows(calendar, start, end):
+        writer.writerow(_formatted(row))
+        count += 1
+    return count
+
+
+def write_sqlite(
+    calendar: Calendar,
+    start: INPUT_TYPES,
+    end: INPUT_TYPES,
+    connection: sqlite3.Connection,
+    table: str = "business_days",
+    batch_size: int = 10000,
+) -> int:
+    """Write the dimension table of [start, end] to a SQLite table, returning the number of rows.
+
+    The table is created if it does not exist, with the date as its primary key, and rows
+    already present for a date are replaced. Rows are inserted in batches, in one transaction.
+    """
+    if not table.isidentifier():
+        raise ValueError(f"Invalid table name: {table}")
+    rows = (_formatted(row) for row in dimension_rows(calendar, start, end))
+    count = 0
+    with connection:
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "date TEXT PRIMARY KEY, "
+            "is_business_day INTEGER NOT NULL, "
+            "business_day_ordinal INTEGER NOT NULL, "
+            "business_day_of_month INTEGER NOT NULL, "
+            "next_business_day TEXT NOT NULL, "
+            "previous_business_day TEXT NOT NULL)"
+        )
+        insert = f"INSERT OR REPLACE INTO {table} ({', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)"
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            connection.executemany(insert, batch)
+            count += len(batch)
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Export a dimension table from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m business.export",
+        description="Export a business day dimension table, as CSV on stdout or to SQLite.",
+    )
+    parser.add_argument("--calendar", required=True, help="name of the calendar to load")
+    parser.add_argument(
+        "--load-path",
+        action="append",
+        default=[],
+        help="directory containing calendar files, may be repeated",
+    )
+    parser.add_argument("--start", required=True, help="first date of the table")
+    parser.add_argument("--end", required=True, help="last date of the table")
+    parser.add_argument("--sqlite", help="write to this SQLite database instead of stdout")
+    parser.add_argument("--table", default="business_days", help="SQLite table name")
+    args = parser.parse_args(argv)
+
+    calendar = load_calendar(args.calendar, args.load_path)
+    if args.sqlite:
+        connection = sqlite3.connect(args.sqlite)
+        try:
+            write_sqlite(calendar, args.start, args.end, connection, args.table)
+        finally:
+            connection.close()
+    else:
+        write_csv(calendar, args.start, args.end, sys.stdout)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,211 @@
+"""Sharing of identical and near-identical calendars.
+
+Services holding calendars for many tenants often hold the same calendar many times over. A
+CalendarRegistry interns calendars by their fingerprint, a hash of their working days,
+holidays and extra working dates: identical calendars resolve to a single shared instance,
+with a single index and memo.
+
+>>> registry = CalendarRegistry()
+>>> registry.add_base("bacs", Calendar.load("bacs"))
+>>> tenant_1 = registry.from_definition(definition_1)
+>>> tenant_2 = registry.from_definition(definition_2)
+>>> tenant_1 is tenant_2  # when both definitions are the same
+    True
+
+Calendars which differ from a base calendar by a few dates are stored as an overlay of those
+dates on top of the base's dates, rather than as a full copy. Overlays answer is_holiday,
+is_business_day and the reference engine's queries without copying the base's dates; other
+queries (e.g. holidays_between) build the overlay's full date lists on first use.
+
+Interned calendars are shared, so they cannot be changed.
+"""
+import datetime
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from business.calendar import Calendar, CalendarData, _merge
+from business.engines import EngineFactory, get_engine_factory
+from business.utils import count_between, day_interval
+
+
+class OverlayData(CalendarData):
+    """Dates of a calendar, as the dates added to and removed from a base calendar's dates.
+
+    The full sorted lists of dates are only built when first accessed.
+    """
+
+    def __init__(
+        self,
+        base: CalendarData,
+        added_holidays: List[datetime.date],
+        removed_holidays: List[datetime.date],
+        added_extra_working_dates: List[datetime.date],
+        removed_extra_working_dates: List[datetime.date],
+    ) -> None:
+        """Initialise the overlay from sorted lists of added and removed dates."""
+        self.base = base
+        self.week = base.week
+        self.working_days = base.working_days
+        self._weekdays = base._weekdays
+        self.version = 0
+        self._intervals = None
+        self._periods = None
+        self._fingerprint = None
+        self.added_holidays = added_holidays
+        self.removed_holidays = removed_holidays
+        self.added_extra_working_dates = added_extra_working_dates
+        self.removed_extra_working_dates = removed_extra_working_dates
+        self._added_working_holidays = [d for d in added_holidays if self.is_working_day(d)]
+        self._removed_working_holidays = [d for d in removed_holidays if self.is_working_day(d)]
+
+    def __getattr__(self, name: str) -> Any:
+        """Build the full lists of dates the first time they are needed."""
+        if name == "holidays":
+            value = _merge(self.base.holidays, self.added_holidays, self.removed_holidays)
+        elif name == "extra_working_dates":
+            value = _merge(
+                self.base.extra_working_dates,
+                self.added_extra_working_dates,
+                self.removed_extra_working_dates,
+            )
+        elif name == "working_holidays":
+            value = _merge(
+                self.base.working_holidays,
+                self._added_working_holidays,
+                self._removed_working_holidays,
+            )
+        else:
+            raise AttributeError(name)
+        # a concurrent reader may build the same list: either copy is equally valid
+        setattr(self, name, value)
+        return value
+
+    def __len__(self) -> int:
+        """Return the number of dates of the overlay."""
+        return (
+            len(self.added_holidays)
+            + len(self.removed_holidays)
+            + len(self.added_extra_working_dates)
+            + len(self.removed_extra_working_dates)
+        )
+
+    def is_holiday(self, input_date: datetime.date) -> bool:
+        """Return true if the date given is a holiday."""
+        next_date = input_date + day_interval
+        if count_between(self.added_holidays, input_date, next_date):
+            return True
+        if count_between(self.removed_holidays, input_date, next_date):
+            return False
+        return self.base.is_holiday(input_date)
+
+    def is_extra_working_date(self, input_date: datetime.date) -> bool:
+        """Return true if the date given is an extra working date."""
+        next_date = input_date + day_interval
+        if count_between(self.added_extra_working_dates, input_date, next_date):
+            return True
+        if count_between(self.removed_extra_working_dates, input_date, next_date):
+            return False
+        return self.base.is_extra_working_date(input_date)
+
+    def count_working_holidays(self, from_date: datetime.date, to_date: datetime.date) -> int:
+        """Count the holidays falling on working days in [from_date, to_date)."""
+        return (
+            self.base.count_working_holidays(from_date, to_date)
+            + count_between(self._added_working_holidays, from_date, to_date)
+            - count_between(self._removed_working_holidays, from_date, to_date)
+        )
+
+    def count_extra_working_dates(self, from_date: datetime.date, to_date: datetime.date) -> int:
+        """Count the extra working dates in [from_date, to_date)."""
+        return (
+            self.base.count_extra_working_dates(from_date, to_date)
+            + count_between(self.added_extra_working_dates, from_date, to_date)
+            - count_between(self.removed_extra_working_dates, from_date, to_date)
+        )
+
+
+def _difference(
+    base: List[datetime.date], dates: List[datetime.date]
+) -> Tuple[List[datetime.date], List[datetime.date]]:
+    """Return the dates added to and removed from base, sorted."""
+    base_set = set(base)
+    dates_set = set(dates)
+    return sorted(dates_set - base_set), sorted(base_set - dates_set)
+
+
+class CalendarRegistry:
+    """Interning registry of calendars, keyed by fingerprint and engine.
+
+    Calendars differing from one of the registered base calendars by at most max_overlay dates
+    are stored as overlays on that base.
+    """
+
+    def __init__(self, max_overlay: int = 64) -> None:
+        """Initialise an empty registry."""
+        self.max_overlay = max_overlay
+        self._calendars: Dict[Tuple[str, EngineFactory], Calendar] = {}
+        self._bases: Dict[str, Calendar] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Return the number of distinct calendars in the registry."""
+        return len(self._calendars)
+
+    def __contains__(self, calendar: Calendar) -> bool:
+        """Return true if an identical calendar is registered."""
+        return (calendar.fingerprint, calendar._engine_factory) in self._calendars
+
+    def add_base(self, name: str, calendar: Calendar) -> Calendar:
+        """Register a calendar which other calendars can be stored as overlays of."""
+        calendar = self.intern(calendar)
+        with self._lock:
+            self._bases[name] = calendar
+        return calendar
+
+    def intern(self, calendar: Calendar) -> Calendar:
+        """Return the registered calendar identical to the one given, registering it if none.
+
+        The calendar given is never registered itself, so it can still be changed.
+        """
+        key = (calendar.fingerprint, calendar._engine_factory)
+        existing = self._calendars.get(key)
+        if existing is not None:
+            return existing
+
+        # registered as a new calendar, leaving the one given to its owner to change
+        overlay = self._overlay(calendar)
+        calendar = Calendar._from_data(
+            calendar.data if overlay is None else overlay, calendar._engine_factory
+        )
+        with self._lock:
+            existing = self._calendars.get(key)
+            if existing is not None:
+                return existing
+            calendar._read_only = True
+            self._calendars[key] = calendar
+        return calendar
+
+    def from_definition(
+        self, definition: Dict[str, Any], engine: Union[str, EngineFactory] = "reference"
+    ) -> Calendar:
+        """Return the registered calendar for a definition, as found in a calendar YAML file."""
+        calendar = Calendar.from_definition(definition)
+        if engine != "reference":
+            calendar = Calendar._from_data(calendar.data, get_engine_factory(engine))
+        return self.intern(calendar)
+
+    def _overlay(self, calendar: Calendar) -> Optional[OverlayData]:
+        """Return the calendar's dates as an overlay on the closest base, if close enough."""
+        data = calendar.data
+        best: Optional[OverlayData] = None
+        for base in list(self._bases.values()):
+            if base.data.week != data.week:
+                continue
+            holidays = _difference(base.holidays, data.holidays)
+            extras = _difference(base.extra_working_dates, data.extra_working_dates)
+            overlay = OverlayData(base.data, *holidays, *extras)
+            if len(overlay) <= self.max_overlay and (best is None or len(overlay) < len(best)):
+                best = overlay
+        if best is not None:
+            best._fingerprint = data.fingerprint
+        return best
@@ -0,0 +1,188 @@
+"""Run-length interval representation of a calendar.
+
+Rather than holding a flag per day, the exceptions to a calendar's weekly pattern are stored
+as sorted runs of dates:
+
+- holiday runs, covering consecutive holidays and any non-working days between them
+  (e.g. Good Friday to Easter Monday is a single run), in which no day is a business day,
+- extra working runs, covering consecutive extra working dates, in which every day is a
+  business day.
+
+Alongside each run we keep the cumulative number of business days added or removed by the
+runs before it. The number of business days before any date (its business day ordinal) is
+then the count given by the weekly pattern plus that cumulative adjustment, found with a
+binary search over the runs. Memory grows with the number of holidays, not with the number of
+days covered, and lookups are logarithmic however far apart the dates are.
+"""
+import bisect
+import copy
+import datetime
+from typing import Iterable, List, Sequence, Set, Union
+
+from business.weeks import DAY_NAMES, WorkingWeek
+
+day_interval = datetime.timedelta(days=1)
+
+
+class IntervalIndex:
+    """Business day ordinals of a calendar, computed from run-length intervals."""
+
+    def __init__(
+        self,
+        holidays: Iterable[datetime.date],
+        extra_working_dates: Iterable[datetime.date],
+        week: Union[WorkingWeek, Sequence[int]],
+    ) -> None:
+        """Build the index from sorted holidays and extra working dates.
+
+        week is the calendar's working week, or its working days of the week as integers
+        (Monday is 0).
+        """
+        if not isinstance(week, WorkingWeek):
+            week = WorkingWeek([DAY_NAMES[w] for w in week])
+        self.week = week
+
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.changes: List[int] = []
+        self.cumulative = [0]
+        self.start_ordinals: List[int] = []
+        self._extend(self._build_runs(holidays, extra_working_dates))
+
+    def _build_runs(
+        self, holidays: Iterable[datetime.date], extra_working_dates: Iterable[datetime.date]
+    ) -> List[List[int]]:
+        """Build the runs of sorted holidays and extra working dates."""
+        extra_ordinals = [d.toordinal() for d in extra_working_dates]
+        holiday_ordinals = [
+            o for o in (d.toordinal() for d in holidays) if self.week.is_working_ordinal(o)
+        ]
+
+        # runs are [start, end) ordinal ranges, with the business day change they cause
+        runs: List[List[int]] = []
+        extras = set(extra_ordinals)
+        for o in holiday_ordinals:
+            if runs and self._bridges(runs[-1][1], o, extras):
+                runs[-1][1] = o + 1
+                runs[-1][2] -= 1
+            else:
+                runs.append([o, o + 1, -1])
+        for o in extra_ordinals:
+            runs.append([o, o + 1, 1])
+        runs.sort()
+
+        merged: List[List[int]] = []
+        for run in runs:
+            if merged and run[2] > 0 and merged[-1][2] > 0 and merged[-1][1] == run[0]:
+                merged[-1][1] = run[1]
+                merged[-1][2] += 1
+            else:
+                merged.append(run)
+        return merged
+
+    def _extend(self, runs: List[List[int]]) -> None:
+        """Append runs after the existing ones, with their cumulative counts."""
+        for start, end, change in runs:
+            self.starts.append(start)
+            self.ends.append(end)
+            self.changes.append(change)
+            # business day ordinal at the start of the run
+            self.start_ordinals.append(self._weekly_count(start) + self.cumulative[-1])
+            # cumulative change before each run; one extra entry for after the last run
+            self.cumulative.append(self.cumulative[-1] + change)
+
+    def updated(
+        self,
+        holidays: Sequence[datetime.date],
+        extra_working_dates: Sequence[datetime.date],
+        since: datetime.date,
+    ) -> "IntervalIndex":
+        """Return a new index for changed holidays and extra working dates.
+
+        All the changes must be on or after since. The runs ending well before since are
+        shared with this index, and only the following runs and their cumulative counts are
+        rebuilt, from the full sorted lists of holidays and extra working dates given.
+        """
+        since_ordinal = since.toordinal()
+        # a run can only be merged with holidays up to a week after its end
+        kept = bisect.bisect_right(self.ends, since_ordinal - 8)
+        cut = since_ordinal
+        if kept < len(self.starts):
+            cut = min(cut, self.starts[kept])
+        cut_date = datetime.date.fromordinal(cut)
+
+        index = copy.copy(self)
+        index.starts = self.starts[:kept]
+        index.ends = self.ends[:kept]
+        index.changes = self.changes[:kept]
+        index.start_ordinals = self.start_ordinals[:kept]
+        index.cumulative = self.cumulative[: kept + 1]
+        index._extend(
+            self._build_runs(
+                holidays[bisect.bisect_left(holidays, cut_date) :],
+                extra_working_dates[bisect.bisect_left(extra_working_dates, cut_date) :],
+            )
+        )
+        return index
+
+    def _bridges(self, end: int, ordinal: int, extras: Set[int]) -> bool:
+        """Return true if every day in [end, ordinal) is a non-working day of the week."""
+        if ordinal - end > 7:
+            return False
+        return all(
+            not self.week.is_working_ordinal(o) and o not in extras for o in range(end, ordinal)
+        )
+
+    def _weekly_count(self, ordinal: int) -> int:
+        """Count the working days of the week in [0001-01-01, ordinal), ignoring holidays."""
+        return self.week.count(ordinal)
+
+    def _weekly_select(self, count: int) -> int:
+        """Return the ordinal of the working day of the week preceded by count such days."""
+        return self.week.select(count)
+
+    def __len__(self) -> int:
+        """Return the number of runs."""
+        return len(self.starts)
+
+    def ordinal(self, input_date: datetime.date) -> int:
+        """Count the business days before the given date (from 0001-01-01)."""
+        o = input_date.toordinal()
+        i = bisect.bisect_right(self.starts, o) - 1
+        if i < 0:
+            return self._weekly_count(o)
+        if o >= self.ends[i]:
+            return self._weekly_count(o) + self.cumulative[i + 1]
+        if self.changes[i] > 0:
+            # inside an extra working run, every day is a business day
+            return self.start_ordinals[i] + o - self.starts[i]
+        # inside a holiday run, no day is a business day
+        return self.start_ordinals[i]
+
+    def from_ordinal(self, ordinal: int) -> datetime.date:
+        """Return the business day preceded by the given number of business days."""
+        i = bisect.bisect_right(self.start_ordinals, ordinal) - 1
+        if i >= 0 and self.changes[i] > 0:
+            offset = ordinal - self.start_ordinals[i]
+            if offset < self.ends[i] - self.starts[i]:
+                return datetime.date.fromordinal(self.starts[i] + offset)
+        return datetime.date.fromordinal(self._weekly_select(ordinal - self.cumulative[i + 1]))
+
+    def is_business_day(self, input_date: datetime.date) -> bool:
+        """Return true if the date given is a business day."""
+        return self.ordinal(input_date + day_interval) > self.ordinal(input_date)
+
+    def business_days_between(self, from_date: datetime.date, to_date: datetime.date) -> int:
+        """Count the business days from start of from_date to start of to_date."""
+        return self.ordinal(to_date) - self.ordinal(from_date)
+
+    def add_business_days(self, input_date: datetime.date, delta: int) -> datetime.date:
+        """Add or subtract a number of business days, as Calendar.add_business_days does."""
+        if delta == 0:
+            return input_date
+        elif delta < 0:
+            # the previous business day, or the date itself, has ordinal ordinal(date + 1) - 1
+            return self.from_ordinal(self.ordinal(input_date + day_interval) - 1 + delta)
+        else:
+            # the next business day, or the date itself, has ordinal ordinal(date)
+            return self.from_ordinal(self.ordinal(input_date) + delta)
@@ -0,0 +1,91 @@
+"""Memoization of a calendar's most frequent queries.
+
+Production traffic tends to ask the same questions over and over, e.g. "today + 3 business
+days". A calendar with memoization enabled answers repeated queries from a bounded LRU cache,
+keyed on the parsed arguments, in about the time of a dictionary lookup:
+
+>>> calendar = Calendar.load("bacs")
+>>> calendar.memoize(maxsize=4096)
+>>> calendar.add_business_days(datetime.date(2020, 1, 1), 3)
+>>> calendar.memo_stats()
+    MemoStats(hits=0, misses=1, size=1, maxsize=4096, invalidations=0)
+
+The cache is discarded whenever the calendar's holidays or extra working dates change.
+"""
+import functools
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from business.calendar import Calendar
+
+
+class MemoStats:
+    """Counters of a calendar's memo, accumulated across invalidations."""
+
+    def __init__(
+        self, hits: int, misses: int, size: int, maxsize: int, invalidations: int
+    ) -> None:
+        """Initialise the counters."""
+        self.hits = hits
+        self.misses = misses
+        self.size = size
+        self.maxsize = maxsize
+        self.invalidations = invalidations
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        """Return the proportion of queries answered from the cache."""
+        total = self.hits + self.misses
+        if not total:
+            return None
+        return self.hits / total
+
+    def __repr__(self) -> str:
+        """Summarise the counters."""
+        return (
+            f"MemoStats(hits={self.hits}, misses={self.misses}, size={self.size}, "
+            f"maxsize={self.maxsize}, invalidations={self.invalidations})"
+        )
+
+
+class Memo:
+    """Bounded LRU cache of a calendar's query results.
+
+    A memo only caches results for one set of the calendar's dates: when they change, the
+    calendar replaces its memo with a fresh one, which carries the counters forward.
+    """
+
+    def __init__(
+        self, calendar: "Calendar", maxsize: int, previous: Optional["Memo"] = None
+    ) -> None:
+        """Initialise an empty memo for a calendar."""
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1: {maxsize}")
+        self.maxsize = maxsize
+        self._calendar = calendar
+        # functools.lru_cache is implemented in C and safe to use from several threads
+        self._cached = functools.lru_cache(maxsize)(self._compute)
+        self._hits = self._misses = self._invalidations = 0
+        if previous is not None:
+            stats = previous.stats()
+            self._hits = stats.hits
+            self._misses = stats.misses
+            self._invalidations = stats.invalidations + 1
+
+    def _compute(self, operation: str, *args: Any) -> Any:
+        return getattr(self._calendar, f"_{operation}")(*args)
+
+    def __call__(self, operation: str, *args: Any) -> Any:
+        """Return the result of a calendar operation, computing it on a cache miss."""
+        return self._cached(operation, *args)
+
+    def stats(self) -> MemoStats:
+        """Return the counters of the memo."""
+        info = self._cached.cache_info()
+        return MemoStats(
+            self._hits + info.hits,
+            self._misses + info.misses,
+            info.currsize,
+            self.maxsize,
+            self._invalidations,
+        )
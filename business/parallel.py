@@ -0,0 +1,114 @@
+"""Batch execution of calendar operations across processes.
+
+Calendar calculations are pure CPU work, so threads cannot use more than one core. The
+helpers here ship a calendar to each worker process once, when the worker starts, and then
+stream chunks of inputs to the workers, yielding results in input order.
+"""
+import collections
+import itertools
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Tuple
+
+from business.calendar import Calendar
+
+OPERATIONS = frozenset(
+    [
+        "is_holiday",
+        "is_working_day",
+        "is_business_day",
+        "business_days_between",
+        "roll_forward",
+        "roll_backward",
+        "next_business_day",
+        "previous_business_day",
+        "add_business_days",
+        "get_business_day_of_month",
+    ]
+)
+
+# calendar installed in each worker process by _init_worker
+_worker_calendar: Optional[Calendar] = None
+
+
+def _init_worker(calendar: Calendar) -> None:
+    """Install the calendar once per worker process."""
+    global _worker_calendar
+    _worker_calendar = calendar
+
+
+def _as_args(item: Any) -> Tuple[Any, ...]:
+    """Turn an input item into positional arguments for the operation."""
+    return tuple(item) if isinstance(item, (tuple, list)) else (item,)
+
+
+def _run_chunk(calendar: Calendar, op: str, chunk: List[Any]) -> List[Any]:
+    """Apply an operation to each input of a chunk."""
+    method = getattr(calendar, op)
+    return [method(*_as_args(item)) for item in chunk]
+
+
+def _run_worker_chunk(op: str, chunk: List[Any]) -> List[Any]:
+    """Apply an operation to a chunk using the calendar installed in this worker."""
+    assert _worker_calendar is not None, "worker was not initialised with a calendar"
+    return _run_chunk(_worker_calendar, op, chunk)
+
+
+def _chunks(inputs: Iterable[Any], chunksize: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most chunksize items, lazily."""
+    iterator = iter(inputs)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map(
+    calendar: Calendar,
+    op: str,
+    inputs: Iterable[Any],
+    workers: Optional[int] = None,
+    chunksize: int = 10000,
+) -> Iterator[Any]:
+    """Apply a calendar operation to every input, using a pool of worker processes.
+
+    Each input is either a single argument (e.g. a date for roll_forward) or a tuple of
+    arguments (e.g. (date, delta) for add_business_days). Results are yielded in input order.
+
+    Inputs are consumed lazily and at most two chunks per worker are in flight at any time, so
+    memory stays bounded however long the input is. With workers=1 everything runs in the
+    current process.
+
+    >>> list(parallel.map(calendar, "add_business_days", [("2020-01-01", 2)], workers=4))
+        [datetime.date(2020, 1, 3)]
+    """
+    if op not in OPERATIONS:
+        raise ValueError(
+            f"Unsupported operation '{op}' (supported: {', '.join(sorted(OPERATIONS))})"
+        )
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be positive: {chunksize}")
+    # validated above, before the first result is asked for
+    return _map(calendar, op, inputs, workers or os.cpu_count() or 1, chunksize)
+
+
+def _map(
+    calendar: Calendar, op: str, inputs: Iterable[Any], workers: int, chunksize: int
+) -> Iterator[Any]:
+    """Yield the results of map, whose arguments are valid."""
+    if workers == 1:
+        for chunk in _chunks(inputs, chunksize):
+            yield from _run_chunk(calendar, op, chunk)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(calendar,)
+    ) as executor:
+        pending: Deque["Future[List[Any]]"] = collections.deque()
+        for chunk in _chunks(inputs, chunksize):
+            pending.append(executor.submit(_run_worker_chunk, op, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,100 @@
+"""Business days per month, quarter and year.
+
+Pro-rating and capacity planning ask how many business days a month, quarter or year has,
+for many periods and many times over. Rather than counting each period's business days on
+every query, a PeriodTable counts those of every month of a year in one go, the first time a
+date of that year is asked about, and answers from the stored counts afterwards:
+
+>>> calendar = Calendar.load("bacs")
+>>> calendar.business_days_in_month("2022-12-15")
+    20
+>>> calendar.period_summary("2022-01-01", "2022-12-31", "quarter")
+    [Period(start=datetime.date(2022, 1, 1), end=datetime.date(2022, 4, 1), business_days=63),
+     ...]
+
+The table belongs to a calendar's snapshot of dates, so changing the calendar's holidays
+starts a new one.
+"""
+import datetime
+from typing import TYPE_CHECKING, Dict, List, NamedTuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from business.calendar import CalendarData
+
+FREQUENCIES = {"month": 1, "quarter": 3, "year": 12}
+
+
+class Period(NamedTuple):
+    """A period, from its first day to the first day of the next, and its business days."""
+
+    start: datetime.date
+    end: datetime.date
+    business_days: int
+
+
+def _month_start(year: int, month: int) -> datetime.date:
+    """Return the first day of a month, which may be after December of the year given."""
+    years, month = divmod(month - 1, 12)
+    return datetime.date(year + years, month + 1, 1)
+
+
+class PeriodTable:
+    """Business days of each month of a calendar, counted a year at a time."""
+
+    def __init__(self, data: "CalendarData") -> None:
+        """Initialise an empty table for a calendar snapshot."""
+        self.data = data
+        self._years: Dict[int, List[int]] = {}
+
+    def _months(self, year: int) -> List[int]:
+        """Return the business days of each month of a year, counting them on first use."""
+        months = self._years.get(year)
+        if months is None:
+            data = self.data
+            starts = [_month_start(year, m) for m in range(1, 14)]
+            months = [
+                data.week.count_between(start, end)
+                + data.count_extra_working_dates(start, end)
+                - data.count_working_holidays(start, end)
+                for start, end in zip(starts, starts[1:])
+            ]
+            # concurrent readers may both count a year, with identical results
+            self._years[year] = months
+        return months
+
+    def month(self, year: int, month: int) -> int:
+        """Return the business days of a month."""
+        return self._months(year)[month - 1]
+
+    def quarter(self, year: int, quarter: int) -> int:
+        """Return the business days of a quarter, numbered from 1 to 4."""
+        return sum(self._months(year)[3 * quarter - 3 : 3 * quarter])
+
+    def year(self, year: int) -> int:
+        """Return the business days of a year."""
+        return sum(self._months(year))
+
+    def summary(self, start: datetime.date, end: datetime.date, freq: str) -> List[Period]:
+        """Return every period of the given frequency containing a date of [start, end]."""
+        try:
+            length = FREQUENCIES[freq]
+        except KeyError:
+            raise ValueError(
+                f"Unsupported frequency '{freq}' (supported: {', '.join(FREQUENCIES)})"
+            ) from None
+        periods: List[Period] = []
+        year = start.year
+        month = (start.month - 1) // length * length + 1
+        while _month_start(year, month) <= end:
+            months = self._months(year)
+            periods.append(
+                Period(
+                    _month_start(year, month),
+                    _month_start(year, month + length),
+                    sum(months[month - 1 : month - 1 + length]),
+                )
+            )
+            month += length
+            if month > 12:
+                year, month = year + 1, 1
+        return periods
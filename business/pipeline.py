@@ -0,0 +1,192 @@
+"""Chains of calendar steps, compiled into lookups over a range of dates.
+
+A payment's lifecycle is often a chain of steps across calendars, e.g. roll forward to a BACS
+business day, add 2 BACS business days, then roll forward to an ECB business day and add 1:
+
+>>> settlement = (
+...     Pipeline()
+...     .roll_forward(bacs)
+...     .add_business_days(bacs, 2)
+...     .roll_forward(ecb)
+...     .add_business_days(ecb, 1)
+... )
+>>> settlement("2022-12-23")
+    datetime.date(2022, 12, 30)
+
+Evaluating the steps one by one repeats every step's calendar queries for every input.
+Compiling the pipeline over a range of dates evaluates it once per day of the range, after
+which each input is answered with a single lookup:
+
+>>> compiled = settlement.compile("2022-01-01", "2023-12-31")
+>>> compiled("2022-12-23")
+    datetime.date(2022, 12, 30)
+
+Every step keeps the order of dates (a later input never gives an earlier result), so a
+compiled pipeline also answers the inverse query, the latest start date whose result is on
+or before a target date, with a binary search:
+
+>>> compiled.latest_start("2023-01-06")
+    datetime.date(2023, 1, 3)
+
+Compiled pipelines follow changes to their calendars' holidays, compiling again on the
+next query after a change.
+"""
+import array
+import bisect
+import datetime
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+from business.calendar import INPUT_TYPES, Calendar, CalendarData
+from business.window import OutsideWindowError
+
+OPERATIONS = ("roll_forward", "roll_backward", "add_business_days")
+
+
+class Step(NamedTuple):
+    """One step of a pipeline: a calendar operation, and its delta for add_business_days."""
+
+    operation: str
+    calendar: Calendar
+    delta: int = 0
+
+    def apply(self, input_date: datetime.date) -> datetime.date:
+        """Apply the step to a date."""
+        if self.operation == "add_business_days":
+            return self.calendar.add_business_days(input_date, self.delta)
+        elif self.operation == "roll_forward":
+            return self.calendar.roll_forward(input_date)
+        else:
+            return self.calendar.roll_backward(input_date)
+
+
+class Pipeline:
+    """A chain of roll_forward, roll_backward and add_business_days steps across calendars.
+
+    Pipelines are immutable: adding a step returns a new pipeline.
+    """
+
+    def __init__(self, steps: Iterable[Step] = ()) -> None:
+        """Initialise the pipeline from its steps, applied in order."""
+        self.steps: Tuple[Step, ...] = tuple(steps)
+        for step in self.steps:
+            if step.operation not in OPERATIONS:
+                raise ValueError(
+                    f"Unsupported step '{step.operation}' (supported: {', '.join(OPERATIONS)})"
+                )
+
+    def __len__(self) -> int:
+        """Return the number of steps."""
+        return len(self.steps)
+
+    def __repr__(self) -> str:
+        """Describe the steps."""
+        return f"Pipeline({list(self.steps)!r})"
+
+    def then(self, step: Step) -> "Pipeline":
+        """Return a pipeline with a step added at the end."""
+        return Pipeline([*self.steps, step])
+
+    def roll_forward(self, calendar: Calendar) -> "Pipeline":
+        """Return a pipeline rolling forward to a business day of the calendar at the end."""
+        return self.then(Step("roll_forward", calendar))
+
+    def roll_backward(self, calendar: Calendar) -> "Pipeline":
+        """Return a pipeline rolling backward to a business day of the calendar at the end."""
+        return self.then(Step("roll_backward", calendar))
+
+    def add_business_days(self, calendar: Calendar, delta: int) -> "Pipeline":
+        """Return a pipeline adding business days of the calendar at the end."""
+        return self.then(Step("add_business_days", calendar, delta))
+
+    def __call__(self, input_date: INPUT_TYPES) -> datetime.date:
+        """Apply the steps to a date, one by one."""
+        result = Calendar.parse_date(input_date)
+        for step in self.steps:
+            result = step.apply(result)
+        return result
+
+    def compile(self, start: INPUT_TYPES, end: INPUT_TYPES) -> "CompiledPipeline":
+        """Return the pipeline precomputed for every input date of [start, end]."""
+        return CompiledPipeline(self, start, end)
+
+
+class CompiledPipeline:
+    """A pipeline's result for every input date of [start, end], in a compact array."""
+
+    def __init__(self, pipeline: Pipeline, start: INPUT_TYPES, end: INPUT_TYPES) -> None:
+        """Evaluate the pipeline for every date of [start, end]."""
+        self.pipeline = pipeline
+        self.start = Calendar.parse_date(start)
+        self.end = Calendar.parse_date(end)
+        if self.end < self.start:
+            raise ValueError(f"Pipeline range end {self.end} is before its start {self.start}")
+        self._compiled = self._compile()
+
+    def _snapshots(self) -> List[CalendarData]:
+        """Return the current dates of each step's calendar."""
+        return [step.calendar.data for step in self.pipeline.steps]
+
+    def _compile(self) -> Tuple[List[CalendarData], "array.array[int]"]:
+        """Evaluate the steps for every date of the range, one step at a time.
+
+        Steps are applied to each distinct date only once: after a roll, or an addition of
+        business days, many inputs share the same intermediate date. Returns the calendars'
+        dates the results were computed from, with the results.
+        """
+        snapshots = self._snapshots()
+        dates = [
+            datetime.date.fromordinal(o)
+            for o in range(self.start.toordinal(), self.end.toordinal() + 1)
+        ]
+        for step in self.pipeline.steps:
+            results: Dict[datetime.date, datetime.date] = {}
+            for d in dates:
+                if d not in results:
+                    results[d] = step.apply(d)
+            dates = [results[d] for d in dates]
+        # results are non-decreasing, as every step keeps the order of dates
+        return snapshots, array.array("l", [d.toordinal() for d in dates])
+
+    @property
+    def results(self) -> "array.array[int]":
+        """Return the result ordinal of each input date, compiling again after any change."""
+        compiled_from, results = self._compiled
+        if any(a is not b for a, b in zip(self._snapshots(), compiled_from)):
+            # replaced in a single assignment, for concurrent readers
+            self._compiled = self._compile()
+            results = self._compiled[1]
+        return results
+
+    def __call__(self, input_date: INPUT_TYPES) -> datetime.date:
+        """Return the pipeline's result for a date of the range."""
+        input_date = Calendar.parse_date(input_date)
+        if not self.start <= input_date <= self.end:
+            raise OutsideWindowError(
+                f"{input_date} is outside the compiled range {self.start} to {self.end}"
+            )
+        results = self.results
+        return datetime.date.fromordinal(results[input_date.toordinal() - self.start.toordinal()])
+
+    def map(self, dates: Sequence[INPUT_TYPES]) -> List[datetime.date]:
+        """Return the pipeline's result for each date, all within the range."""
+        return [self(d) for d in dates]
+
+    def latest_start(self, target: INPUT_TYPES) -> datetime.date:
+        """Return the latest input date whose result is on or before the target.
+
+        Raises OutsideWindowError if that date cannot be known from the range: when even the
+        range's last date meets the target (a later date may too), or when none of the range
+        does (an earlier date may).
+        """
+        target = Calendar.parse_date(target)
+        results = self.results
+        index = bisect.bisect_right(results, target.toordinal()) - 1
+        if index < 0:
+            raise OutsideWindowError(
+                f"No date from {self.start} gives a result on or before {target}"
+            )
+        if index == len(results) - 1:
+            raise OutsideWindowError(
+                f"Dates after {self.end} may also give a result on or before {target}"
+            )
+        return self.start + datetime.timedelta(days=index)
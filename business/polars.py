@@ -0,0 +1,77 @@
+"""Polars expressions for calendar operations.
+
+This module needs the optional ``polars``, ``pyarrow`` and ``numpy`` packages. Each function
+returns an expression which evaluates the operation on whole ``Date`` columns at once, using
+the vectorised functions of :mod:`business.arrow`.
+
+>>> import polars as pl
+>>> from business import polars as business_polars
+>>> df.with_columns(due_date=business_polars.add_business_days(calendar, pl.col("date"), 3))
+"""
+from typing import Any, Union
+
+try:
+    import polars as pl
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "business.polars requires the optional polars, pyarrow and numpy packages: "
+        "pip install polars pyarrow numpy"
+    ) from e
+
+from business import arrow
+from business.calendar import Calendar
+
+
+def _series(name: str, result: Any) -> Any:
+    """Convert an Arrow result back to a Polars series."""
+    return pl.Series(name, result)
+
+
+def is_business_day(calendar: Calendar, dates: Any) -> Any:
+    """Return an expression flagging the business days of a Date expression."""
+    return dates.map_batches(
+        lambda s: _series(s.name, arrow.is_business_day(calendar, s.to_arrow())),
+        return_dtype=pl.Boolean,
+    )
+
+
+def business_days_between(calendar: Calendar, from_dates: Any, to_dates: Any) -> Any:
+    """Return an expression counting business days between two Date expressions."""
+
+    def apply(s: Any) -> Any:
+        from_series = s.struct.field("from")
+        to_series = s.struct.field("to")
+        result = arrow.business_days_between(
+            calendar, from_series.to_arrow(), to_series.to_arrow()
+        )
+        return _series(from_series.name, result)
+
+    return pl.struct([from_dates.alias("from"), to_dates.alias("to")]).map_batches(
+        apply, return_dtype=pl.Int64
+    )
+
+
+def add_business_days(calendar: Calendar, dates: Any, delta: Union[int, Any]) -> Any:
+    """Return an expression adding business days to a Date expression.
+
+    ``delta`` is either an integer or an integer expression.
+    """
+    if isinstance(delta, int):
+        fixed_delta = delta
+        return dates.map_batches(
+            lambda s: _series(
+                s.name, arrow.add_business_days(calendar, s.to_arrow(), fixed_delta)
+            ),
+            return_dtype=pl.Date,
+        )
+
+    def apply(s: Any) -> Any:
+        date_series = s.struct.field("date")
+        result = arrow.add_business_days(
+            calendar, date_series.to_arrow(), s.struct.field("delta").to_arrow()
+        )
+        return _series(date_series.name, result)
+
+    return pl.struct([dates.alias("date"), delta.alias("delta")]).map_batches(
+        apply, return_dtype=pl.Date
+    )
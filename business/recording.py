@@ -0,0 +1,281 @@
+r"""Recording and replay of real calendar workloads.
+
+Microbenchmarks rarely match the mix of calls, input types and dates a service really sees.
+A Recorder samples the calls made to calendars into a trace file, with little overhead:
+
+>>> recorder = Recorder("trace.jsonl.gz", sample_rate=0.01)
+>>> recorder.attach(Calendar.load_cache("bacs"), "bacs")
+>>> ...
+>>> recorder.close()
+
+Each sampled call is written as one JSON line, gzip compressed, holding the calendar name,
+the method and its arguments (positional, then keyword) with their types (so that e.g.
+string dates are replayed as strings, and parsed again). Only the calendars attached to a
+recorder are sampled; others run exactly as before.
+
+A trace can then be replayed against any engine and configuration, reporting throughput and
+latency percentiles per method:
+
+    $ python -m business.recording trace.jsonl.gz --load-path lib/calendars \\
+        --engine intervals --memoize 4096
+"""
+import argparse
+import datetime
+import functools
+import gzip
+import json
+import random
+import time
+from threading import Lock
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from business.calendar import Calendar
+from business.cli import load_calendar
+from business.engines import get_engine_factory
+from business.parallel import OPERATIONS
+
+Record = Tuple[str, str, Tuple[Any, ...], Dict[str, Any]]
+
+
+def encode(value: Any) -> List[Any]:
+    """Encode an argument as [type code, JSON value]."""
+    if isinstance(value, datetime.datetime):
+        return ["t", value.isoformat()]
+    if isinstance(value, datetime.date):
+        return ["d", value.isoformat()]
+    if isinstance(value, bool):
+        return ["b", value]
+    if isinstance(value, int):
+        return ["i", value]
+    if isinstance(value, str):
+        return ["s", value]
+    return ["r", repr(value)]
+
+
+def decode(encoded: List[Any]) -> Any:
+    """Decode an argument encoded by encode.
+
+    Values of other types are replayed as their repr string.
+    """
+    code, value = encoded
+    if code == "t":
+        return datetime.datetime.fromisoformat(value)
+    if code == "d":
+        return datetime.date.fromisoformat(value)
+    return value
+
+
+class Recorder:
+    """Samples calls to attached calendars into a gzip compressed JSON lines trace file."""
+
+    def __init__(self, path: str, sample_rate: float = 0.01, buffer_size: int = 1000) -> None:
+        """Open the trace file for writing."""
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"sample_rate must be between 0 and 1: {sample_rate}")
+        self.sample_rate = sample_rate
+        self.buffer_size = buffer_size
+        self.recorded = 0
+        self._file: Optional[IO[str]] = gzip.open(path, "wt", encoding="utf-8")
+        self._buffer: List[str] = []
+        self._lock = Lock()
+
+    def attach(self, calendar: Calendar, name: str) -> None:
+        """Sample the calls made to a calendar, recording them under the given name.
+
+        The calendar's methods are wrapped on the instance only, so other calendars, and
+        pickled copies of this one, are not affected.
+        """
+        for operation in OPERATIONS:
+            method = getattr(type(calendar), operation).__get__(calendar)
+            setattr(calendar, operation, self._wrap(method, name, operation))
+
+    @staticmethod
+    def detach(calendar: Calendar) -> None:
+        """Stop sampling the calls made to a calendar."""
+        for operation in OPERATIONS:
+            calendar.__dict__.pop(operation, None)
+
+    def _wrap(self, method: Callable[..., Any], name: str, operation: str) -> Callable[..., Any]:
+        sample_rate = self.sample_rate
+
+        @functools.wraps(method)
+        def recorded(*args: Any, **kwargs: Any) -> Any:
+            if random.random() < sample_rate:
+                self.record(name, operation, args, kwargs)
+            return method(*args, **kwargs)
+
+        return recorded
+
+    def record(
+        self,
+        name: str,
+        operation: str,
+        args: Iterable[Any],
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Write a call to the trace.
+
+        Keyword arguments are written after the positional ones, only when there are any.
+        """
+        call: List[Any] = [name, operation, [encode(arg) for arg in args]]
+        if kwargs:
+            call.append({key: encode(value) for key, value in kwargs.items()})
+        line = json.dumps(call)
+        with self._lock:
+            if self._file is None:
+                return
+            self._buffer.append(line)
+            self.recorded += 1
+            if len(self._buffer) >= self.buffer_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._file is not None and self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+
+    def close(self) -> None:
+        """Write the buffered calls and close the trace file."""
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "Recorder":
+        """Return the recorder, to close it on exiting the context."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the recorder."""
+        self.close()
+
+
+def read_trace(path: str) -> Iterator[Record]:
+    """Yield the (calendar name, method, arguments, keyword arguments) of each call in a trace."""
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                name, operation, args, *kwargs = json.loads(line)
+                yield (
+                    name,
+                    operation,
+                    tuple(decode(arg) for arg in args),
+                    {key: decode(value) for key, value in (kwargs[0] if kwargs else {}).items()},
+                )
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Return a percentile of sorted values, by the nearest rank method."""
+    index = max(int(round(percentile / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[index]
+
+
+class ReplayReport:
+    """Throughput and latencies of a replayed trace, overall and per method."""
+
+    PERCENTILES = (50, 90, 99, 99.9)
+
+    def __init__(self, latencies: Dict[str, List[float]], errors: int) -> None:
+        """Initialise from the latencies (in seconds) of the calls to each method."""
+        self.latencies = {operation: sorted(values) for operation, values in latencies.items()}
+        self.errors = errors
+
+    def summary(self, operation: Optional[str] = None) -> Dict[str, float]:
+        """Return the call count, throughput and latency percentiles, in microseconds.
+
+        Without any timed call, the throughput is 0 and there are no latencies.
+        """
+        if operation is None:
+            values = sorted(v for values in self.latencies.values() for v in values)
+        else:
+            values = self.latencies.get(operation, [])
+        if not values:
+            return {"calls": 0.0, "calls_per_second": 0.0}
+        total = sum(values)
+        summary = {
+            "calls": float(len(values)),
+            "calls_per_second": len(values) / total if total else float("inf"),
+        }
+        for p in self.PERCENTILES:
+            summary[f"p{p}_us"] = _percentile(values, p) * 1e6
+        summary["max_us"] = values[-1] * 1e6
+        return summary
+
+    def __str__(self) -> str:
+        """Format the report as a table."""
+        header = ["method", "calls", "calls/s"] + [f"p{p} µs" for p in self.PERCENTILES]
+        rows = [header + ["max µs"]]
+        for operation in [None, *sorted(self.latencies)]:
+            summary = self.summary(operation)
+            rows.append(
+                [
+                    operation or "all",
+                    f"{summary['calls']:.0f}",
+                    f"{summary['calls_per_second']:,.0f}",
+                ]
+                + [
+                    f"{summary[key]:.1f}" if key in summary else "-"
+                    for key in [*(f"p{p}_us" for p in self.PERCENTILES), "max_us"]
+                ]
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header) + 1)]
+        lines = [
+            "  ".join(value.rjust(width) for value, width in zip(row, widths)) for row in rows
+        ]
+        if self.errors:
+            lines.append(f"{self.errors} calls raised an error")
+        return "\n".join(lines)
+
+
+def replay(records: Iterable[Record], calendars: Dict[str, Calendar]) -> ReplayReport:
+    """Replay calls against the given calendars, timing each one.
+
+    Calls raising an error (as some recorded calls may have) are counted, not timed.
+    """
+    latencies: Dict[str, List[float]] = {}
+    errors = 0
+    timer = time.perf_counter
+    for name, operation, args, kwargs in records:
+        method = getattr(calendars[name], operation)
+        start = timer()
+        try:
+            method(*args, **kwargs)
+        except (ValueError, TypeError, OverflowError):
+            errors += 1
+            continue
+        latencies.setdefault(operation, []).append(timer() - start)
+    return ReplayReport(latencies, errors)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Replay a trace file from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m business.recording",
+        description="Replay a recorded trace, reporting throughput and latency percentiles.",
+    )
+    parser.add_argument("trace", help="trace file written by a Recorder")
+    parser.add_argument(
+        "--load-path",
+        action="append",
+        default=[],
+        help="directory containing calendar files, may be repeated",
+    )
+    parser.add_argument("--engine", default="reference", help="calculation engine")
+    parser.add_argument("--memoize", type=int, help="enable memoization with this size")
+    parser.add_argument("--repeat", type=int, default=1, help="number of times to replay")
+    args = parser.parse_args(argv)
+
+    records = list(read_trace(args.trace))
+    engine = get_engine_factory(args.engine)
+    calendars: Dict[str, Calendar] = {}
+    for name in {record[0] for record in records}:
+        calendar = Calendar._from_data(load_calendar(name, args.load_path).data, engine)
+        if args.memoize:
+            calendar.memoize(args.memoize)
+        calendars[name] = calendar
+    print(replay(records * args.repeat, calendars))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
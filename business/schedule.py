@@ -0,0 +1,148 @@
+"""Recurring schedules of business dates.
+
+Occurrences of a recurrence rule, such as a dateutil.rrule, are adjusted to business days
+with one of the usual conventions:
+
+- "following": the next business day, if the occurrence isn't one,
+- "preceding": the previous business day, if the occurrence isn't one,
+- "modified_following": the next business day, unless it is in the following month, in which
+  case the previous business day,
+- "modified_preceding": the previous business day, unless it is in the preceding month, in
+  which case the next business day,
+- "unadjusted": the occurrence itself.
+
+>>> from dateutil.rrule import MONTHLY, FR, rrule
+>>> every_4th_friday = rrule(MONTHLY, byweekday=FR(4), dtstart=datetime.date(2022, 1, 1))
+>>> dates = schedule(Calendar.load("bacs"), every_4th_friday, "modified_following")
+>>> list(itertools.islice(dates, 3))
+    [datetime.date(2022, 1, 28), datetime.date(2022, 2, 25), datetime.date(2022, 3, 25)]
+
+Occurrences are produced lazily, so rules without an end can be used. Rather than checking
+each date with a binary search, the calendar's holidays and extra working dates are walked
+with cursors which move along with the occurrences.
+
+Calendar windows raise OutsideWindowError when adjusting needs a date outside the window, or
+adjust such dates with the full calendar if created with fallback=True.
+"""
+import bisect
+import datetime
+from typing import Iterable, Iterator, List, Optional, Union
+
+from business.calendar import INPUT_TYPES, Calendar
+from business.utils import day_interval
+from business.window import OutsideWindowError, WindowData
+
+ADJUSTMENTS = frozenset(
+    ["following", "preceding", "modified_following", "modified_preceding", "unadjusted"]
+)
+
+
+class _Cursor:
+    """Membership tests on a sorted list of dates, for dates mostly queried in order.
+
+    Each query moves the position from the previous query, so queries on nearby dates take
+    constant time.
+    """
+
+    def __init__(self, dates: List[datetime.date]) -> None:
+        self.dates = dates
+        self.position = -1
+
+    def __contains__(self, input_date: datetime.date) -> bool:
+        dates = self.dates
+        position = self.position
+        if position < 0:
+            # the first query starts with a binary search
+            position = bisect.bisect_left(dates, input_date)
+        while position < len(dates) and dates[position] < input_date:
+            position += 1
+        while position > 0 and dates[position - 1] >= input_date:
+            position -= 1
+        self.position = position
+        return position < len(dates) and dates[position] == input_date
+
+
+class _Adjuster:
+    """Adjusts dates to business days, using cursors over a calendar's dates."""
+
+    def __init__(self, calendar: Calendar) -> None:
+        self.calendar = calendar
+        data = calendar.data
+        # a window only knows the business days of its range
+        self.window = data if isinstance(data, WindowData) else None
+        self.fallback: Optional[_Adjuster] = None
+        self.holidays = _Cursor(data.holidays)
+        self.extra_working_dates = _Cursor(data.extra_working_dates)
+        self.week = data.week
+        if not any(self.week.patterns) and not data.extra_working_dates:
+            raise ValueError("Calendar has no business days")
+
+    def is_business_day(self, input_date: datetime.date) -> bool:
+        if self.window is not None:
+            self.window.check(input_date)
+        if input_date in self.holidays:
+            return False
+        return self.week.is_working_day(input_date) or input_date in self.extra_working_dates
+
+    def roll(self, input_date: datetime.date, step: datetime.timedelta) -> datetime.date:
+        while not self.is_business_day(input_date):
+            input_date += step
+        return input_date
+
+    def adjust(self, input_date: datetime.date, adjustment: str) -> datetime.date:
+        if adjustment == "unadjusted":
+            return input_date
+        try:
+            return self._adjust(input_date, adjustment)
+        except OutsideWindowError:
+            calendar = getattr(self.calendar, "fallback", None)
+            if calendar is None:
+                raise
+            if self.fallback is None:
+                self.fallback = _Adjuster(calendar)
+            return self.fallback.adjust(input_date, adjustment)
+
+    def _adjust(self, input_date: datetime.date, adjustment: str) -> datetime.date:
+        step = -day_interval if adjustment.endswith("preceding") else day_interval
+        result = self.roll(input_date, step)
+        if adjustment.startswith("modified") and result.month != input_date.month:
+            result = self.roll(input_date, -step)
+        return result
+
+
+def adjust(
+    calendar: Calendar, dates: Iterable[INPUT_TYPES], adjustment: str = "following"
+) -> Iterator[datetime.date]:
+    """Adjust dates to business days, lazily.
+
+    Dates are best given in order, as the occurrences of a recurrence rule are, but any order
+    gives correct results. Every date gives one result, so two dates can be adjusted to the
+    same business day.
+    """
+    if adjustment not in ADJUSTMENTS:
+        raise ValueError(
+            f"Invalid adjustment: {adjustment} (valid: {', '.join(sorted(ADJUSTMENTS))})"
+        )
+    adjuster = _Adjuster(calendar)
+    return (adjuster.adjust(calendar.parse_date(d), adjustment) for d in dates)
+
+
+def schedule(
+    calendar: Calendar,
+    rule: Iterable[Union[datetime.date, datetime.datetime]],
+    adjustment: str = "following",
+) -> Iterator[datetime.date]:
+    """Return the occurrences of a recurrence rule, adjusted to business days, lazily.
+
+    The rule is a dateutil.rrule.rrule or rruleset, or any other iterable of dates in order.
+    """
+    return adjust(calendar, rule, adjustment)
+
+
+def schedule_list(
+    calendar: Calendar,
+    rule: Iterable[Union[datetime.date, datetime.datetime]],
+    adjustment: str = "following",
+) -> List[datetime.date]:
+    """Return all the occurrences of a finite recurrence rule, adjusted to business days."""
+    return list(schedule(calendar, rule, adjustment))
@@ -0,0 +1,216 @@
+"""Local HTTP server answering batches of calendar operations.
+
+The server keeps calendars warm in Calendar.load_cache, so services written in other languages
+can share one set of calendars. It only uses the standard library and runs on an asyncio event
+loop, over TCP or a Unix socket:
+
+    $ python -m business.server --load-path lib/calendars --port 8080
+
+Each request answers a whole batch of inputs for one calendar and operation:
+
+    POST /batch
+    {"calendar": "bacs", "operation": "add_business_days",
+     "inputs": [["2020-01-01", 3], ["2020-01-02", 3]]}
+
+    200 OK
+    {"results": ["2020-01-06", "2020-01-07"], "errors": []}
+
+Inputs which fail (e.g. an unparseable date) get a null result, and their index and error
+message are listed in "errors".
+"""
+import argparse
+import asyncio
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from business.calendar import Calendar
+from business.cli import format_result, parse_date
+from business.parallel import OPERATIONS
+
+logger = logging.getLogger("business")
+
+MAX_BODY_SIZE = 64 * 1024 * 1024
+
+# positions of the date arguments of each operation
+DATE_ARGUMENTS: Dict[str, Tuple[int, ...]] = {op: (0,) for op in OPERATIONS}
+DATE_ARGUMENTS["business_days_between"] = (0, 1)
+
+# calendar names accepted from clients: no path separators or "..", which would let a request
+# load files from outside the load paths
+CALENDAR_NAME = re.compile(r"[A-Za-z0-9_-]+")
+
+
+class BadRequest(Exception):
+    """A request which cannot be answered."""
+
+
+class InvalidCalendar(Exception):
+    """A calendar whose definition cannot be loaded."""
+
+
+def _arguments(op: str, item: Any) -> Tuple[Any, ...]:
+    """Turn an input item into the arguments of an operation, parsing the dates."""
+    args = list(item) if isinstance(item, list) else [item]
+    for i in DATE_ARGUMENTS[op]:
+        if i < len(args):
+            args[i] = parse_date(args[i])
+    return tuple(args)
+
+
+def handle_batch(payload: Any) -> Dict[str, Any]:
+    """Answer a batch request."""
+    if not isinstance(payload, dict):
+        raise BadRequest("Request body must be a JSON object")
+    op = payload.get("operation")
+    if op not in OPERATIONS:
+        raise BadRequest(f"Unsupported operation '{op}'")
+    inputs = payload.get("inputs")
+    if not isinstance(inputs, list):
+        raise BadRequest("'inputs' must be a list")
+    name = payload.get("calendar")
+    if not isinstance(name, str) or not CALENDAR_NAME.fullmatch(name):
+        raise BadRequest(f"Invalid calendar name: {name!r}")
+    try:
+        calendar = Calendar.load_cache(name)
+    except ValueError as e:
+        raise BadRequest(str(e))
+    except (KeyError, TypeError) as e:
+        # e.g. a calendar file without working_days
+        raise InvalidCalendar(f"Invalid definition of calendar '{name}': {e!r}")
+
+    method = getattr(calendar, op)
+    results: List[Any] = []
+    errors: List[Dict[str, Any]] = []
+    for index, item in enumerate(inputs):
+        try:
+            results.append(format_result(method(*_arguments(op, item))))
+        except (ValueError, TypeError, OverflowError) as e:
+            results.append(None)
+            errors.append({"index": index, "error": str(e)})
+    return {"results": results, "errors": errors}
+
+
+def handle_request(method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+    """Route a request, returning the status code and JSON response."""
+    if path == "/health":
+        return 200, {"status": "ok"}
+    if path != "/batch":
+        return 404, {"error": f"Not found: {path}"}
+    if method != "POST":
+        return 405, {"error": f"Method not allowed: {method}"}
+    try:
+        return 200, handle_batch(json.loads(body))
+    except (BadRequest, ValueError) as e:
+        return 400, {"error": str(e)}
+    except InvalidCalendar as e:
+        logger.error(str(e))
+        return 500, {"error": str(e)}
+    except Exception as e:
+        # answer rather than drop the connection
+        logger.exception("Error handling request")
+        return 500, {"error": f"Internal error: {e!r}"}
+
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer the HTTP/1.1 requests of a connection until it is closed."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", "0"))
+            if length > MAX_BODY_SIZE:
+                status, response = 400, {"error": "Request body too large"}
+                keep_alive = False
+            else:
+                body = await reader.readexactly(length)
+                # batches are CPU bound, and may load calendar files: keep the loop serving
+                status, response = await asyncio.get_running_loop().run_in_executor(
+                    None, handle_request, method, path, body
+                )
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+            content = json.dumps(response).encode()
+            writer.write(
+                (
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                ).encode("latin-1")
+                + content
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ValueError, asyncio.IncompleteReadError, ConnectionError) as e:
+        logger.debug(f"Closing connection after error: {e!r}")
+    finally:
+        writer.close()
+
+
+async def start_server(
+    host: str = "127.0.0.1", port: int = 8080, unix_socket: Optional[str] = None
+) -> asyncio.AbstractServer:
+    """Start serving on a TCP port, or on a Unix socket if a path is given."""
+    if unix_socket is not None:
+        return await asyncio.start_unix_server(_handle_connection, path=unix_socket)
+    return await asyncio.start_server(_handle_connection, host=host, port=port)
+
+
+async def serve(
+    host: str = "127.0.0.1", port: int = 8080, unix_socket: Optional[str] = None
+) -> None:
+    """Serve until cancelled."""
+    server = await start_server(host, port, unix_socket)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the server from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m business.server", description="Serve calendar operations over HTTP."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix-socket", help="serve on this Unix socket instead of TCP")
+    parser.add_argument(
+        "--load-path",
+        action="append",
+        default=[],
+        help="directory containing calendar files, may be repeated",
+    )
+    parser.add_argument(
+        "--preload", action="append", default=[], help="calendar to load on start up"
+    )
+    args = parser.parse_args(argv)
+
+    Calendar.load_paths = [*args.load_path, *Calendar.load_paths]
+    for name in args.preload:
+        Calendar.load_cache(name)
+    asyncio.run(serve(args.host, args.port, args.unix_socket))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
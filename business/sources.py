@@ -0,0 +1,176 @@
+"""Sources of calendar definitions.
+
+A calendar definition is the mapping found in a calendar YAML file, with the keys
+"working_days", "holidays" and "extra_working_dates". Calendar.load reads definitions from
+Calendar.source, which defaults to the YAML files of Calendar.load_paths. Other sources hold
+many calendars in a single place, and fetch them in bulk with get_many:
+
+>>> Calendar.source = SQLiteSource("calendars.db")
+>>> Calendar.load_cache_many(["tenant-1", "tenant-2"])
+"""
+import datetime
+import json
+import logging
+import os
+import sqlite3
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import yaml
+
+logger = logging.getLogger("business")
+
+Definition = Dict[str, Any]
+
+
+class CalendarSource:
+    """Base class for sources of calendar definitions."""
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, Definition]:
+        """Fetch the definitions of several calendars.
+
+        Raises ValueError if any of the calendars does not exist.
+        """
+        raise NotImplementedError
+
+    def get(self, name: str) -> Definition:
+        """Fetch the definition of a calendar."""
+        return self.get_many([name])[name]
+
+    def close(self) -> None:
+        """Release any resources held by the source."""
+
+    @staticmethod
+    def _check_found(names: Sequence[str], definitions: Dict[str, Definition]) -> None:
+        """Raise ValueError for the names without a definition."""
+        missing = [name for name in names if name not in definitions]
+        if len(missing) == 1:
+            raise ValueError(f"No such calendar '{missing[0]}'")
+        elif missing:
+            raise ValueError(f"No such calendars: {', '.join(missing)}")
+
+
+class DirectorySource(CalendarSource):
+    """Calendars stored as <name>.yml files in one or more directories.
+
+    The first directory containing a calendar's file wins.
+    """
+
+    def __init__(self, paths: Sequence[str]) -> None:
+        """Initialise the source with the directories to search."""
+        self.paths = paths
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, Definition]:
+        """Read the YAML files of several calendars."""
+        names = list(names)
+        definitions: Dict[str, Definition] = {}
+        for name in names:
+            for directory in self.paths:
+                calendar_filepath = os.path.join(directory, f"{name}.yml")
+                if os.path.exists(calendar_filepath):
+                    logger.debug(f"Extracting data from {calendar_filepath} yaml file")
+                    with open(calendar_filepath, "r") as fh:
+                        definitions[name] = yaml.safe_load(fh)
+                    break
+        self._check_found(names, definitions)
+        return definitions
+
+
+class BundleSource(CalendarSource):
+    """Many calendars stored in a single YAML file, mapping names to definitions.
+
+    The file is read once, the first time a calendar is fetched.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialise the source with the path of the bundle file."""
+        self.path = path
+        self._definitions: Optional[Dict[str, Definition]] = None
+        self._lock = Lock()
+
+    def _load(self) -> Dict[str, Definition]:
+        with self._lock:
+            if self._definitions is None:
+                logger.debug(f"Extracting data from {self.path} yaml bundle")
+                with open(self.path, "r") as fh:
+                    self._definitions = yaml.safe_load(fh) or {}
+            return self._definitions
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, Definition]:
+        """Look up several calendars in the bundle."""
+        names = list(names)
+        bundle = self._load()
+        definitions = {name: bundle[name] for name in names if name in bundle}
+        self._check_found(names, definitions)
+        return definitions
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    raise TypeError(f"Unexpected type {type(value)} in calendar definition")
+
+
+def _string_keys(value: Any) -> Any:
+    """Turn date keys, such as YAML gives working_days_from, into ISO strings for JSON."""
+    if isinstance(value, dict):
+        return {
+            key.isoformat() if isinstance(key, datetime.date) else key: _string_keys(item)
+            for key, item in value.items()
+        }
+    return value
+
+
+class SQLiteSource(CalendarSource):
+    """Calendars stored in a SQLite table, as JSON definitions keyed by name.
+
+    The table is created if it does not exist. A single connection is kept open and shared
+    between threads.
+    """
+
+    # SQLite limits the number of parameters of a statement (999 in older versions)
+    BATCH_SIZE = 500
+
+    def __init__(self, database: str, table: str = "calendars") -> None:
+        """Open the database."""
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self.table = table
+        self._connection = sqlite3.connect(database, check_same_thread=False)
+        self._lock = Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (name TEXT PRIMARY KEY, definition TEXT)"
+            )
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, Definition]:
+        """Fetch several calendars, with one query per batch of names."""
+        names = list(names)
+        definitions: Dict[str, Definition] = {}
+        with self._lock:
+            for start in range(0, len(names), self.BATCH_SIZE):
+                batch = names[start : start + self.BATCH_SIZE]
+                rows = self._connection.execute(
+                    f"SELECT name, definition FROM {self.table} "
+                    f"WHERE name IN ({', '.join('?' * len(batch))})",
+                    batch,
+                )
+                definitions.update((name, json.loads(definition)) for name, definition in rows)
+        self._check_found(names, definitions)
+        return {name: definitions[name] for name in names}
+
+    def put_many(self, definitions: Dict[str, Definition]) -> None:
+        """Store or replace several calendar definitions."""
+        rows: List[Any] = [
+            (name, json.dumps(_string_keys(definition), default=_json_default))
+            for name, definition in definitions.items()
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (name, definition) VALUES (?, ?)", rows
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,15 @@
+"""Helpers shared by the calendar and its engines."""
+import bisect
+import datetime
+from typing import Sequence
+
+day_interval = datetime.timedelta(days=1)
+
+
+def count_between(
+    sorted_dates: Sequence[datetime.date], start: datetime.date, end: datetime.date
+) -> int:
+    """Count the dates of a sorted list that fall in the half-open range [start, end)."""
+    if end <= start:
+        return 0
+    return bisect.bisect_left(sorted_dates, end) - bisect.bisect_left(sorted_dates, start)
@@ -0,0 +1,243 @@
+"""Effective-dated versions of a calendar.
+
+Holiday lists change over time, e.g. when a bank holiday is announced at short notice, and
+settlement dates computed in the past must be reproducible with the calendar as it was then.
+A VersionedCalendar keeps every version of a calendar:
+
+>>> versioned = VersionedCalendar(Calendar.load("bacs"))
+>>> versioned.add_version(datetime.datetime(2022, 9, 10), add_holidays=["2022-09-19"])
+>>> versioned.as_of(datetime.datetime(2022, 9, 1)).is_business_day("2022-09-19")
+    True
+>>> versioned.as_of(datetime.datetime(2022, 9, 12)).is_business_day("2022-09-19")
+    False
+
+Each version only stores its changes. Dates are kept in per-year buckets, and a version shares
+the buckets of the previous version for every year its changes don't touch, so versions of a
+calendar with decades of holidays cost little more than their changes. The Calendar of a
+version is created on demand from those buckets, without parsing or re-validating the dates
+it shares with the previous version, and the most recently used ones are kept. When an earlier
+version is already kept, its changes are applied to it with Calendar's incremental updates.
+
+The calendars of versions are read-only, so that a version always gives the same answers.
+"""
+import bisect
+import collections
+import datetime
+import itertools
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from dateutil.parser import parse as dateutil_parse
+
+from business.calendar import INPUT_TYPES, Calendar, CalendarData
+
+Buckets = Dict[int, Tuple[datetime.date, ...]]
+TIMESTAMP_TYPES = Union[str, datetime.date]
+
+
+def _buckets(dates: Iterable[datetime.date]) -> Buckets:
+    """Group sorted dates by year."""
+    return {year: tuple(group) for year, group in itertools.groupby(dates, key=lambda d: d.year)}
+
+
+def _apply(
+    buckets: Buckets, added: Iterable[datetime.date], removed: Iterable[datetime.date]
+) -> Buckets:
+    """Return new buckets with dates added and removed, sharing the unchanged years."""
+    changes: Dict[int, Tuple[List[datetime.date], List[datetime.date]]] = {}
+    for d in added:
+        changes.setdefault(d.year, ([], []))[0].append(d)
+    for d in removed:
+        changes.setdefault(d.year, ([], []))[1].append(d)
+
+    result = dict(buckets)
+    for year, (year_added, year_removed) in changes.items():
+        dates = set(result.get(year, ()))
+        dates.update(year_added)
+        dates.difference_update(year_removed)
+        if dates:
+            result[year] = tuple(sorted(dates))
+        else:
+            result.pop(year, None)
+    return result
+
+
+def _flatten(buckets: Buckets) -> List[datetime.date]:
+    """Return the dates of all buckets, sorted."""
+    return [d for year in sorted(buckets) for d in buckets[year]]
+
+
+def _parse_timestamp(timestamp: TIMESTAMP_TYPES) -> datetime.datetime:
+    """Parse a timestamp, keeping the time of strings; a date means the start of that day."""
+    if isinstance(timestamp, datetime.datetime):
+        return timestamp
+    if isinstance(timestamp, str):
+        return dateutil_parse(timestamp)
+    d = Calendar.parse_date(timestamp)
+    return datetime.datetime(d.year, d.month, d.day)
+
+
+class CalendarVersion:
+    """A version of a calendar: the changes made to the previous version."""
+
+    def __init__(
+        self,
+        effective_from: datetime.datetime,
+        holidays: Buckets,
+        extra_working_dates: Buckets,
+        added_holidays: Tuple[datetime.date, ...] = (),
+        removed_holidays: Tuple[datetime.date, ...] = (),
+        added_extra_working_dates: Tuple[datetime.date, ...] = (),
+        removed_extra_working_dates: Tuple[datetime.date, ...] = (),
+    ) -> None:
+        """Initialise the version."""
+        self.effective_from = effective_from
+        self.holidays = holidays
+        self.extra_working_dates = extra_working_dates
+        self.added_holidays = added_holidays
+        self.removed_holidays = removed_holidays
+        self.added_extra_working_dates = added_extra_working_dates
+        self.removed_extra_working_dates = removed_extra_working_dates
+
+    def __repr__(self) -> str:
+        """Summarise the changes of the version."""
+        return (
+            f"CalendarVersion(effective_from={self.effective_from.isoformat()}, "
+            f"added_holidays={len(self.added_holidays)}, "
+            f"removed_holidays={len(self.removed_holidays)}, "
+            f"added_extra_working_dates={len(self.added_extra_working_dates)}, "
+            f"removed_extra_working_dates={len(self.removed_extra_working_dates)})"
+        )
+
+
+class VersionedCalendar:
+    """A calendar with effective-dated versions of its holidays and extra working dates."""
+
+    def __init__(
+        self,
+        calendar: Calendar,
+        effective_from: TIMESTAMP_TYPES = datetime.datetime.min,
+        max_cached_versions: int = 16,
+    ) -> None:
+        """Initialise with the first version of the calendar, effective from the given time."""
+        self._week = calendar.data.week
+        self._engine_factory = calendar._engine_factory
+        self.versions = [
+            CalendarVersion(
+                _parse_timestamp(effective_from),
+                _buckets(calendar.data.holidays),
+                _buckets(calendar.data.extra_working_dates),
+            )
+        ]
+        self._effective_froms = [self.versions[0].effective_from]
+        self._calendars: "collections.OrderedDict[int, Calendar]" = collections.OrderedDict()
+        # a copy of the calendar's current dates, unaffected by later changes to the calendar
+        self._calendars[0] = self._frozen(calendar.data)
+        self._max_cached_versions = max_cached_versions
+        self._lock = Lock()
+
+    def _frozen(self, data: CalendarData) -> Calendar:
+        """Return a read-only calendar of a version's dates."""
+        calendar = Calendar._from_data(data, self._engine_factory)
+        calendar._read_only = True
+        return calendar
+
+    def add_version(
+        self,
+        effective_from: TIMESTAMP_TYPES,
+        add_holidays: Iterable[INPUT_TYPES] = (),
+        remove_holidays: Iterable[INPUT_TYPES] = (),
+        add_extra_working_dates: Iterable[INPUT_TYPES] = (),
+        remove_extra_working_dates: Iterable[INPUT_TYPES] = (),
+    ) -> CalendarVersion:
+        """Add a version, effective from the given time, changing the latest version.
+
+        Only the changed dates are validated.
+        """
+        effective = _parse_timestamp(effective_from)
+        added_holidays = tuple(Calendar.parse_dates(list(add_holidays)))
+        removed_holidays = tuple(Calendar.parse_dates(list(remove_holidays)))
+        added_extras = tuple(Calendar.parse_dates(list(add_extra_working_dates)))
+        removed_extras = tuple(Calendar.parse_dates(list(remove_extra_working_dates)))
+
+        with self._lock:
+            latest = self.versions[-1]
+            if effective <= latest.effective_from:
+                raise ValueError(
+                    f"Versions must be added in order: {effective} is not after "
+                    f"{latest.effective_from}"
+                )
+            holidays = _apply(latest.holidays, added_holidays, removed_holidays)
+            extras = _apply(latest.extra_working_dates, added_extras, removed_extras)
+
+            for d in added_holidays:
+                if d in extras.get(d.year, ()):
+                    raise ValueError(f"Holidays cannot be extra working dates: {d}")
+            for d in added_extras:
+                if self._week.is_working_day(d):
+                    raise ValueError(f"Extra working dates cannot be on working days: {d}")
+                if d in holidays.get(d.year, ()):
+                    raise ValueError(f"Holidays cannot be extra working dates: {d}")
+
+            version = CalendarVersion(
+                effective,
+                holidays,
+                extras,
+                added_holidays,
+                removed_holidays,
+                added_extras,
+                removed_extras,
+            )
+            self.versions.append(version)
+            self._effective_froms.append(effective)
+            return version
+
+    def version_index(self, timestamp: TIMESTAMP_TYPES) -> int:
+        """Return the index of the version effective at the given time."""
+        index = bisect.bisect_right(self._effective_froms, _parse_timestamp(timestamp)) - 1
+        if index < 0:
+            raise ValueError(f"No version of the calendar is effective at {timestamp}")
+        return index
+
+    def as_of(self, timestamp: TIMESTAMP_TYPES) -> Calendar:
+        """Return the calendar as it was at the given time."""
+        return self.calendar(self.version_index(timestamp))
+
+    def calendar(self, index: int) -> Calendar:
+        """Return the calendar of a version."""
+        with self._lock:
+            calendar: Optional[Calendar] = self._calendars.get(index)
+            if calendar is not None:
+                self._calendars.move_to_end(index)
+                return calendar
+            # the closest earlier version already materialised, if any
+            base = max((i for i in self._calendars if i < index), default=None)
+            data = None if base is None else self._calendars[base].data
+
+        if base is None or data is None:
+            version = self.versions[index]
+            data = CalendarData(
+                _flatten(version.holidays),
+                self._week,
+                _flatten(version.extra_working_dates),
+            )
+        else:
+            # apply the changes of the following versions, updating the indexes incrementally
+            for version in self.versions[base + 1 : index + 1]:
+                data = data.with_changes(
+                    list(version.added_holidays),
+                    list(version.removed_holidays),
+                    list(version.added_extra_working_dates),
+                    list(version.removed_extra_working_dates),
+                )
+        calendar = self._frozen(data)
+        with self._lock:
+            self._calendars[index] = calendar
+            while len(self._calendars) > self._max_cached_versions:
+                self._calendars.popitem(last=False)
+        return calendar
+
+    @property
+    def latest(self) -> Calendar:
+        """Return the calendar of the latest version."""
+        return self.calendar(len(self.versions) - 1)
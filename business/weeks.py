@@ -0,0 +1,137 @@
+"""Working days of the week, which can change over time.
+
+Most calendars have one working week for their whole life, but some schemes change it: the
+UAE moved from a Friday/Saturday to a Saturday/Sunday weekend at the start of 2022. A
+WorkingWeek holds the working days in effect before any change, and the working days in
+effect from each change:
+
+>>> WorkingWeek(
+...     ["sunday", "monday", "tuesday", "wednesday", "thursday"],
+...     {datetime.date(2022, 1, 1): ["monday", "tuesday", "wednesday", "thursday", "friday"]},
+... )
+
+Each pattern applies to a segment of dates. The number of working days before every segment
+is precomputed, so counting the working days between two dates takes a binary search over
+the segments and some arithmetic, however many weeks and changes lie between them.
+"""
+import bisect
+import datetime
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+DAY_NAMES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+# 0001-01-01 has ordinal 1 and was a Monday, so weeks are counted from it
+_FIRST_ORDINAL = 1
+
+
+def _weekdays(working_days: Sequence[str]) -> List[int]:
+    """Return the weekdays (Monday is 0) of working day names, validating them."""
+    weekdays = set()
+    for name in working_days:
+        w = name[:3].lower()
+        if w not in DAY_NAMES:
+            raise ValueError(f"Invalid working day name: {w}")
+        weekdays.add(DAY_NAMES.index(w))
+    return sorted(weekdays)
+
+
+class WorkingWeek:
+    """Working days of the week, in segments of dates with the same weekly pattern."""
+
+    def __init__(
+        self,
+        working_days: Sequence[str],
+        working_days_from: Optional[Mapping[datetime.date, Sequence[str]]] = None,
+    ) -> None:
+        """Initialise with the working days before any change, and those from each change.
+
+        Working days are given by name, of which only the first three letters count.
+        """
+        changes = sorted((d, _weekdays(days)) for d, days in (working_days_from or {}).items())
+        self.working_days = [DAY_NAMES[w] for w in _weekdays(working_days)]
+        self.working_days_from: Dict[datetime.date, List[str]] = {
+            d: [DAY_NAMES[w] for w in weekdays] for d, weekdays in changes
+        }
+
+        # segment i covers the ordinals [starts[i], starts[i + 1])
+        self.starts = [_FIRST_ORDINAL] + [d.toordinal() for d, _ in changes]
+        self.patterns = [_weekdays(working_days)] + [weekdays for _, weekdays in changes]
+        self._is_working = [[w in p for w in range(7)] for p in self.patterns]
+        # number of working days in the first r days of a week starting on Monday
+        self._prefixes = [[sum(flags[:r]) for r in range(8)] for flags in self._is_working]
+        # number of working days before the start of each segment
+        self._counts = [0]
+        for i in range(1, len(self.starts)):
+            self._counts.append(
+                self._counts[-1]
+                + self._weekly_count(i - 1, self.starts[i])
+                - self._weekly_count(i - 1, self.starts[i - 1])
+            )
+
+    @property
+    def segments(self) -> List[Tuple[int, List[bool]]]:
+        """Return the first ordinal of each segment, with its working days flags by weekday."""
+        return list(zip(self.starts, self._is_working))
+
+    @property
+    def fewest_days_per_week(self) -> int:
+        """Return the smallest number of working days per week of any segment."""
+        return min(len(p) for p in self.patterns)
+
+    def __eq__(self, other: object) -> bool:
+        """Return true if both working weeks have the same segments."""
+        if not isinstance(other, WorkingWeek):
+            return NotImplemented
+        return self.starts == other.starts and self.patterns == other.patterns
+
+    def __hash__(self) -> int:
+        """Hash the segments."""
+        return hash((tuple(self.starts), tuple(tuple(p) for p in self.patterns)))
+
+    def __repr__(self) -> str:
+        """Describe the working days of each segment."""
+        return f"WorkingWeek({self.working_days!r}, {self.working_days_from!r})"
+
+    def _segment(self, ordinal: int) -> int:
+        """Return the index of the segment containing an ordinal."""
+        if len(self.starts) == 1:
+            return 0
+        return max(bisect.bisect_right(self.starts, ordinal) - 1, 0)
+
+    def _weekly_count(self, segment: int, ordinal: int) -> int:
+        """Count the working days in [0001-01-01, ordinal), with a segment's pattern."""
+        weeks, days = divmod(ordinal - _FIRST_ORDINAL, 7)
+        return weeks * len(self.patterns[segment]) + self._prefixes[segment][days]
+
+    def is_working_ordinal(self, ordinal: int) -> bool:
+        """Return true if the date with the given ordinal is a working day of the week."""
+        return self._is_working[self._segment(ordinal)][(ordinal - _FIRST_ORDINAL) % 7]
+
+    def is_working_day(self, input_date: datetime.date) -> bool:
+        """Return true if the date given is a working day of the week."""
+        if len(self.starts) == 1:
+            return self._is_working[0][input_date.weekday()]
+        return self.is_working_ordinal(input_date.toordinal())
+
+    def count(self, ordinal: int) -> int:
+        """Count the working days of the week in [0001-01-01, ordinal), ignoring holidays."""
+        i = self._segment(ordinal)
+        return (
+            self._counts[i]
+            + self._weekly_count(i, ordinal)
+            - self._weekly_count(i, self.starts[i])
+        )
+
+    def count_between(self, from_date: datetime.date, to_date: datetime.date) -> int:
+        """Count the working days of the week in [from_date, to_date), negated if reversed."""
+        return self.count(to_date.toordinal()) - self.count(from_date.toordinal())
+
+    def select(self, count: int) -> int:
+        """Return the ordinal of the working day of the week preceded by count such days."""
+        i = max(bisect.bisect_right(self._counts, count) - 1, 0)
+        pattern = self.patterns[i]
+        if not pattern:
+            raise ValueError("Calendar has no working days")
+        target = count - self._counts[i] + self._weekly_count(i, self.starts[i])
+        weeks, index = divmod(target, len(pattern))
+        return _FIRST_ORDINAL + 7 * weeks + pattern[index]
@@ -0,0 +1,387 @@
+"""Calendars restricted to a range of dates.
+
+Jobs which only touch a few months of dates needn't carry a calendar's full history of
+holidays. Calendar.window returns a calendar holding only the holidays and extra working dates
+of a range, which gives the same answers as the full calendar inside the range:
+
+>>> calendar = Calendar.load("bacs")
+>>> window = calendar.window("2022-01-01", "2022-12-31")
+>>> window.add_business_days("2022-09-15", 3)
+    datetime.date(2022, 9, 20)
+
+Any query needing a date outside the range, including a result falling outside it, raises
+OutsideWindowError, unless the window was created with fallback=True, in which case the query
+is answered by the full calendar instead. Windows can also be given a dense index, with one
+entry per day of the range, answering business_days_between and add_business_days with a
+single lookup.
+"""
+import array
+import bisect
+import datetime
+import functools
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar, cast
+
+from business.aging import is_array
+from business.calendar import INPUT_TYPES, Calendar, CalendarData
+from business.engines import Engine, EngineFactory
+from business.periods import Period, _month_start
+from business.utils import day_interval
+from business.weeks import WorkingWeek
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class OutsideWindowError(ValueError):
+    """A query on a calendar window needs dates outside the window."""
+
+
+def _slice(
+    dates: List[datetime.date], start: datetime.date, end: datetime.date
+) -> List[datetime.date]:
+    """Return the sorted dates in [start, end]."""
+    return dates[bisect.bisect_left(dates, start) : bisect.bisect_right(dates, end)]
+
+
+class WindowData(CalendarData):
+    """Dates of a calendar window, which know the business days of [start, end] only."""
+
+    def __init__(
+        self,
+        start: datetime.date,
+        end: datetime.date,
+        holidays: List[datetime.date],
+        week: WorkingWeek,
+        extra_working_dates: List[datetime.date],
+        working_holidays: Optional[List[datetime.date]] = None,
+        version: int = 0,
+    ) -> None:
+        """Initialise the snapshot from the sorted dates within [start, end]."""
+        super().__init__(holidays, week, extra_working_dates, working_holidays, version)
+        self.start = start
+        self.end = end
+
+    def check(self, input_date: datetime.date) -> None:
+        """Raise OutsideWindowError if the date is outside the window."""
+        if not self.start <= input_date <= self.end:
+            raise OutsideWindowError(
+                f"{input_date} is outside the calendar window {self.start} to {self.end}"
+            )
+
+    def is_holiday(self, input_date: datetime.date) -> bool:
+        """Return true if the date given is a holiday."""
+        self.check(input_date)
+        return super().is_holiday(input_date)
+
+    def is_extra_working_date(self, input_date: datetime.date) -> bool:
+        """Return true if the date given is an extra working date."""
+        self.check(input_date)
+        return super().is_extra_working_date(input_date)
+
+    def with_changes(
+        self,
+        add_holidays: List[datetime.date],
+        remove_holidays: List[datetime.date],
+        add_extra_working_dates: List[datetime.date],
+        remove_extra_working_dates: List[datetime.date],
+    ) -> "WindowData":
+        """Return a new snapshot with dates added and removed, all within the window."""
+        for d in [
+            *add_holidays,
+            *remove_holidays,
+            *add_extra_working_dates,
+            *remove_extra_working_dates,
+        ]:
+            self.check(d)
+        data = super().with_changes(
+            add_holidays, remove_holidays, add_extra_working_dates, remove_extra_working_dates
+        )
+        window = WindowData(
+            self.start,
+            self.end,
+            data.holidays,
+            data.week,
+            data.extra_working_dates,
+            data.working_holidays,
+            data.version,
+        )
+        window._intervals = data._intervals
+        return window
+
+
+class DenseIndex:
+    """Business day counts for every day of a window, in compact arrays."""
+
+    def __init__(self, data: WindowData) -> None:
+        """Build the index from the window's dates."""
+        self.start = data.start.toordinal()
+        self.end = data.end.toordinal()
+        # counts[i] is the number of business days in the window before its i-th day
+        self.counts = array.array("l", [0])
+        self.business_days = array.array("l")
+        for o in range(self.start, self.end + 1):
+            if data.is_business_day(datetime.date.fromordinal(o)):
+                self.business_days.append(o)
+            self.counts.append(len(self.business_days))
+
+    def ordinal(self, input_date: datetime.date) -> int:
+        """Count the business days of the window before the given date."""
+        o = input_date.toordinal()
+        if not self.start <= o <= self.end + 1:
+            raise OutsideWindowError(f"{input_date} is outside the calendar window")
+        return self.counts[o - self.start]
+
+    def from_ordinal(self, ordinal: int) -> datetime.date:
+        """Return the business day preceded by the given number of business days."""
+        if not 0 <= ordinal < len(self.business_days):
+            raise OutsideWindowError("Result is outside the calendar window")
+        return datetime.date.fromordinal(self.business_days[ordinal])
+
+
+class DenseEngine(Engine):
+    """Engine answering from the dense index of a calendar window."""
+
+    name = "dense"
+
+    def __init__(self, calendar: Calendar) -> None:
+        """Build the dense index of the window."""
+        super().__init__(calendar)
+        data = cast(WindowData, calendar.data)
+        self._indexed = (data, DenseIndex(data))
+
+    @property
+    def index(self) -> DenseIndex:
+        """Return the dense index of the calendar's current dates."""
+        data = cast(WindowData, self.calendar.data)
+        indexed, index = self._indexed
+        if data is not indexed:
+            # rebuilt when the window's dates change
+            index = DenseIndex(data)
+            self._indexed = (data, index)
+        return index
+
+    def business_days_between(self, from_date: datetime.date, to_date: datetime.date) -> int:
+        """Count the business days from start of from_date to start of to_date."""
+        index = self.index
+        return index.ordinal(to_date) - index.ordinal(from_date)
+
+    def add_business_days(self, input_date: datetime.date, delta: int) -> datetime.date:
+        """Add or subtract a number of business days to a date."""
+        index = self.index
+        if delta == 0:
+            return input_date
+        elif delta < 0:
+            return index.from_ordinal(index.ordinal(input_date + day_interval) - 1 + delta)
+        else:
+            return index.from_ordinal(index.ordinal(input_date) + delta)
+
+
+class WindowEngine(Engine):
+    """Engine checking that the dates used by another engine are within the window."""
+
+    def __init__(self, calendar: Calendar, engine: EngineFactory) -> None:
+        """Initialise the wrapped engine for the window."""
+        super().__init__(calendar)
+        self.engine = engine(calendar)
+        self.name = self.engine.name
+
+    def business_days_between(self, from_date: datetime.date, to_date: datetime.date) -> int:
+        """Count the business days from start of from_date to start of to_date."""
+        data = cast(WindowData, self.calendar.data)
+        # counting up to the day after the window only needs the window's days
+        data.check(from_date - day_interval if from_date > data.end else from_date)
+        data.check(to_date - day_interval if to_date > data.end else to_date)
+        return self.engine.business_days_between(from_date, to_date)
+
+    def add_business_days(self, input_date: datetime.date, delta: int) -> datetime.date:
+        """Add or subtract a number of business days to a date."""
+        data = cast(WindowData, self.calendar.data)
+        data.check(input_date)
+        result = self.engine.add_business_days(input_date, delta)
+        data.check(result)
+        return result
+
+
+def _fallback(method: F) -> F:
+    """Answer a query with the full calendar when it falls outside the window."""
+
+    @functools.wraps(method)
+    def wrapper(self: "CalendarWindow", *args: Any, **kwargs: Any) -> Any:
+        try:
+            return method(self, *args, **kwargs)
+        except OutsideWindowError:
+            if self.fallback is None:
+                raise
+            return getattr(self.fallback, method.__name__)(*args, **kwargs)
+
+    return cast(F, wrapper)
+
+
+class CalendarWindow(Calendar):
+    """A calendar restricted to the dates of [start, end]."""
+
+    start: datetime.date
+    end: datetime.date
+    fallback: Optional[Calendar]
+
+    def holidays_between(
+        self, from_date: INPUT_TYPES, to_date: INPUT_TYPES
+    ) -> List[datetime.date]:
+        """Return the holidays in [from_date, to_date), which must be within the window."""
+        from_date = self.parse_date(from_date)
+        to_date = self.parse_date(to_date)
+        if from_date < to_date:
+            data = cast(WindowData, self.data)
+            data.check(from_date)
+            data.check(to_date - day_interval)
+        return super().holidays_between(from_date, to_date)
+
+    def count_holidays_between(self, from_date: INPUT_TYPES, to_date: INPUT_TYPES) -> int:
+        """Count the holidays in [from_date, to_date), which must be within the window."""
+        return len(self.holidays_between(from_date, to_date))
+
+    def next_holiday(self, input_date: INPUT_TYPES) -> Optional[datetime.date]:
+        """Return the first holiday after the given date, which must be within the window."""
+        input_date = self.parse_date(input_date)
+        data = cast(WindowData, self.data)
+        data.check(input_date)
+        holiday = super().next_holiday(input_date)
+        if holiday is None:
+            raise OutsideWindowError(f"No holiday after {input_date} in the calendar window")
+        return holiday
+
+    def _check_period(self, start: datetime.date, end: datetime.date) -> None:
+        """Raise OutsideWindowError unless [start, end) is within the window."""
+        data = cast(WindowData, self.data)
+        data.check(start)
+        data.check(end - day_interval)
+
+    def business_days_in_month(self, input_date: INPUT_TYPES) -> int:
+        """Count the business days of a month, which must be within the window."""
+        input_date = self.parse_date(input_date)
+        start = _month_start(input_date.year, input_date.month)
+        self._check_period(start, _month_start(input_date.year, input_date.month + 1))
+        return super().business_days_in_month(input_date)
+
+    def business_days_in_quarter(self, input_date: INPUT_TYPES) -> int:
+        """Count the business days of a quarter, which must be within the window."""
+        input_date = self.parse_date(input_date)
+        first_month = (input_date.month - 1) // 3 * 3 + 1
+        start = _month_start(input_date.year, first_month)
+        self._check_period(start, _month_start(input_date.year, first_month + 3))
+        return super().business_days_in_quarter(input_date)
+
+    def business_days_in_year(self, input_date: INPUT_TYPES) -> int:
+        """Count the business days of a year, which must be within the window."""
+        input_date = self.parse_date(input_date)
+        self._check_period(_month_start(input_date.year, 1), _month_start(input_date.year + 1, 1))
+        return super().business_days_in_year(input_date)
+
+    def period_summary(
+        self, start: INPUT_TYPES, end: INPUT_TYPES, freq: str = "month"
+    ) -> List[Period]:
+        """List the business days of each period overlapping [start, end], within the window."""
+        periods = super().period_summary(start, end, freq)
+        if periods:
+            self._check_period(periods[0].start, periods[-1].end)
+        return periods
+
+    def preimage(
+        self, target: INPUT_TYPES, delta: int
+    ) -> Optional[Tuple[datetime.date, datetime.date]]:
+        """Return the dates add_business_days takes to target, all within the window."""
+        target = self.parse_date(target)
+        data = cast(WindowData, self.data)
+        data.check(target)
+        result = super().preimage(target, delta)
+        if result is not None:
+            first, last = result
+            # the business days bounding the range must be in the window too
+            data.check(first - day_interval if delta > 0 else first)
+            data.check(last + day_interval if delta < 0 else last)
+        return result
+
+    def preimages(
+        self, targets: Iterable[INPUT_TYPES], delta: int
+    ) -> List[Optional[Tuple[datetime.date, datetime.date]]]:
+        """Return the preimage of each target date with delta, within the window."""
+        return [self.preimage(target, delta) for target in targets]
+
+    def business_age(self, dates: Iterable[INPUT_TYPES], as_of: INPUT_TYPES) -> Sequence[int]:
+        """Count the business days from each date to as_of, all within the window."""
+        as_of = self.parse_date(as_of)
+        if is_array(dates):
+            array_dates: Any = dates
+            bounds = [
+                d.astype("datetime64[D]").astype(object)
+                for d in ([array_dates.min(), array_dates.max()] if len(array_dates) else [])
+            ]
+        else:
+            dates = self.parse_dates(list(dates))
+            bounds = [min(dates), max(dates)] if dates else []
+        data = cast(WindowData, self.data)
+        try:
+            for d in [*bounds, as_of]:
+                # counting up to the day after the window only needs the window's days
+                data.check(d - day_interval if d > data.end else d)
+        except OutsideWindowError:
+            # not wrapped with _fallback, as the dates may have been an iterator
+            if self.fallback is None:
+                raise
+            return self.fallback.business_age(dates, as_of)
+        return super().business_age(dates, as_of)
+
+
+# every query depending on holidays can fall back to the full calendar
+for _name in [
+    "is_holiday",
+    "is_extra_working_date",
+    "holidays_between",
+    "count_holidays_between",
+    "next_holiday",
+    "is_business_day",
+    "business_days_between",
+    "roll_forward",
+    "roll_backward",
+    "next_business_day",
+    "previous_business_day",
+    "add_business_days",
+    "get_business_day_of_month",
+    "business_days_in_month",
+    "business_days_in_quarter",
+    "business_days_in_year",
+    "period_summary",
+    "preimage",
+]:
+    setattr(CalendarWindow, _name, _fallback(getattr(CalendarWindow, _name)))
+
+
+def window(
+    calendar: Calendar,
+    start: INPUT_TYPES,
+    end: INPUT_TYPES,
+    dense: bool = False,
+    fallback: bool = False,
+) -> CalendarWindow:
+    """Return a calendar restricted to the dates of [start, end]. See Calendar.window."""
+    start = calendar.parse_date(start)
+    end = calendar.parse_date(end)
+    if end < start:
+        raise ValueError(f"Window end {end} is before its start {start}")
+
+    data = calendar.data
+    window_data = WindowData(
+        start,
+        end,
+        _slice(data.holidays, start, end),
+        data.week,
+        _slice(data.extra_working_dates, start, end),
+        _slice(data.working_holidays, start, end),
+    )
+    factory = functools.partial(
+        WindowEngine, engine=DenseEngine if dense else calendar._engine_factory
+    )
+    result = cast(CalendarWindow, CalendarWindow._from_data(window_data, factory))
+    result.start = start
+    result.end = end
+    result.fallback = calendar if fallback else None
+    return result
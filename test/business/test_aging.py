@@ -0,0 +1,123 @@
+import datetime
+import random
+import unittest
+
+import pytest
+
+from business.calendar import Calendar
+from business.window import OutsideWindowError
+
+HOLIDAYS = ["2020-01-01", "2020-04-10", "2020-04-13", "2020-12-25", "2020-12-28", "2021-01-01"]
+
+calendars = [
+    Calendar(holidays=HOLIDAYS, extra_working_dates=["2020-04-11", "2020-12-27"]),
+    Calendar(holidays=HOLIDAYS, extra_working_dates=["2020-04-11"], engine="intervals"),
+    Calendar(
+        working_days=["sun", "mon", "tue", "wed", "thu"],
+        working_days_from={"2020-07-01": ["mon", "tue", "wed", "thu", "fri"]},
+        holidays=HOLIDAYS,
+    ),
+]
+
+
+def random_dates(count, seed=0):
+    rng = random.Random(seed)
+    start = datetime.date(2019, 11, 1)
+    return [start + datetime.timedelta(days=rng.randrange(500)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("calendar", calendars)
+@pytest.mark.parametrize("as_of", ["2020-04-12", "2020-07-01", "2021-01-04", "2019-10-01"])
+def test_ages_match_business_days_between(calendar, as_of):
+    dates = random_dates(300)
+    expected = [calendar.business_days_between(d, as_of) for d in dates]
+    assert calendar.business_age(dates, as_of) == expected
+
+
+@pytest.mark.parametrize("calendar", calendars)
+def test_numpy_ages_match(calendar):
+    np = pytest.importorskip("numpy")
+    dates = random_dates(300, seed=1)
+    array = np.array(dates, dtype="datetime64[D]")
+    ages = calendar.business_age(array, "2020-09-15")
+    assert isinstance(ages, np.ndarray)
+    assert ages.tolist() == calendar.business_age(dates, "2020-09-15")
+
+
+class TestBusinessAge(unittest.TestCase):
+    def setUp(self):
+        self.calendar = calendars[0]
+
+    def test_input_types_and_order_are_kept(self):
+        self.assertEqual(
+            self.calendar.business_age(
+                ["2020-04-14", datetime.date(2020, 4, 9), datetime.datetime(2020, 4, 14, 9)],
+                "2020-04-15",
+            ),
+            [1, 3, 1],
+        )
+
+    def test_empty(self):
+        self.assertEqual(self.calendar.business_age([], "2020-04-15"), [])
+
+    def test_nat_is_rejected(self):
+        np = pytest.importorskip("numpy")
+        with self.assertRaises(ValueError):
+            self.calendar.business_age(
+                np.array(["2020-01-01", "NaT"], dtype="datetime64[D]"), "2020-04-15"
+            )
+
+    def test_buckets(self):
+        dates = ["2020-04-15", "2020-04-14", "2020-04-09", "2020-03-01", "2020-05-01"]
+        # ages 0, 1, 3, 32, -12
+        self.assertEqual(
+            self.calendar.bucket_by_business_age(dates, "2020-04-15", [1, 6, 31]),
+            [2, 2, 0, 1],
+        )
+
+    def test_numpy_buckets(self):
+        np = pytest.importorskip("numpy")
+        dates = random_dates(200, seed=2)
+        self.assertEqual(
+            self.calendar.bucket_by_business_age(
+                np.array(dates, dtype="datetime64[D]"), "2020-09-15", [0, 10, 100]
+            ),
+            self.calendar.bucket_by_business_age(dates, "2020-09-15", [0, 10, 100]),
+        )
+
+    def test_buckets_must_ascend(self):
+        with self.assertRaisesRegex(ValueError, "strictly ascending"):
+            self.calendar.bucket_by_business_age(["2020-04-15"], "2020-04-15", [5, 5])
+
+
+class TestWindow(unittest.TestCase):
+    def setUp(self):
+        self.calendar = calendars[0]
+        self.dates = ["2020-03-02", "2020-04-09", "2020-05-01"]
+
+    def test_within_window(self):
+        window = self.calendar.window("2020-03-01", "2020-05-31")
+        self.assertEqual(
+            window.business_age(self.dates, "2020-06-01"),
+            self.calendar.business_age(self.dates, "2020-06-01"),
+        )
+
+    def test_outside_window(self):
+        window = self.calendar.window("2020-03-01", "2020-05-31")
+        with self.assertRaises(OutsideWindowError):
+            window.business_age(self.dates, "2020-06-02")
+        with self.assertRaises(OutsideWindowError):
+            window.business_age(["2020-02-28"], "2020-04-15")
+
+    def test_fallback_with_iterator(self):
+        window = self.calendar.window("2020-04-01", "2020-05-31", fallback=True)
+        self.assertEqual(
+            window.business_age(iter(self.dates), "2020-04-15"),
+            self.calendar.business_age(self.dates, "2020-04-15"),
+        )
+
+    def test_numpy_outside_window(self):
+        np = pytest.importorskip("numpy")
+        window = self.calendar.window("2020-04-01", "2020-05-31")
+        with self.assertRaises(OutsideWindowError):
+            window.business_age(np.array(self.dates, dtype="datetime64[D]"), "2020-04-15")
@@ -0,0 +1,141 @@
+import datetime
+import random
+
+import pytest
+
+from business.calendar import Calendar
+
+pa = pytest.importorskip("pyarrow")
+pytest.importorskip("numpy")
+arrow = pytest.importorskip("business.arrow")
+
+start_date = datetime.date(2020, 1, 1)
+
+
+@pytest.fixture
+def calendar():
+    return Calendar(
+        holidays=["2020-01-01", "2020-04-10", "2020-04-13", "2020-12-25", "2020-12-28"],
+        extra_working_dates=["2020-06-06"],
+    )
+
+
+@pytest.fixture
+def dates():
+    rng = random.Random(42)
+    return [start_date + datetime.timedelta(days=rng.randrange(366)) for _ in range(500)]
+
+
+def test_to_arrow(calendar):
+    data = arrow.to_arrow(calendar)
+    assert data["holidays"].to_pylist() == calendar.holidays
+    assert data["extra_working_dates"].to_pylist() == [datetime.date(2020, 6, 6)]
+    assert data["working_days"].to_pylist() == [True] * 5 + [False] * 2
+
+
+def test_is_business_day(calendar, dates):
+    result = arrow.is_business_day(calendar, pa.array(dates, pa.date32()))
+    assert result.to_pylist() == [calendar.is_business_day(d) for d in dates]
+
+
+def test_business_days_between(calendar, dates):
+    from_dates = sorted(dates)[:250]
+    to_dates = sorted(dates)[250:]
+    result = arrow.business_days_between(
+        calendar, pa.array(from_dates, pa.date32()), pa.array(to_dates, pa.date32())
+    )
+    expected = [calendar.business_days_between(a, b) for a, b in zip(from_dates, to_dates)]
+    assert result.to_pylist() == expected
+
+
+@pytest.mark.parametrize("delta", [0, 1, 3, -1, -7, 40])
+def test_add_business_days(calendar, dates, delta):
+    result = arrow.add_business_days(calendar, pa.array(dates, pa.date32()), delta)
+    assert result.to_pylist() == [calendar.add_business_days(d, delta) for d in dates]
+
+
+def test_add_business_days_with_delta_array(calendar, dates):
+    deltas = [i % 11 - 5 for i in range(len(dates))]
+    result = arrow.add_business_days(
+        calendar, pa.array(dates, pa.date32()), pa.array(deltas, pa.int64())
+    )
+    assert result.to_pylist() == [calendar.add_business_days(d, n) for d, n in zip(dates, deltas)]
+
+
+def test_nulls_and_slices_are_preserved(calendar, dates):
+    array = pa.array([None, *dates[:10], None], pa.date32()).slice(1)
+    result = arrow.add_business_days(calendar, array, 2)
+    assert result.to_pylist() == [calendar.add_business_days(d, 2) for d in dates[:10]] + [None]
+
+
+def test_chunked_arrays(calendar, dates):
+    chunked = pa.chunked_array([pa.array(dates[:100], pa.date32()), pa.array(dates[100:])])
+    result = arrow.is_business_day(calendar, chunked)
+    assert isinstance(result, pa.ChunkedArray)
+    assert result.to_pylist() == [calendar.is_business_day(d) for d in dates]
+
+
+def test_polars_expressions(calendar, dates):
+    pl = pytest.importorskip("polars")
+    business_polars = pytest.importorskip("business.polars")
+    df = pl.DataFrame({"date": dates, "to_date": sorted(dates), "delta": [2] * len(dates)})
+    result = df.select(
+        business_polars.is_business_day(calendar, pl.col("date")).alias("is_business_day"),
+        business_polars.add_business_days(calendar, pl.col("date"), -2).alias("minus_two"),
+        business_polars.add_business_days(calendar, pl.col("date"), pl.col("delta")).alias("plus"),
+        business_polars.business_days_between(calendar, pl.col("date"), pl.col("to_date")).alias(
+            "between"
+        ),
+    )
+    assert result["is_business_day"].to_list() == [calendar.is_business_day(d) for d in dates]
+    assert result["minus_two"].to_list() == [calendar.add_business_days(d, -2) for d in dates]
+    assert result["plus"].to_list() == [calendar.add_business_days(d, 2) for d in dates]
+    between = [
+        calendar.business_days_between(a, b) for a, b in zip(dates, sorted(dates)) if a <= b
+    ]
+    assert [n for n, a, b in zip(result["between"], dates, sorted(dates)) if a <= b] == between
+
+
+def test_working_week_changes(dates):
+    calendar = Calendar(
+        holidays=["2020-04-10"],
+        working_days=["sun", "mon", "tue", "wed", "thu"],
+        working_days_from={"2020-07-01": ["mon", "tue", "wed", "thu", "fri"]},
+    )
+    result = arrow.is_business_day(calendar, pa.array(dates, pa.date32()))
+    assert result.to_pylist() == [calendar.is_business_day(d) for d in dates]
+    result = arrow.add_business_days(calendar, pa.array(dates, pa.date32()), 10)
+    assert result.to_pylist() == [calendar.add_business_days(d, 10) for d in dates]
+    with pytest.raises(ValueError):
+        arrow.to_arrow(calendar)
+
+
+def test_calendar_windows(calendar, dates):
+    window = calendar.window("2020-01-01", "2020-06-30")
+    inside = [d for d in dates if d < datetime.date(2020, 6, 20)]
+    result = arrow.is_business_day(window, pa.array(inside + [None], pa.date32()))
+    assert result.to_pylist() == [calendar.is_business_day(d) for d in inside] + [None]
+    result = arrow.add_business_days(window, pa.array(inside, pa.date32()), 3)
+    assert result.to_pylist() == [calendar.add_business_days(d, 3) for d in inside]
+    result = arrow.business_days_between(
+        window, pa.array(inside, pa.date32()), pa.array([datetime.date(2020, 7, 1)] * len(inside))
+    )
+    assert result.to_pylist() == [
+        calendar.business_days_between(d, datetime.date(2020, 7, 1)) for d in inside
+    ]
+
+    outside = pa.array([datetime.date(2020, 5, 1), datetime.date(2020, 12, 25)], pa.date32())
+    with pytest.raises(arrow.OutsideWindowError):
+        arrow.is_business_day(window, outside)
+    with pytest.raises(arrow.OutsideWindowError):
+        arrow.business_days_between(window, outside, outside)
+    with pytest.raises(arrow.OutsideWindowError):
+        arrow.add_business_days(window, pa.array([datetime.date(2020, 6, 29)], pa.date32()), 3)
+    with pytest.raises(ValueError):
+        arrow.to_arrow(window)
+
+    window = calendar.window("2020-01-01", "2020-06-30", fallback=True)
+    assert arrow.is_business_day(window, outside).to_pylist() == [True, False]
+    assert arrow.add_business_days(window, outside, -1).to_pylist() == [
+        calendar.add_business_days(d, -1) for d in outside.to_pylist()
+    ]
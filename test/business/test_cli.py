@@ -0,0 +1,81 @@
+import io
+import json
+import os
+
+import pytest
+
+from business.calendar import Calendar
+from business.cli import build_parser, load_calendar, load_definition, main, run
+
+fixture_path = os.path.join(os.path.dirname(__file__), "fixtures", "data")
+
+
+def run_cli(argv):
+    output = io.StringIO()
+    run(
+        build_parser().parse_intermixed_args(
+            [*argv, "--calendar", "ecb", "--load-path", fixture_path]
+        ),
+        output,
+    )
+    return output.getvalue()
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "input.csv"
+    path.write_text("id,date,delta\n1,2013-03-28,1\n2,30/03/2013,-1\n")
+    return str(path)
+
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    path = tmp_path / "input.jsonl"
+    path.write_text('{"date": "2013-03-28", "to_date": "2013-04-08"}\n\n{"date": "2013-04-06"}\n')
+    return str(path)
+
+
+def test_add_business_days_with_delta_column(csv_file):
+    assert run_cli(["add_business_days", csv_file]) == (
+        "id,date,delta,result\n1,2013-03-28,1,2013-04-02\n2,30/03/2013,-1,2013-03-27\n"
+    )
+
+
+def test_add_business_days_with_fixed_delta(csv_file):
+    output = run_cli(["add_business_days", "--delta", "0", "--output-column", "due", csv_file])
+    assert output.splitlines()[1] == "1,2013-03-28,1,2013-03-28"
+
+
+def test_business_days_between_with_jsonl(tmp_path):
+    path = tmp_path / "input.jsonl"
+    path.write_text('{"date": "2013-03-28", "to_date": "2013-04-08"}\n')
+    output = run_cli(["business_days_between", str(path)])
+    assert json.loads(output) == {"date": "2013-03-28", "to_date": "2013-04-08", "result": 5}
+
+
+def test_roll_forward_with_multiple_workers(csv_file):
+    output = run_cli(["roll_forward", "--workers", "2", "--chunksize", "1", csv_file])
+    assert [line.split(",")[-1] for line in output.splitlines()] == [
+        "result",
+        "2013-03-28",
+        "2013-04-02",
+    ]
+
+
+def test_when_a_column_is_missing(jsonl_file, capsys):
+    argv = ["business_days_between", jsonl_file, "--calendar", "ecb", "--load-path", fixture_path]
+    assert main(argv) == 1
+    assert "to_date" in capsys.readouterr().err
+
+
+def test_load_paths_are_not_changed(csv_file):
+    load_paths = list(Calendar.load_paths)
+    run_cli(["roll_forward", csv_file])
+    run_cli(["roll_forward", csv_file])
+    assert Calendar.load_paths == load_paths
+
+
+def test_load_calendar_falls_back_to_load_cache(monkeypatch):
+    monkeypatch.setattr(Calendar, "load_paths", [fixture_path])
+    assert load_calendar("ecb", ["/nonexistent"]) is Calendar.load_cache("ecb")
+    assert load_definition("ecb", []) == Calendar.get_source().get("ecb")
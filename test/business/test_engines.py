@@ -0,0 +1,128 @@
+import datetime
+import pickle
+import unittest
+
+import pytest
+
+from business.calendar import Calendar
+from business.engines import (
+    ENGINES,
+    Engine,
+    IntervalEngine,
+    ReferenceEngine,
+    ShadowEngine,
+    register_engine,
+    shadow,
+)
+
+holidays = ["2020-04-10", "2020-04-13", "2020-12-25", "2020-12-28"]
+
+
+class OffByOneEngine(ReferenceEngine):
+    name = "off-by-one"
+
+    def add_business_days(self, input_date, delta):
+        return super().add_business_days(input_date, delta) + datetime.timedelta(days=1)
+
+
+class FailingEngine(ReferenceEngine):
+    name = "failing"
+
+    def business_days_between(self, from_date, to_date):
+        raise RuntimeError("boom")
+
+
+class TestEngineSelection(unittest.TestCase):
+    def test_default_engine(self):
+        assert isinstance(Calendar().engine, ReferenceEngine)
+
+    def test_when_given_an_engine_name(self):
+        assert isinstance(Calendar(engine="intervals").engine, IntervalEngine)
+
+    def test_when_given_an_engine_class(self):
+        calendar = Calendar(holidays=holidays, engine=OffByOneEngine)
+        assert calendar.add_business_days("2020-04-09", 1) == datetime.date(2020, 4, 15)
+
+    def test_registering_an_engine(self):
+        register_engine(OffByOneEngine)
+        try:
+            assert isinstance(Calendar(engine="off-by-one").engine, OffByOneEngine)
+        finally:
+            del ENGINES["off-by-one"]
+
+    def test_registering_an_engine_without_a_name(self):
+        with pytest.raises(ValueError):
+            register_engine(Engine)
+
+
+class TestShadowEngine(unittest.TestCase):
+    def test_matching_engines(self):
+        calendar = Calendar(holidays=holidays, engine=shadow("reference", "intervals"))
+        for day in range(60):
+            start = datetime.date(2020, 3, 20) + datetime.timedelta(days=day)
+            calendar.add_business_days(start, day % 9 - 4)
+            calendar.business_days_between(start, start + datetime.timedelta(days=day))
+        stats = calendar.engine.stats
+        assert (stats.calls, stats.sampled, stats.mismatches, stats.errors) == (120, 120, 0, 0)
+        assert stats.speedup is not None
+
+    def test_reversed_ranges_match(self):
+        calendar = Calendar(holidays=holidays, engine=shadow("reference", "intervals"))
+        for day in range(60):
+            start = datetime.date(2020, 3, 20) + datetime.timedelta(days=day)
+            result = calendar.business_days_between(start + datetime.timedelta(days=day), start)
+            assert result == -calendar.business_days_between(
+                start, start + datetime.timedelta(days=day)
+            )
+        assert calendar.engine.stats.mismatches == 0
+        assert calendar.business_days_between("2020-12-31", "2020-12-01") == -20
+
+    def test_mismatches_are_reported_and_primary_results_served(self):
+        mismatches = []
+        calendar = Calendar(
+            holidays=holidays,
+            engine=shadow(
+                "reference", OffByOneEngine, on_mismatch=lambda *args: mismatches.append(args)
+            ),
+        )
+        with self.assertLogs("business", level="WARNING"):
+            result = calendar.add_business_days("2020-04-09", 1)
+        assert result == datetime.date(2020, 4, 14)
+        assert calendar.engine.stats.mismatches == 1
+        assert mismatches == [
+            (
+                "add_business_days",
+                (datetime.date(2020, 4, 9), 1),
+                datetime.date(2020, 4, 14),
+                datetime.date(2020, 4, 15),
+            )
+        ]
+
+    def test_candidate_errors_are_not_propagated(self):
+        calendar = Calendar(holidays=holidays, engine=shadow("reference", FailingEngine))
+        with self.assertLogs("business", level="WARNING"):
+            assert calendar.business_days_between("2020-04-09", "2020-04-15") == 2
+        assert calendar.engine.stats.errors == 1
+
+    def test_sample_rate(self):
+        calendar = Calendar(engine=shadow("reference", "intervals", sample_rate=0))
+        calendar.add_business_days("2020-04-09", 1)
+        assert isinstance(calendar.engine, ShadowEngine)
+        assert (calendar.engine.stats.calls, calendar.engine.stats.sampled) == (1, 0)
+
+    def test_invalid_sample_rate(self):
+        with pytest.raises(ValueError):
+            shadow("reference", "intervals", sample_rate=2)
+
+    def test_pickling(self):
+        calendar = Calendar(holidays=holidays, engine=shadow("reference", OffByOneEngine, 0.5))
+        calendar.add_business_days("2020-04-09", 0)
+        copy = pickle.loads(pickle.dumps(calendar))
+        assert isinstance(copy.engine, ShadowEngine)
+        assert copy.engine.calendar is copy
+        assert copy.engine.sample_rate == 0.5
+        assert copy.engine.stats.calls == 1
+        assert copy.add_business_days("2020-04-09", 1) == datetime.date(2020, 4, 14)
+        assert copy.engine.stats.calls == 2
+        copy.add_holidays(["2020-04-14"])
+        assert copy.add_business_days("2020-04-09", 1) == datetime.date(2020, 4, 15)
@@ -0,0 +1,88 @@
+import csv
+import datetime
+import io
+import os
+import sqlite3
+import unittest
+
+import pytest
+
+from business.calendar import Calendar
+from business.export import COLUMNS, dimension_rows, main, write_csv, write_sqlite
+
+fixture_path = os.path.join(os.path.dirname(__file__), "fixtures", "data")
+calendar = Calendar(
+    holidays=["2020-01-01", "2020-04-10", "2020-04-13", "2020-12-25", "2020-12-28"],
+    extra_working_dates=["2020-04-11"],
+)
+
+
+@pytest.mark.parametrize(
+    "start,end",
+    [("2020-01-01", "2020-12-31"), ("2020-04-09", "2020-04-14"), ("2020-12-27", "2021-01-03")],
+)
+def test_rows_match_calendar_queries(start, end):
+    rows = list(dimension_rows(calendar, start, end))
+    first = calendar.parse_date(start)
+    assert [row.date for row in rows] == [
+        first + datetime.timedelta(days=i)
+        for i in range((calendar.parse_date(end) - first).days + 1)
+    ]
+    for row in rows:
+        assert row.is_business_day == calendar.is_business_day(row.date)
+        assert row.business_day_ordinal == calendar.business_days_between(first, row.date)
+        assert row.business_day_of_month == calendar.get_business_day_of_month(row.date)
+        assert row.next_business_day == calendar.next_business_day(row.date)
+        assert row.previous_business_day == calendar.previous_business_day(row.date)
+
+
+def test_empty_range():
+    assert list(dimension_rows(calendar, "2020-01-02", "2020-01-01")) == []
+
+
+class TestWriters(unittest.TestCase):
+    def test_write_csv(self):
+        output = io.StringIO()
+        assert write_csv(calendar, "2020-04-09", "2020-04-14", output) == 6
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        assert rows[0] == COLUMNS
+        assert rows[2] == ["2020-04-10", "0", "1", "7", "2020-04-11", "2020-04-09"]
+
+    def test_write_sqlite(self):
+        connection = sqlite3.connect(":memory:")
+        assert write_sqlite(calendar, "2020-01-01", "2020-06-30", connection, batch_size=50) == 182
+        # overlapping exports replace existing rows
+        assert write_sqlite(calendar, "2020-06-01", "2020-12-31", connection) == 214
+        ((count, business_days),) = connection.execute(
+            "SELECT COUNT(*), SUM(is_business_day) FROM business_days"
+        )
+        assert (count, business_days) == (
+            366,
+            calendar.business_days_between("2020-01-01", "2021-01-01"),
+        )
+        ((result,),) = connection.execute(
+            "SELECT next_business_day FROM business_days WHERE date = '2020-12-24'"
+        )
+        assert result == "2020-12-29"
+
+    def test_invalid_table_name(self):
+        with pytest.raises(ValueError):
+            write_sqlite(calendar, "2020-01-01", "2020-01-02", sqlite3.connect(":memory:"), "a; b")
+
+
+def test_main(capsys):
+    main(
+        [
+            "--calendar",
+            "ecb",
+            "--load-path",
+            fixture_path,
+            "--start",
+            "2013-01-01",
+            "--end",
+            "2013-01-31",
+        ]
+    )
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 32
+    assert lines[1].startswith("2013-01-01,0,0,0,2013-01-02,2012-12-31")
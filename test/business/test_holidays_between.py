@@ -0,0 +1,63 @@
+import datetime
+import unittest
+
+from business.calendar import Calendar
+
+
+class TestHolidaysBetween(unittest.TestCase):
+    def setUp(self):
+        self.calendar = Calendar(
+            holidays=["2020-12-28", "2020-12-25", "2021-01-01", "2020-04-10", "2020-12-25"]
+        )
+
+    def test_holidays_are_sorted_and_unique(self):
+        assert self.calendar.holidays == [
+            datetime.date(2020, 4, 10),
+            datetime.date(2020, 12, 25),
+            datetime.date(2020, 12, 28),
+            datetime.date(2021, 1, 1),
+        ]
+
+    def test_when_given_a_range_containing_holidays(self):
+        assert self.calendar.holidays_between("2020-12-01", "2021-01-01") == [
+            datetime.date(2020, 12, 25),
+            datetime.date(2020, 12, 28),
+        ]
+
+    def test_when_given_a_range_ending_after_a_holiday(self):
+        assert self.calendar.holidays_between("2020-12-25", "2021-01-02") == [
+            datetime.date(2020, 12, 25),
+            datetime.date(2020, 12, 28),
+            datetime.date(2021, 1, 1),
+        ]
+
+    def test_when_given_a_range_without_holidays(self):
+        assert self.calendar.holidays_between("2020-05-01", "2020-12-01") == []
+
+    def test_when_given_a_reversed_range(self):
+        assert self.calendar.holidays_between("2021-01-02", "2020-01-01") == []
+
+
+class TestCountHolidaysBetween(unittest.TestCase):
+    def setUp(self):
+        self.calendar = Calendar(holidays=["2020-12-25", "2020-12-28", "2021-01-01"])
+
+    def test_when_given_a_range_containing_holidays(self):
+        assert self.calendar.count_holidays_between("2020-12-01", "2021-01-01") == 2
+
+    def test_when_given_a_reversed_range(self):
+        assert self.calendar.count_holidays_between("2021-01-02", "2020-12-01") == 0
+
+
+class TestNextHoliday(unittest.TestCase):
+    def setUp(self):
+        self.calendar = Calendar(holidays=["2020-12-25", "2020-12-28"])
+
+    def test_when_given_a_date_before_a_holiday(self):
+        assert self.calendar.next_holiday("2020-12-01") == datetime.date(2020, 12, 25)
+
+    def test_when_given_a_holiday(self):
+        assert self.calendar.next_holiday("2020-12-25") == datetime.date(2020, 12, 28)
+
+    def test_when_given_a_date_after_the_last_holiday(self):
+        assert self.calendar.next_holiday("2020-12-28") is None
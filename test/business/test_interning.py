@@ -0,0 +1,114 @@
+import datetime
+import random
+import unittest
+
+import pytest
+
+from business.calendar import Calendar
+from business.interning import CalendarRegistry, OverlayData
+
+base_holidays = [datetime.date(2000, 1, 3) + datetime.timedelta(days=30 * i) for i in range(300)]
+
+
+def definition(holidays, extra_working_dates=()):
+    return {
+        "working_days": ["monday", "tuesday", "wednesday", "thursday", "friday"],
+        "holidays": list(holidays),
+        "extra_working_dates": list(extra_working_dates),
+    }
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_identical_calendars_have_the_same_fingerprint(self):
+        a = Calendar(holidays=["2020-01-01", "2020-12-25"], working_days=["mon", "tue"])
+        b = Calendar(
+            holidays=["2020-12-25", "2020-01-01", "2020-01-01"], working_days=["Tue", "Mon"]
+        )
+        assert a.fingerprint == b.fingerprint
+
+    def test_different_calendars_have_different_fingerprints(self):
+        a = Calendar(holidays=["2020-01-01"])
+        assert a.fingerprint != Calendar(holidays=["2020-01-02"]).fingerprint
+        assert a.fingerprint != Calendar(extra_working_dates=["2020-01-04"]).fingerprint
+        assert a.fingerprint != Calendar(holidays=["2020-01-01"], working_days=["mon"]).fingerprint
+
+    def test_changes_update_the_fingerprint(self):
+        calendar = Calendar()
+        fingerprint = calendar.fingerprint
+        calendar.add_holidays(["2020-01-01"])
+        assert calendar.fingerprint == Calendar(holidays=["2020-01-01"]).fingerprint
+        calendar.remove_holidays(["2020-01-01"])
+        assert calendar.fingerprint == fingerprint
+
+
+class TestCalendarRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = CalendarRegistry(max_overlay=4)
+        self.base = self.registry.add_base(
+            "base", Calendar.from_definition(definition(base_holidays))
+        )
+
+    def test_identical_calendars_are_shared(self):
+        a = self.registry.from_definition(definition(base_holidays[:10]))
+        b = self.registry.from_definition(definition(reversed(base_holidays[:10])))
+        assert a is b
+        assert self.registry.from_definition(definition(base_holidays)) is self.base
+        assert len(self.registry) == 2
+
+    def test_engines_are_not_mixed(self):
+        calendar = self.registry.from_definition(definition(base_holidays), engine="intervals")
+        assert calendar is not self.base
+        assert calendar.engine.name == "intervals"
+
+    def test_interned_calendars_cannot_be_changed(self):
+        with pytest.raises(ValueError):
+            self.base.add_holidays(["2020-01-01"])
+
+    def test_calendars_given_can_still_be_changed(self):
+        mine = Calendar(holidays=["2020-01-01"])
+        interned = self.registry.intern(mine)
+        assert interned is not mine
+        assert self.registry.intern(Calendar(holidays=["2020-01-01"])) is interned
+        mine.add_holidays(["2020-12-25"])
+        assert interned.is_business_day("2020-12-25")
+        with pytest.raises(ValueError):
+            interned.add_holidays(["2020-12-25"])
+
+    def test_near_identical_calendars_are_overlays(self):
+        holidays = base_holidays[1:] + [datetime.date(2010, 6, 1)]
+        calendar = self.registry.from_definition(definition(holidays))
+        assert isinstance(calendar.data, OverlayData)
+        assert calendar.data.base is self.base.data
+        assert len(calendar.data) == 2
+        assert "holidays" not in vars(calendar.data)
+        assert calendar.fingerprint == Calendar(holidays=holidays).fingerprint
+
+    def test_calendars_too_different_are_not_overlays(self):
+        calendar = self.registry.from_definition(definition(base_holidays[5:]))
+        assert not isinstance(calendar.data, OverlayData)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_overlays_match_full_calendars(seed):
+    rng = random.Random(seed)
+    registry = CalendarRegistry()
+    registry.add_base("base", Calendar(holidays=base_holidays, extra_working_dates=["2001-01-06"]))
+    holidays = set(base_holidays)
+    for _ in range(10):
+        day = datetime.date(2000, 1, 1) + datetime.timedelta(days=rng.randrange(9000))
+        holidays.symmetric_difference_update([day])
+    extra_working_dates = [datetime.date(2001, 1, 6), datetime.date(2005, 1, 1)]
+    holidays.difference_update(extra_working_dates)
+
+    overlay = registry.intern(Calendar(holidays=holidays, extra_working_dates=extra_working_dates))
+    full = Calendar(holidays=holidays, extra_working_dates=extra_working_dates)
+    assert isinstance(overlay.data, OverlayData)
+    for _ in range(200):
+        a = datetime.date(2000, 1, 1) + datetime.timedelta(days=rng.randrange(9000))
+        b = a + datetime.timedelta(days=rng.randrange(400))
+        assert overlay.is_business_day(a) == full.is_business_day(a)
+        assert overlay.business_days_between(a, b) == full.business_days_between(a, b)
+        assert overlay.add_business_days(a, 5) == full.add_business_days(a, 5)
+    assert overlay.holidays == full.holidays
+    assert overlay.data.working_holidays == full.data.working_holidays
+    assert overlay.extra_working_dates == full.extra_working_dates
@@ -0,0 +1,100 @@
+import datetime
+import random
+import unittest
+
+import pytest
+
+from business.calendar import Calendar
+from business.intervals import IntervalIndex
+
+start_date = datetime.date(2020, 1, 1)
+
+
+def random_calendar(rng, engine, working_days=None):
+    working_days = working_days or Calendar.default_working_days
+    days = [start_date + datetime.timedelta(days=rng.randrange(400)) for _ in range(80)]
+    extra_working_dates = [
+        d for d in days[:20] if Calendar.DAY_NAMES[d.weekday()] not in working_days
+    ]
+    holidays = [d for d in days[20:] if d not in extra_working_dates]
+    return Calendar(
+        holidays=holidays,
+        working_days=working_days,
+        extra_working_dates=extra_working_dates,
+        engine=engine,
+    )
+
+
+class TestIntervalIndex(unittest.TestCase):
+    def test_consecutive_holidays_form_a_single_run(self):
+        # Good Friday to Easter Monday, and Christmas to Boxing Day
+        index = IntervalIndex(
+            [
+                datetime.date(2020, 4, 10),
+                datetime.date(2020, 4, 13),
+                datetime.date(2020, 12, 25),
+                datetime.date(2020, 12, 28),
+            ],
+            [],
+            [0, 1, 2, 3, 4],
+        )
+        assert len(index) == 2
+        assert index.business_days_between(datetime.date(2020, 4, 9), datetime.date(2020, 4, 15))
+        assert index.add_business_days(datetime.date(2020, 4, 9), 1) == datetime.date(2020, 4, 14)
+
+    def test_holidays_on_non_working_days_are_ignored(self):
+        index = IntervalIndex([datetime.date(2020, 4, 11)], [], [0, 1, 2, 3, 4])
+        assert len(index) == 0
+
+    def test_consecutive_extra_working_dates_form_a_single_run(self):
+        index = IntervalIndex([], [datetime.date(2020, 4, 11), datetime.date(2020, 4, 12)], [0])
+        assert len(index) == 1
+        assert index.add_business_days(datetime.date(2020, 4, 10), 1) == datetime.date(2020, 4, 12)
+
+    def test_when_there_are_no_working_days(self):
+        index = IntervalIndex([], [], [])
+        with pytest.raises(ValueError):
+            index.add_business_days(datetime.date(2020, 4, 10), 1)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("working_days", [None, ["mon", "wed", "sat"]])
+def test_matches_reference_engine(seed, working_days):
+    rng = random.Random(seed)
+    reference = random_calendar(random.Random(seed), "reference", working_days)
+    intervals = random_calendar(random.Random(seed), "intervals", working_days)
+    for _ in range(300):
+        date_1 = start_date + datetime.timedelta(days=rng.randrange(-30, 430))
+        date_2 = date_1 + datetime.timedelta(days=rng.randrange(60))
+        delta = rng.randrange(-40, 40)
+        assert intervals.business_days_between(date_1, date_2) == reference.business_days_between(
+            date_1, date_2
+        )
+        assert intervals.business_days_between(date_2, date_1) == reference.business_days_between(
+            date_2, date_1
+        )
+        assert intervals.add_business_days(date_1, delta) == reference.add_business_days(
+            date_1, delta
+        )
+
+
+def test_century_long_horizon():
+    holidays = ["2020-12-25", "2110-12-25"]
+    reference = Calendar(holidays=holidays)
+    calendar = Calendar(holidays=holidays, engine="intervals")
+    count = reference.business_days_between("2020-01-01", "2120-01-01")
+    assert calendar.business_days_between("2020-01-01", "2120-01-01") == count
+    assert calendar.add_business_days("2020-01-01", count) == datetime.date(2120, 1, 1)
+
+
+def test_when_given_an_invalid_engine():
+    with pytest.raises(ValueError):
+        Calendar(engine="invalid")
+
+
+def test_reversed_ranges_are_negated():
+    holidays = ["2020-12-25", "2020-12-28"]
+    for engine in ["reference", "intervals"]:
+        calendar = Calendar(holidays=holidays, engine=engine)
+        assert calendar.business_days_between("2020-12-01", "2020-12-31") == 20
+        assert calendar.business_days_between("2020-12-31", "2020-12-01") == -20
@@ -1,5 +1,6 @@
 import datetime
 import os
+import threading
 import unittest
 from time import time
 
@@ -46,6 +47,24 @@ class TestLoadCache(unittest.TestCase):
 
         assert duration_2 < duration_1
 
+    def test_concurrent_loads_share_one_calendar(self):
+        with Calendar._cache as cache:
+            cache.pop("ecb", None)
+        barrier = threading.Barrier(8)
+        calendars = []
+
+        def load():
+            barrier.wait()
+            calendars.append(Calendar.load_cache("ecb"))
+
+        threads = [threading.Thread(target=load) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calendars) == 8
+        assert all(calendar is calendars[0] for calendar in calendars)
+
 
 class TestSetWorkingDays(unittest.TestCase):
     def test_when_given_valid_working_days(self):
@@ -0,0 +1,65 @@
+import datetime
+import pickle
+import unittest
+
+import pytest
+
+from business.calendar import Calendar
+
+
+class TestMemo(unittest.TestCase):
+    def setUp(self):
+        self.calendar = Calendar(holidays=["2020-01-01", "2020-04-10", "2020-04-13"])
+        self.calendar.memoize(maxsize=2)
+
+    def test_memo_is_disabled_by_default(self):
+        assert Calendar().memo_stats() is None
+
+    def test_repeated_queries_hit_the_memo(self):
+        for _ in range(3):
+            assert self.calendar.add_business_days("2020-04-09", 1) == datetime.date(2020, 4, 14)
+        stats = self.calendar.memo_stats()
+        assert (stats.hits, stats.misses, stats.size) == (2, 1, 1)
+        assert stats.hit_rate == pytest.approx(2 / 3)
+
+    def test_memoized_operations_match_uncached_results(self):
+        uncached = Calendar(holidays=self.calendar.holidays)
+        d = datetime.date(2020, 4, 11)
+        for _ in range(2):
+            assert self.calendar.roll_forward(d) == uncached.roll_forward(d)
+            assert self.calendar.roll_backward(d) == uncached.roll_backward(d)
+            assert self.calendar.business_days_between(
+                "2020-01-01", d
+            ) == uncached.business_days_between("2020-01-01", d)
+            assert self.calendar.get_business_day_of_month(
+                d
+            ) == uncached.get_business_day_of_month(d)
+            assert self.calendar.add_business_days(d, -3) == uncached.add_business_days(d, -3)
+
+    def test_memo_is_bounded(self):
+        for day in range(1, 10):
+            self.calendar.roll_forward(datetime.date(2020, 2, day))
+        assert self.calendar.memo_stats().size == 2
+
+    def test_changes_invalidate_the_memo(self):
+        assert self.calendar.is_business_day("2020-05-08")
+        assert self.calendar.roll_forward("2020-05-08") == datetime.date(2020, 5, 8)
+        self.calendar.add_holidays(["2020-05-08"])
+        assert self.calendar.roll_forward("2020-05-08") == datetime.date(2020, 5, 11)
+        stats = self.calendar.memo_stats()
+        assert (stats.hits, stats.misses, stats.size, stats.invalidations) == (0, 2, 1, 1)
+
+    def test_memoize_none_disables_the_memo(self):
+        self.calendar.memoize(None)
+        assert self.calendar.memo_stats() is None
+
+    def test_maxsize_must_be_positive(self):
+        with pytest.raises(ValueError):
+            self.calendar.memoize(0)
+
+    def test_pickled_calendars_keep_an_empty_memo(self):
+        self.calendar.roll_forward("2020-05-08")
+        calendar = pickle.loads(pickle.dumps(self.calendar))
+        stats = calendar.memo_stats()
+        assert (stats.misses, stats.size, stats.maxsize) == (0, 0, 2)
+        assert calendar.roll_forward("2020-01-01") == datetime.date(2020, 1, 2)
@@ -0,0 +1,137 @@
+import datetime
+import random
+import threading
+import unittest
+
+import pytest
+
+from business.calendar import Calendar
+from business.intervals import IntervalIndex
+
+start_date = datetime.date(2020, 1, 1)
+
+
+def runs(index):
+    return (index.starts, index.ends, index.changes, index.cumulative, index.start_ordinals)
+
+
+class TestMutation(unittest.TestCase):
+    def setUp(self):
+        self.calendar = Calendar(
+            holidays=["2020-01-01", "2020-12-25"], extra_working_dates=["2020-01-04"]
+        )
+
+    def test_add_holidays(self):
+        self.calendar.add_holidays(["2020-04-10", datetime.date(2020, 4, 13)])
+        assert self.calendar.holidays == [
+            datetime.date(2020, 1, 1),
+            datetime.date(2020, 4, 10),
+            datetime.date(2020, 4, 13),
+            datetime.date(2020, 12, 25),
+        ]
+        assert not self.calendar.is_business_day("2020-04-10")
+        assert self.calendar.add_business_days("2020-04-09", 1) == datetime.date(2020, 4, 14)
+
+    def test_remove_holidays(self):
+        self.calendar.remove_holidays(["2020-01-01", "2020-06-01"])
+        assert self.calendar.holidays == [datetime.date(2020, 12, 25)]
+        assert self.calendar.is_business_day("2020-01-01")
+
+    def test_add_and_remove_extra_working_dates(self):
+        self.calendar.add_extra_working_dates(["2020-01-05"])
+        self.calendar.remove_extra_working_dates(["2020-01-04"])
+        assert self.calendar.extra_working_dates == [datetime.date(2020, 1, 5)]
+        assert self.calendar.business_days_between("2020-01-03", "2020-01-07") == 3
+
+    def test_holidays_cannot_be_extra_working_dates(self):
+        with pytest.raises(ValueError):
+            self.calendar.add_holidays(["2020-01-04"])
+        with pytest.raises(ValueError):
+            Calendar(holidays=["2020-01-04"]).add_extra_working_dates(["2020-01-04"])
+        assert self.calendar.holidays == [datetime.date(2020, 1, 1), datetime.date(2020, 12, 25)]
+
+    def test_extra_working_dates_cannot_be_on_working_days(self):
+        with pytest.raises(ValueError):
+            self.calendar.add_extra_working_dates(["2020-01-06"])
+
+    def test_update_can_move_a_date(self):
+        self.calendar.update(
+            remove_extra_working_dates=["2020-01-04"], add_holidays=["2020-01-04"]
+        )
+        assert self.calendar.holidays[1] == datetime.date(2020, 1, 4)
+        assert self.calendar.extra_working_dates == []
+
+    def test_changes_create_a_new_snapshot(self):
+        data = self.calendar.data
+        self.calendar.add_holidays(["2020-04-10"])
+        assert self.calendar.data is not data
+        assert self.calendar.data.version == data.version + 1
+        assert datetime.date(2020, 4, 10) not in data.holidays
+
+    def test_dates_are_only_changed_with_update(self):
+        self.calendar.holidays.append(datetime.date(2020, 4, 10))
+        self.calendar.extra_working_dates.clear()
+        self.calendar.working_days.append("sat")
+        assert self.calendar.holidays == [datetime.date(2020, 1, 1), datetime.date(2020, 12, 25)]
+        assert self.calendar.extra_working_dates == [datetime.date(2020, 1, 4)]
+        assert self.calendar.working_days == Calendar.default_working_days
+        with pytest.raises(AttributeError):
+            self.calendar.working_days = ["mon"]
+        with pytest.raises(AttributeError):
+            self.calendar.working_days_from = {}
+
+    def test_concurrent_readers_see_consistent_snapshots(self):
+        calendar = Calendar(engine="intervals")
+        dates = [datetime.date(2020, 1, 6) + datetime.timedelta(days=7 * i) for i in range(50)]
+        results = []
+
+        def read():
+            for _ in range(200):
+                data = calendar.data
+                results.append(
+                    calendar.engine.business_days_between(start_date, datetime.date(2021, 1, 1))
+                    <= 262
+                    and len(data.holidays) <= len(dates)
+                )
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        for d in dates:
+            calendar.add_holidays([d])
+        reader.join()
+        assert all(results)
+        assert calendar.business_days_between(start_date, datetime.date(2021, 1, 1)) == 212
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_updates_match_a_rebuilt_calendar(seed):
+    rng = random.Random(seed)
+    working_days = ["mon", "tue", "wed", "thu", "fri"]
+    calendar = Calendar(engine="intervals")
+    for _ in range(60):
+        day = start_date + datetime.timedelta(days=rng.randrange(400))
+        if day.weekday() >= 5 and rng.random() < 0.3:
+            if day in calendar.extra_working_dates:
+                calendar.remove_extra_working_dates([day])
+            elif day not in calendar.holidays:
+                calendar.add_extra_working_dates([day])
+        elif day in calendar.holidays:
+            calendar.remove_holidays([day])
+        elif day not in calendar.extra_working_dates:
+            calendar.add_holidays([day])
+
+        rebuilt = IntervalIndex(calendar.holidays, calendar.extra_working_dates, [0, 1, 2, 3, 4])
+        assert runs(calendar.data.intervals) == runs(rebuilt)
+
+    reference = Calendar(
+        holidays=calendar.holidays,
+        working_days=working_days,
+        extra_working_dates=calendar.extra_working_dates,
+    )
+    assert calendar.data.working_holidays == reference.data.working_holidays
+    for _ in range(100):
+        a = start_date + datetime.timedelta(days=rng.randrange(400))
+        b = a + datetime.timedelta(days=rng.randrange(100))
+        delta = rng.randrange(-30, 30)
+        assert calendar.business_days_between(a, b) == reference.business_days_between(a, b)
+        assert calendar.add_business_days(a, delta) == reference.add_business_days(a, delta)
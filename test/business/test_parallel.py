@@ -0,0 +1,48 @@
+import datetime
+import unittest
+
+import pytest
+
+from business import parallel
+from business.calendar import Calendar
+
+
+class TestParallelMap(unittest.TestCase):
+    def setUp(self):
+        self.calendar = Calendar(
+            holidays=["2020-01-01", "2020-04-10", "2020-04-13", "2020-12-25", "2020-12-28"]
+        )
+        start = datetime.date(2020, 1, 1)
+        self.dates = [start + datetime.timedelta(days=i) for i in range(366)]
+
+    def test_add_business_days_matches_calendar(self):
+        inputs = [(d, i % 7 - 3) for i, d in enumerate(self.dates)]
+        result = list(
+            parallel.map(self.calendar, "add_business_days", inputs, workers=2, chunksize=10)
+        )
+        assert result == [self.calendar.add_business_days(d, n) for d, n in inputs]
+
+    def test_business_days_between_matches_calendar(self):
+        inputs = [(self.dates[0], d) for d in self.dates]
+        result = list(
+            parallel.map(self.calendar, "business_days_between", inputs, workers=2, chunksize=50)
+        )
+        assert result == [self.calendar.business_days_between(a, b) for a, b in inputs]
+
+    def test_single_argument_operations_in_process(self):
+        result = list(parallel.map(self.calendar, "roll_forward", self.dates, workers=1))
+        assert result == [self.calendar.roll_forward(d) for d in self.dates]
+
+    def test_when_given_no_inputs(self):
+        assert list(parallel.map(self.calendar, "is_business_day", [], workers=2)) == []
+
+    def test_when_given_an_unsupported_operation(self):
+        # raised on the call, before any result is asked for
+        with pytest.raises(ValueError):
+            parallel.map(self.calendar, "load", ["bacs"])
+        with pytest.raises(ValueError):
+            parallel.map(self.calendar, "bogus", [])
+
+    def test_when_given_an_invalid_chunksize(self):
+        with pytest.raises(ValueError):
+            parallel.map(self.calendar, "roll_forward", self.dates, chunksize=0)
@@ -0,0 +1,150 @@
+import datetime
+import unittest
+
+import pytest
+
+from business.calendar import Calendar
+from business.interning import CalendarRegistry
+from business.periods import Period
+from business.window import OutsideWindowError
+
+HOLIDAYS = ["2020-01-01", "2020-04-10", "2020-04-13", "2020-12-25", "2020-12-28", "2021-01-01"]
+
+
+def make_calendar(**kwargs):
+    return Calendar(holidays=HOLIDAYS, extra_working_dates=["2020-04-11"], **kwargs)
+
+
+def month_starts(first_year, last_year):
+    return [
+        datetime.date(year, month, 1)
+        for year in range(first_year, last_year + 1)
+        for month in range(1, 13)
+    ]
+
+
+@pytest.mark.parametrize(
+    "calendar",
+    [
+        make_calendar(),
+        make_calendar(engine="intervals"),
+        Calendar(
+            working_days=["sun", "mon", "tue", "wed", "thu"],
+            working_days_from={"2020-07-01": ["mon", "tue", "wed", "thu", "fri"]},
+            holidays=HOLIDAYS,
+        ),
+    ],
+)
+def test_periods_match_business_days_between(calendar):
+    for start, end in zip(month_starts(2019, 2021), month_starts(2019, 2022)[1:]):
+        expected = calendar.business_days_between(start, end)
+        assert calendar.business_days_in_month(start) == expected
+        assert calendar.business_days_in_month(end - datetime.timedelta(days=1)) == expected
+    for year in range(2019, 2022):
+        start = datetime.date(year, 1, 1)
+        assert calendar.business_days_in_year(start) == calendar.business_days_between(
+            start, datetime.date(year + 1, 1, 1)
+        )
+        for quarter in range(4):
+            start = datetime.date(year, 3 * quarter + 1, 1)
+            end = datetime.date(year + (quarter == 3), (3 * quarter + 3) % 12 + 1, 1)
+            assert calendar.business_days_in_quarter(
+                start + datetime.timedelta(days=40)
+            ) == calendar.business_days_between(start, end)
+
+
+class TestPeriodSummary(unittest.TestCase):
+    def setUp(self):
+        self.calendar = make_calendar()
+
+    def test_months(self):
+        self.assertEqual(
+            self.calendar.period_summary("2020-03-15", "2020-05-01"),
+            [
+                Period(datetime.date(2020, 3, 1), datetime.date(2020, 4, 1), 22),
+                Period(datetime.date(2020, 4, 1), datetime.date(2020, 5, 1), 21),
+                Period(datetime.date(2020, 5, 1), datetime.date(2020, 6, 1), 21),
+            ],
+        )
+
+    def test_quarters(self):
+        periods = self.calendar.period_summary("2020-02-01", "2021-01-01", "quarter")
+        self.assertEqual(
+            [p.start for p in periods],
+            [
+                datetime.date(2020, 1, 1),
+                datetime.date(2020, 4, 1),
+                datetime.date(2020, 7, 1),
+                datetime.date(2020, 10, 1),
+                datetime.date(2021, 1, 1),
+            ],
+        )
+        self.assertEqual(periods[-1].end, datetime.date(2021, 4, 1))
+        for period in periods:
+            self.assertEqual(
+                period.business_days,
+                self.calendar.business_days_between(period.start, period.end),
+            )
+
+    def test_years(self):
+        self.assertEqual(
+            self.calendar.period_summary("2020-06-01", "2020-06-01", "year"),
+            [Period(datetime.date(2020, 1, 1), datetime.date(2021, 1, 1), 258)],
+        )
+
+    def test_empty(self):
+        self.assertEqual(self.calendar.period_summary("2020-06-01", "2020-05-01"), [])
+
+    def test_invalid_frequency(self):
+        with self.assertRaisesRegex(ValueError, "Unsupported frequency 'week'"):
+            self.calendar.period_summary("2020-01-01", "2020-12-31", "week")
+
+    def test_changes_are_counted(self):
+        self.assertEqual(self.calendar.business_days_in_month("2020-05-01"), 21)
+        self.calendar.add_holidays(["2020-05-08"])
+        self.assertEqual(self.calendar.business_days_in_month("2020-05-01"), 20)
+        self.calendar.add_extra_working_dates(["2020-05-09"])
+        self.assertEqual(self.calendar.business_days_in_year("2020-05-01"), 258)
+
+    def test_table_is_cached_per_snapshot(self):
+        data = self.calendar.data
+        self.calendar.business_days_in_month("2020-05-01")
+        self.assertIs(self.calendar.data.periods, data.periods)
+        self.calendar.add_holidays(["2020-05-08"])
+        self.assertIsNot(self.calendar.data.periods, data.periods)
+
+    def test_overlay(self):
+        registry = CalendarRegistry()
+        registry.add_base("base", make_calendar())
+        overlay = registry.intern(
+            Calendar(holidays=HOLIDAYS + ["2020-05-08"], extra_working_dates=["2020-04-11"])
+        )
+        self.assertEqual(overlay.business_days_in_month("2020-05-01"), 20)
+
+
+class TestWindow(unittest.TestCase):
+    def setUp(self):
+        self.calendar = make_calendar()
+
+    def test_periods_within_window(self):
+        window = self.calendar.window("2020-01-01", "2020-12-31")
+        self.assertEqual(window.business_days_in_month("2020-04-15"), 21)
+        self.assertEqual(window.business_days_in_quarter("2020-12-31"), 64)
+        self.assertEqual(window.business_days_in_year("2020-04-15"), 258)
+
+    def test_periods_outside_window(self):
+        window = self.calendar.window("2020-01-15", "2020-12-31")
+        with self.assertRaises(OutsideWindowError):
+            window.business_days_in_month("2020-01-20")
+        with self.assertRaises(OutsideWindowError):
+            window.business_days_in_year("2020-04-15")
+        with self.assertRaises(OutsideWindowError):
+            window.period_summary("2020-12-01", "2021-01-01")
+
+    def test_fallback(self):
+        window = self.calendar.window("2020-01-15", "2020-12-31", fallback=True)
+        self.assertEqual(window.business_days_in_month("2020-01-20"), 22)
+        self.assertEqual(
+            window.period_summary("2020-12-01", "2021-01-01"),
+            self.calendar.period_summary("2020-12-01", "2021-01-01"),
+        )
@@ -0,0 +1,116 @@
+import datetime
+import unittest
+
+import pytest
+
+from business.calendar import Calendar
+from business.pipeline import Pipeline, Step
+from business.window import OutsideWindowError
+
+START = datetime.date(2022, 11, 1)
+END = datetime.date(2023, 2, 28)
+
+
+def make_calendars(engine="reference"):
+    bacs = Calendar(holidays=["2022-12-26", "2022-12-27", "2023-01-02"], engine=engine)
+    ecb = Calendar(
+        holidays=["2022-12-25", "2022-12-26", "2023-01-01"],
+        extra_working_dates=["2023-01-07"],
+        engine=engine,
+    )
+    return bacs, ecb
+
+
+def settlement(bacs, ecb):
+    return (
+        Pipeline()
+        .roll_forward(bacs)
+        .add_business_days(bacs, 2)
+        .roll_forward(ecb)
+        .add_business_days(ecb, 1)
+    )
+
+
+def days(start, end):
+    return [start + datetime.timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+@pytest.mark.parametrize("engine", ["reference", "intervals"])
+@pytest.mark.parametrize(
+    "build",
+    [
+        settlement,
+        lambda bacs, ecb: Pipeline().add_business_days(bacs, -3).roll_backward(ecb),
+        lambda bacs, ecb: Pipeline().roll_backward(ecb).add_business_days(bacs, 0),
+        lambda bacs, ecb: Pipeline(),
+    ],
+)
+def test_compiled_matches_step_by_step(engine, build):
+    bacs, ecb = make_calendars(engine)
+    pipeline = build(bacs, ecb)
+    compiled = pipeline.compile(START, END)
+    for d in days(START, END):
+        expected = d
+        for step in pipeline.steps:
+            expected = getattr(step.calendar, step.operation)(
+                expected, *([step.delta] if step.operation == "add_business_days" else [])
+            )
+        assert pipeline(d) == expected
+        assert compiled(d) == expected
+
+
+@pytest.mark.parametrize("target", days(datetime.date(2022, 11, 10), datetime.date(2023, 2, 20)))
+def test_latest_start(target):
+    compiled = settlement(*make_calendars()).compile(START, END)
+    latest = compiled.latest_start(target)
+    assert compiled(latest) <= target
+    assert compiled(latest + datetime.timedelta(days=1)) > target
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.bacs, self.ecb = make_calendars()
+        self.pipeline = settlement(self.bacs, self.ecb)
+
+    def test_example(self):
+        self.assertEqual(self.pipeline("2022-12-23"), datetime.date(2022, 12, 30))
+        compiled = self.pipeline.compile("2022-01-01", "2023-12-31")
+        self.assertEqual(compiled("2022-12-23"), datetime.date(2022, 12, 30))
+        self.assertEqual(compiled.latest_start("2023-01-06"), datetime.date(2023, 1, 3))
+
+    def test_pipelines_are_immutable(self):
+        longer = self.pipeline.roll_forward(self.bacs)
+        self.assertEqual(len(self.pipeline), 4)
+        self.assertEqual(len(longer), 5)
+        self.assertEqual(longer.steps[-1], Step("roll_forward", self.bacs))
+
+    def test_invalid_step(self):
+        with self.assertRaisesRegex(ValueError, "Unsupported step 'next_holiday'"):
+            Pipeline([Step("next_holiday", self.bacs)])
+
+    def test_invalid_range(self):
+        with self.assertRaises(ValueError):
+            self.pipeline.compile("2023-01-01", "2022-01-01")
+
+    def test_map(self):
+        compiled = self.pipeline.compile(START, END)
+        self.assertEqual(
+            compiled.map(["2022-12-23", datetime.date(2022, 12, 24)]),
+            [datetime.date(2022, 12, 30), datetime.date(2023, 1, 2)],
+        )
+
+    def test_outside_range(self):
+        compiled = self.pipeline.compile(START, END)
+        with self.assertRaises(OutsideWindowError):
+            compiled("2023-03-01")
+        with self.assertRaises(OutsideWindowError):
+            compiled.latest_start("2022-11-01")
+        with self.assertRaises(OutsideWindowError):
+            compiled.latest_start("2023-06-01")
+
+    def test_recompiled_after_change(self):
+        compiled = self.pipeline.compile(START, END)
+        self.assertEqual(compiled("2022-12-19"), datetime.date(2022, 12, 22))
+        self.ecb.add_holidays(["2022-12-22"])
+        self.assertEqual(compiled("2022-12-19"), datetime.date(2022, 12, 23))
+        self.assertEqual(compiled.latest_start("2022-12-22"), datetime.date(2022, 12, 16))
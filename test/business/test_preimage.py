@@ -0,0 +1,96 @@
+import datetime
+import unittest
+
+import pytest
+
+from business.calendar import Calendar
+from business.window import OutsideWindowError
+
+HOLIDAYS = ["2020-01-01", "2020-04-10", "2020-04-13", "2020-12-25", "2020-12-28", "2021-01-01"]
+START = datetime.date(2019, 12, 1)
+END = datetime.date(2021, 2, 1)
+
+calendars = [
+    Calendar(holidays=HOLIDAYS, extra_working_dates=["2020-04-11", "2020-12-27"]),
+    Calendar(holidays=HOLIDAYS, extra_working_dates=["2020-04-11"], engine="intervals"),
+    Calendar(
+        working_days=["sun", "mon", "tue", "wed", "thu"],
+        working_days_from={"2020-07-01": ["mon", "tue", "wed", "thu", "fri"]},
+        holidays=HOLIDAYS,
+    ),
+]
+
+
+def days(start, end):
+    return [start + datetime.timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+@pytest.mark.parametrize("calendar", calendars)
+@pytest.mark.parametrize("delta", [-5, -1, 0, 1, 3, 20])
+def test_preimage_matches_search(calendar, delta):
+    inputs = {}
+    for d in days(START, END):
+        inputs.setdefault(calendar.add_business_days(d, delta), []).append(d)
+    # targets far enough from the ends that all their inputs were searched
+    targets = days(datetime.date(2020, 2, 1), datetime.date(2020, 12, 31))
+    for target, preimage in zip(targets, calendar.preimages(targets, delta)):
+        expected = inputs.get(target)
+        if expected is None:
+            assert preimage is None
+        else:
+            assert preimage == (expected[0], expected[-1])
+            assert expected == days(*preimage)
+        assert calendar.preimage(target, delta) == preimage
+
+
+class TestPreimage(unittest.TestCase):
+    def setUp(self):
+        self.calendar = calendars[0]
+
+    def test_after_holidays(self):
+        # Friday 10th to Monday 13th are holidays, but Saturday 11th is an extra working date
+        self.assertEqual(
+            self.calendar.preimage("2020-04-14", 1),
+            (datetime.date(2020, 4, 10), datetime.date(2020, 4, 11)),
+        )
+        self.assertEqual(
+            self.calendar.preimage("2020-04-09", -1),
+            (datetime.date(2020, 4, 11), datetime.date(2020, 4, 13)),
+        )
+        self.assertEqual(
+            self.calendar.preimage("2020-04-11", -1),
+            (datetime.date(2020, 4, 14), datetime.date(2020, 4, 14)),
+        )
+
+    def test_non_business_target(self):
+        self.assertIsNone(self.calendar.preimage("2020-04-10", 2))
+        self.assertIsNone(self.calendar.preimage("2020-04-12", -2))
+
+    def test_zero_delta(self):
+        self.assertEqual(
+            self.calendar.preimage("2020-04-12", 0),
+            (datetime.date(2020, 4, 12), datetime.date(2020, 4, 12)),
+        )
+
+
+class TestWindow(unittest.TestCase):
+    def setUp(self):
+        self.calendar = calendars[0]
+
+    def test_within_window(self):
+        window = self.calendar.window("2020-03-01", "2020-05-31")
+        for target in days(datetime.date(2020, 3, 15), datetime.date(2020, 5, 15)):
+            self.assertEqual(window.preimage(target, 3), self.calendar.preimage(target, 3), target)
+
+    def test_outside_window(self):
+        window = self.calendar.window("2020-03-02", "2020-05-31")
+        with self.assertRaises(OutsideWindowError):
+            window.preimage("2020-03-03", 1)
+        with self.assertRaises(OutsideWindowError):
+            window.preimage("2020-05-28", -1)
+        with self.assertRaises(OutsideWindowError):
+            window.preimages(["2020-04-15", "2020-06-01"], 1)
+
+    def test_fallback(self):
+        window = self.calendar.window("2020-03-02", "2020-05-31", fallback=True)
+        self.assertEqual(window.preimage("2020-03-03", 1), self.calendar.preimage("2020-03-03", 1))
@@ -0,0 +1,195 @@
+import datetime
+import os
+import pickle
+import unittest
+
+import pytest
+
+from business.calendar import Calendar
+from business.recording import Recorder, ReplayReport, decode, encode, main, read_trace, replay
+
+fixture_path = os.path.join(os.path.dirname(__file__), "fixtures", "data")
+
+
+def make_calendar():
+    return Calendar(
+        holidays=["2020-01-01", "2020-04-10", "2020-04-13", "2020-12-25"],
+        extra_working_dates=["2020-04-11"],
+    )
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        datetime.date(2020, 4, 10),
+        datetime.datetime(2020, 4, 10, 12, 30),
+        "2020-04-10",
+        "10 April 2020",
+        3,
+        -2,
+        True,
+    ],
+)
+def test_encoding_round_trip(value):
+    decoded = decode(encode(value))
+    assert decoded == value
+    assert type(decoded) is type(value)
+
+
+def test_other_types_are_recorded_as_repr():
+    assert decode(encode(1.5)) == "1.5"
+
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(self.tmp, "trace.jsonl.gz")
+
+    @pytest.fixture(autouse=True)
+    def _tmp(self, tmp_path):
+        self.tmp = str(tmp_path)
+
+    def test_records_every_call_at_full_rate(self):
+        calendar = make_calendar()
+        with Recorder(self.path, sample_rate=1) as recorder:
+            recorder.attach(calendar, "test")
+            self.assertEqual(
+                calendar.add_business_days("2020-04-09", 2), datetime.date(2020, 4, 14)
+            )
+            calendar.is_business_day(datetime.date(2020, 4, 11))
+            calendar.business_days_between(
+                datetime.datetime(2020, 1, 1, 9), datetime.date(2020, 2, 1)
+            )
+        self.assertEqual(
+            list(read_trace(self.path)),
+            [
+                ("test", "add_business_days", ("2020-04-09", 2), {}),
+                ("test", "is_business_day", (datetime.date(2020, 4, 11),), {}),
+                (
+                    "test",
+                    "business_days_between",
+                    (datetime.datetime(2020, 1, 1, 9), datetime.date(2020, 2, 1)),
+                    {},
+                ),
+            ],
+        )
+        self.assertEqual(recorder.recorded, 3)
+
+    def test_records_keyword_arguments(self):
+        calendar = make_calendar()
+        with Recorder(self.path, sample_rate=1) as recorder:
+            recorder.attach(calendar, "test")
+            self.assertEqual(
+                calendar.add_business_days("2020-04-09", delta=2), datetime.date(2020, 4, 14)
+            )
+        records = list(read_trace(self.path))
+        self.assertEqual(records, [("test", "add_business_days", ("2020-04-09",), {"delta": 2})])
+        report = replay(records, {"test": make_calendar()})
+        self.assertEqual(report.errors, 0)
+        self.assertEqual(report.summary("add_business_days")["calls"], 1)
+
+    def test_records_nothing_at_zero_rate(self):
+        calendar = make_calendar()
+        with Recorder(self.path, sample_rate=0) as recorder:
+            recorder.attach(calendar, "test")
+            for _ in range(100):
+                calendar.is_business_day("2020-04-11")
+        self.assertEqual(list(read_trace(self.path)), [])
+
+    def test_only_attached_calendars_are_recorded(self):
+        calendar = make_calendar()
+        other = make_calendar()
+        with Recorder(self.path, sample_rate=1) as recorder:
+            recorder.attach(calendar, "test")
+            other.is_business_day("2020-04-11")
+            self.assertNotIn("is_business_day", other.__dict__)
+        self.assertEqual(list(read_trace(self.path)), [])
+
+    def test_detach(self):
+        calendar = make_calendar()
+        with Recorder(self.path, sample_rate=1) as recorder:
+            recorder.attach(calendar, "test")
+            Recorder.detach(calendar)
+            calendar.is_business_day("2020-04-11")
+        self.assertEqual(list(read_trace(self.path)), [])
+
+    def test_calls_after_close_are_not_recorded(self):
+        calendar = make_calendar()
+        recorder = Recorder(self.path, sample_rate=1)
+        recorder.attach(calendar, "test")
+        recorder.close()
+        self.assertTrue(calendar.is_business_day("2020-04-11"))
+        self.assertEqual(recorder.recorded, 0)
+
+    def test_pickled_calendar_is_not_recorded(self):
+        calendar = make_calendar()
+        with Recorder(self.path, sample_rate=1) as recorder:
+            recorder.attach(calendar, "test")
+            copy = pickle.loads(pickle.dumps(calendar))
+            self.assertTrue(copy.is_business_day("2020-04-11"))
+        self.assertEqual(list(read_trace(self.path)), [])
+
+    def test_invalid_sample_rate(self):
+        with self.assertRaises(ValueError):
+            Recorder(self.path, sample_rate=2)
+
+    def test_buffer_is_written_when_full(self):
+        calendar = make_calendar()
+        with Recorder(self.path, sample_rate=1, buffer_size=2) as recorder:
+            recorder.attach(calendar, "test")
+            for _ in range(5):
+                calendar.roll_forward("2020-04-10")
+        self.assertEqual(len(list(read_trace(self.path))), 5)
+
+
+def test_replay_reports_latencies():
+    calendars = {"test": make_calendar()}
+    records = [
+        ("test", "add_business_days", ("2020-04-09", 2), {}),
+        ("test", "is_business_day", (datetime.date(2020, 4, 11),), {}),
+        ("test", "is_business_day", ("2020-04-12",), {}),
+        ("test", "roll_forward", ("not a date",), {}),
+    ]
+    report = replay(records, calendars)
+    assert report.errors == 1
+    assert sorted(report.latencies) == ["add_business_days", "is_business_day"]
+    summary = report.summary()
+    assert summary["calls"] == 3
+    assert summary["calls_per_second"] > 0
+    assert summary["p50_us"] <= summary["p99_us"] <= summary["max_us"]
+    assert report.summary("is_business_day")["calls"] == 2
+    text = str(report)
+    assert "is_business_day" in text
+    assert "1 calls raised an error" in text
+
+
+def test_report_percentiles():
+    report = ReplayReport({"op": [i / 1e6 for i in range(1, 101)]}, 0)
+    summary = report.summary("op")
+    assert summary["p50_us"] == pytest.approx(50)
+    assert summary["p90_us"] == pytest.approx(90)
+    assert summary["p99_us"] == pytest.approx(99)
+    assert summary["max_us"] == pytest.approx(100)
+
+
+def test_report_without_timed_calls():
+    report = replay([("test", "roll_forward", ("not a date",), {})], {"test": make_calendar()})
+    assert report.errors == 1
+    assert report.summary() == {"calls": 0, "calls_per_second": 0}
+    assert report.summary("roll_forward")["calls"] == 0
+    assert "1 calls raised an error" in str(report)
+    assert str(ReplayReport({}, 0)).splitlines()[1].split() == ["all", "0", "0"] + ["-"] * 5
+
+
+@pytest.mark.parametrize("engine", ["reference", "intervals"])
+def test_main(tmp_path, capsys, monkeypatch, engine):
+    monkeypatch.setattr(Calendar, "load_paths", [fixture_path])
+    path = str(tmp_path / "trace.jsonl.gz")
+    calendar = Calendar.load("ecb")
+    with Recorder(path, sample_rate=1) as recorder:
+        recorder.attach(calendar, "ecb")
+        calendar.add_business_days("2013-12-23", 3)
+        calendar.business_days_between("2013-01-01", "2013-02-01")
+    main([path, "--engine", engine, "--repeat", "2"])
+    output = capsys.readouterr().out
+    assert "add_business_days" in output
+    assert "business_days_between" in output
@@ -0,0 +1,94 @@
+import datetime
+import itertools
+import random
+
+import pytest
+from dateutil.rrule import DAILY, FR, MONTHLY, WEEKLY, rrule
+
+from business.calendar import Calendar
+from business.schedule import adjust, schedule, schedule_list
+from business.window import OutsideWindowError
+
+calendar = Calendar(
+    holidays=["2020-01-01", "2020-04-10", "2020-04-13", "2020-05-08", "2020-12-25", "2020-12-28"],
+    extra_working_dates=["2020-02-29"],
+)
+start = datetime.datetime(2020, 1, 1)
+
+
+def expected(d, adjustment):
+    if adjustment == "unadjusted":
+        return d
+    if adjustment.endswith("preceding"):
+        result = calendar.roll_backward(d)
+        if adjustment.startswith("modified") and result.month != d.month:
+            result = calendar.roll_forward(d)
+    else:
+        result = calendar.roll_forward(d)
+        if adjustment.startswith("modified") and result.month != d.month:
+            result = calendar.roll_backward(d)
+    return result
+
+
+@pytest.mark.parametrize(
+    "adjustment",
+    ["following", "preceding", "modified_following", "modified_preceding", "unadjusted"],
+)
+@pytest.mark.parametrize(
+    "rule",
+    [
+        rrule(DAILY, dtstart=start, count=400),
+        rrule(WEEKLY, interval=2, dtstart=start, count=30),
+        rrule(MONTHLY, byweekday=FR(4), dtstart=start, count=12),
+        rrule(MONTHLY, bymonthday=-1, dtstart=start, count=12),
+    ],
+)
+def test_schedule_matches_calendar_rolls(rule, adjustment):
+    assert schedule_list(calendar, rule, adjustment) == [
+        expected(d.date(), adjustment) for d in rule
+    ]
+
+
+def test_modified_following_stays_in_the_month():
+    # 2020-05-31 is a Sunday, so the next business day is in June
+    assert schedule_list(calendar, ["2020-05-31"], "modified_following") == [
+        datetime.date(2020, 5, 29)
+    ]
+    assert schedule_list(calendar, ["2020-02-29"], "following") == [datetime.date(2020, 2, 29)]
+
+
+def test_schedules_are_lazy():
+    endless = rrule(WEEKLY, dtstart=start)
+    assert list(itertools.islice(schedule(calendar, endless), 3)) == [
+        datetime.date(2020, 1, 2),
+        datetime.date(2020, 1, 8),
+        datetime.date(2020, 1, 15),
+    ]
+
+
+def test_dates_in_any_order():
+    days = [datetime.date(2020, 1, 1) + datetime.timedelta(days=i) for i in range(366)]
+    random.Random(0).shuffle(days)
+    assert list(adjust(calendar, days, "preceding")) == [calendar.roll_backward(d) for d in days]
+
+
+def test_invalid_adjustment():
+    with pytest.raises(ValueError):
+        adjust(calendar, [], "nearest")
+
+
+def test_calendar_windows():
+    window = calendar.window("2020-01-01", "2020-06-27")
+    days = [datetime.date(2020, 1, 1) + datetime.timedelta(days=i) for i in range(170)]
+    assert list(adjust(window, days)) == [calendar.roll_forward(d) for d in days]
+    with pytest.raises(OutsideWindowError):
+        list(adjust(window, ["2020-12-25"]))
+    # rolling forward from Saturday 27th needs the days after the window
+    with pytest.raises(OutsideWindowError):
+        list(adjust(window, ["2020-06-27"]))
+
+    window = calendar.window("2020-01-01", "2020-06-27", fallback=True)
+    dates = ["2020-06-27", "2020-12-25", "2020-04-10"]
+    assert list(adjust(window, dates, "modified_following")) == list(
+        adjust(calendar, dates, "modified_following")
+    )
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from business.calendar import Calendar
+from business.server import BadRequest, handle_batch, handle_request, start_server
+
+fixture_path = os.path.join(os.path.dirname(__file__), "fixtures", "data")
+
+
+@pytest.fixture(autouse=True)
+def load_paths(monkeypatch):
+    monkeypatch.setattr(Calendar, "load_paths", [fixture_path])
+
+
+def test_add_business_days_batch():
+    response = handle_batch(
+        {
+            "calendar": "ecb",
+            "operation": "add_business_days",
+            "inputs": [["2013-03-28", 1], ["2013-03-28", -1], ["not a date", 1]],
+        }
+    )
+    assert response["results"] == ["2013-04-02", "2013-03-27", None]
+    assert [error["index"] for error in response["errors"]] == [2]
+
+
+def test_business_days_between_batch():
+    response = handle_batch(
+        {
+            "calendar": "ecb",
+            "operation": "business_days_between",
+            "inputs": [["2013-03-28", "2013-04-08"]],
+        }
+    )
+    assert response == {"results": [5], "errors": []}
+
+
+def test_single_argument_batch():
+    response = handle_batch(
+        {"calendar": "ecb", "operation": "is_business_day", "inputs": ["2013-03-29"]}
+    )
+    assert response["results"] == [False]
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [],
+        {"calendar": "ecb", "operation": "load", "inputs": []},
+        {"calendar": "ecb", "operation": "roll_forward", "inputs": "2013-03-29"},
+        {"calendar": "missing", "operation": "roll_forward", "inputs": []},
+    ],
+)
+def test_bad_requests(payload):
+    with pytest.raises(BadRequest):
+        handle_batch(payload)
+
+
+@pytest.mark.parametrize(
+    "name", ["../ecb", "fixtures/data/ecb", "..", "ecb.yml", "", None, ["ecb"], "ecb\n"]
+)
+def test_invalid_calendar_names(name):
+    body = json.dumps({"calendar": name, "operation": "roll_forward", "inputs": []})
+    status, response = handle_request("POST", "/batch", body.encode())
+    assert status == 400
+    assert "Invalid calendar name" in response["error"]
+
+
+def test_calendars_outside_the_load_paths_are_not_loaded(tmp_path, monkeypatch):
+    (tmp_path / "calendars").mkdir()
+    (tmp_path / "secret.yml").write_text("working_days:\n  - monday\n")
+    monkeypatch.setattr(Calendar, "load_paths", [str(tmp_path / "calendars")])
+    name = "../secret"
+    body = json.dumps({"calendar": name, "operation": "roll_forward", "inputs": []})
+    assert handle_request("POST", "/batch", body.encode())[0] == 400
+    assert name not in Calendar._cache.unlocked()
+
+
+def test_invalid_calendar_definition(tmp_path, monkeypatch):
+    (tmp_path / "broken.yml").write_text("holidays:\n  - 2020-01-01\n")
+    monkeypatch.setattr(Calendar, "load_paths", [str(tmp_path)])
+    body = json.dumps({"calendar": "broken", "operation": "roll_forward", "inputs": []})
+    status, response = handle_request("POST", "/batch", body.encode())
+    assert status == 500
+    assert "broken" in response["error"]
+
+
+async def request(port, method, path, body=b""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+    for connection in ["keep-alive", "close"]:
+        writer.write(
+            f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: {connection}\r\n\r\n".encode() + body
+        )
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()) != b"\r\n":
+            name, _, value = line.decode().partition(":")
+            headers[name.lower()] = value.strip()
+        content = await reader.readexactly(int(headers["content-length"]))
+        responses.append((status, json.loads(content)))
+    writer.close()
+    return responses
+
+
+def test_server_round_trip():
+    async def run():
+        server = await start_server(port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            body = json.dumps(
+                {"calendar": "ecb", "operation": "roll_forward", "inputs": ["2013-03-29"]}
+            ).encode()
+            batch = await request(port, "POST", "/batch", body)
+            not_found = await request(port, "GET", "/missing")
+            bad = await request(port, "POST", "/batch", b"{")
+            batches = await asyncio.gather(
+                *[request(port, "POST", "/batch", body) for _ in range(4)]
+            )
+        return batch, not_found, bad, batches
+
+    batch, not_found, bad, batches = asyncio.run(run())
+    assert batches == [batch] * 4
+    assert batch == [(200, {"results": ["2013-04-02"], "errors": []})] * 2
+    assert not_found[0][0] == 404
+    assert bad[0][0] == 400
@@ -0,0 +1,115 @@
+import datetime
+import os
+import unittest
+
+import pytest
+import yaml
+
+from business.calendar import Calendar
+from business.sources import BundleSource, DirectorySource, SQLiteSource
+
+fixture_path = os.path.join(os.path.dirname(__file__), "fixtures", "data")
+
+definitions = {
+    "tenant-1": {
+        "working_days": ["monday", "tuesday", "wednesday", "thursday", "friday"],
+        "holidays": [datetime.date(2020, 12, 25)],
+    },
+    "tenant-2": {
+        "working_days": ["monday"],
+        "extra_working_dates": ["2020-12-26"],
+    },
+}
+
+
+class TestDirectorySource(unittest.TestCase):
+    def test_get_many(self):
+        source = DirectorySource([fixture_path])
+        result = source.get_many(["bacs", "ecb"])
+        assert set(result) == {"bacs", "ecb"}
+        assert result["ecb"]["holidays"][0] == "January 1st, 2013"
+
+    def test_when_a_calendar_does_not_exist(self):
+        with pytest.raises(ValueError):
+            DirectorySource([fixture_path]).get("invalid-calendar")
+
+
+class TestBundleSource(unittest.TestCase):
+    def test_get_many(self):
+        source = BundleSource(os.path.join(fixture_path, "bundle", "calendars.yml"))
+        result = source.get_many(["tenant-1", "tenant-2"])
+        assert result["tenant-1"]["holidays"] == [datetime.date(2020, 12, 25)]
+        assert result["tenant-2"]["working_days"] == ["monday"]
+
+    def test_when_calendars_do_not_exist(self):
+        source = BundleSource(os.path.join(fixture_path, "bundle", "calendars.yml"))
+        with pytest.raises(ValueError, match="missing-1, missing-2"):
+            source.get_many(["tenant-1", "missing-1", "missing-2"])
+
+
+class TestSQLiteSource(unittest.TestCase):
+    def setUp(self):
+        self.source = SQLiteSource(":memory:")
+        self.source.put_many(definitions)
+
+    def tearDown(self):
+        self.source.close()
+
+    def test_get_many(self):
+        result = self.source.get_many(["tenant-1", "tenant-2"])
+        assert result["tenant-1"]["holidays"] == ["2020-12-25"]
+        assert result["tenant-2"]["extra_working_dates"] == ["2020-12-26"]
+
+    def test_get_many_in_several_batches(self):
+        self.source.put_many({f"tenant-{i}": definitions["tenant-1"] for i in range(3, 1203)})
+        names = [f"tenant-{i}" for i in range(1, 1203)]
+        assert list(self.source.get_many(names)) == names
+
+    def test_when_a_calendar_does_not_exist(self):
+        with pytest.raises(ValueError):
+            self.source.get("missing")
+
+    def test_working_days_from_round_trip(self):
+        definition = yaml.safe_load(
+            "working_days: [sunday, monday, tuesday, wednesday, thursday]\n"
+            "holidays: [2022-01-03]\n"
+            "working_days_from:\n"
+            "  2022-01-01: [monday, tuesday, wednesday, thursday, friday]\n"
+        )
+        assert list(definition["working_days_from"]) == [datetime.date(2022, 1, 1)]
+        self.source.put_many({"uae": definition})
+        assert self.source.get("uae")["working_days_from"] == {
+            "2022-01-01": ["monday", "tuesday", "wednesday", "thursday", "friday"]
+        }
+        calendar = Calendar.from_definition(self.source.get("uae"))
+        assert calendar.data.week == Calendar.from_definition(definition).data.week
+        assert calendar.is_business_day("2021-12-26")
+        assert calendar.is_business_day("2022-01-07")
+
+    def test_invalid_table_name(self):
+        with pytest.raises(ValueError):
+            SQLiteSource(":memory:", table="calendars; DROP TABLE calendars")
+
+
+class TestCalendarSource(unittest.TestCase):
+    def setUp(self):
+        self.source = SQLiteSource(":memory:")
+        self.source.put_many(definitions)
+        Calendar.source = self.source
+
+    def tearDown(self):
+        Calendar.source = None
+        with Calendar._cache as cache:
+            cache.pop("tenant-1", None)
+            cache.pop("tenant-2", None)
+        self.source.close()
+
+    def test_load(self):
+        calendar = Calendar.load("tenant-2")
+        assert calendar.is_business_day("2020-12-26")
+
+    def test_load_cache_many(self):
+        calendars = Calendar.load_cache_many(["tenant-1", "tenant-2", "tenant-1"])
+        assert set(calendars) == {"tenant-1", "tenant-2"}
+        assert Calendar.load_cache("tenant-1") is calendars["tenant-1"]
+        assert calendars["tenant-1"].holidays == [datetime.date(2020, 12, 25)]
@@ -0,0 +1,96 @@
+import datetime
+import unittest
+
+import pytest
+
+from business.calendar import Calendar
+from business.versioned import VersionedCalendar
+
+
+class TestVersionedCalendar(unittest.TestCase):
+    def setUp(self):
+        self.calendar = Calendar(
+            holidays=["2021-12-27", "2021-12-28", "2022-01-03", "2022-08-29"],
+            extra_working_dates=["2022-06-04"],
+        )
+        self.versioned = VersionedCalendar(self.calendar, effective_from="2021-01-01")
+        self.versioned.add_version(datetime.datetime(2022, 9, 10, 12), add_holidays=["2022-09-19"])
+        self.versioned.add_version(
+            "2022-10-01",
+            remove_holidays=["2022-09-19"],
+            add_extra_working_dates=["2022-10-01"],
+            remove_extra_working_dates=["2022-06-04"],
+        )
+
+    def test_as_of(self):
+        before = self.versioned.as_of(datetime.datetime(2022, 9, 10, 11))
+        during = self.versioned.as_of(datetime.datetime(2022, 9, 10, 12))
+        after = self.versioned.as_of("2023-01-01")
+        assert before is not self.calendar
+        assert before.is_business_day("2022-09-19")
+        assert not during.is_business_day("2022-09-19")
+        assert after.is_business_day("2022-09-19")
+        assert after.is_business_day("2022-10-01")
+        assert not after.is_business_day("2022-06-04")
+        assert during.add_business_days("2022-09-16", 1) == datetime.date(2022, 9, 20)
+
+    def test_string_timestamps_keep_their_time(self):
+        self.versioned.add_version("2022-10-03T09:00", add_holidays=["2022-10-04"])
+        self.versioned.add_version("2022-10-03T15:30:00", remove_holidays=["2022-10-04"])
+        assert self.versioned.as_of("2022-10-03T08:59").is_business_day("2022-10-04")
+        assert not self.versioned.as_of("2022-10-03T10:00").is_business_day("2022-10-04")
+        assert self.versioned.as_of("2022-10-03 15:30").is_business_day("2022-10-04")
+        assert self.versioned.version_index("2022-10-03") == 2
+
+    def test_versions_cannot_be_changed(self):
+        for timestamp in ["2021-06-01", "2022-09-11", "2023-01-01"]:
+            with pytest.raises(ValueError, match="read-only"):
+                self.versioned.as_of(timestamp).add_holidays(["2022-11-01"])
+
+    def test_changing_the_original_calendar_does_not_change_versions(self):
+        self.calendar.add_holidays(["2022-11-01"])
+        assert self.versioned.as_of("2021-06-01").is_business_day("2022-11-01")
+        assert self.versioned.latest.is_business_day("2022-11-01")
+        # rebuilt from the versions' changes once evicted from the cache
+        versioned = VersionedCalendar(self.calendar, max_cached_versions=1)
+        versioned.add_version("2023-01-01", add_holidays=["2023-01-03"])
+        self.calendar.add_holidays(["2022-11-02"])
+        assert not versioned.latest.is_business_day("2022-11-01")
+        assert versioned.latest.is_business_day("2022-11-02")
+        assert versioned.calendar(0).is_business_day("2022-11-02")
+
+    def test_versions_share_unchanged_years(self):
+        first, second, third = self.versioned.versions
+        assert second.holidays[2021] is first.holidays[2021]
+        assert second.holidays[2022] is not first.holidays[2022]
+        assert third.extra_working_dates[2022] == (datetime.date(2022, 10, 1),)
+
+    def test_versions_store_their_changes(self):
+        assert self.versioned.versions[1].added_holidays == (datetime.date(2022, 9, 19),)
+        assert self.versioned.versions[2].removed_holidays == (datetime.date(2022, 9, 19),)
+
+    def test_calendars_are_cached(self):
+        assert self.versioned.latest is self.versioned.as_of("2024-01-01")
+        assert self.versioned.latest.holidays == self.calendar.holidays
+
+    def test_when_no_version_is_effective(self):
+        with pytest.raises(ValueError):
+            self.versioned.as_of("2020-01-01")
+
+    def test_when_versions_are_added_out_of_order(self):
+        with pytest.raises(ValueError):
+            self.versioned.add_version("2022-09-01", add_holidays=["2022-09-20"])
+
+    def test_when_an_extra_working_date_is_on_a_working_day(self):
+        with pytest.raises(ValueError):
+            self.versioned.add_version("2023-01-01", add_extra_working_dates=["2023-01-02"])
+
+    def test_when_a_holiday_is_an_extra_working_date(self):
+        with pytest.raises(ValueError):
+            self.versioned.add_version("2023-01-01", add_holidays=["2022-10-01"])
+
+    def test_engine_is_kept(self):
+        versioned = VersionedCalendar(Calendar(engine="intervals"))
+        versioned.add_version("2022-01-01", add_holidays=["2022-09-19"])
+        assert versioned.latest.engine.name == "intervals"
+        assert versioned.latest.business_days_between("2022-09-19", "2022-09-20") == 0
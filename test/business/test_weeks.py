@@ -0,0 +1,115 @@
+import datetime
+import random
+import unittest
+
+import pytest
+import yaml
+
+from business.calendar import Calendar
+from business.weeks import WorkingWeek
+
+uae = {
+    "working_days": ["sunday", "monday", "tuesday", "wednesday", "thursday"],
+    "working_days_from": {
+        datetime.date(2022, 1, 1): ["monday", "tuesday", "wednesday", "thursday", "friday"]
+    },
+}
+
+
+def count_working_days(week, from_date, to_date):
+    days = range((to_date - from_date).days)
+    return sum(week.is_working_day(from_date + datetime.timedelta(days=i)) for i in days)
+
+
+class TestWorkingWeek(unittest.TestCase):
+    def setUp(self):
+        self.week = WorkingWeek(
+            ["mon", "tue", "wed", "thu", "fri"],
+            {
+                datetime.date(2020, 3, 4): ["sun", "mon", "tue", "wed", "thu"],
+                datetime.date(2020, 3, 11): [],
+                datetime.date(2020, 4, 1): ["wed"],
+            },
+        )
+
+    def test_is_working_day(self):
+        assert self.week.is_working_day(datetime.date(2020, 3, 3))
+        assert self.week.is_working_day(datetime.date(2020, 3, 5))
+        assert not self.week.is_working_day(datetime.date(2020, 3, 6))
+        assert self.week.is_working_day(datetime.date(2020, 3, 8))
+        assert not self.week.is_working_day(datetime.date(2020, 3, 12))
+        assert self.week.is_working_day(datetime.date(2020, 4, 1))
+
+    def test_count_and_select_match_a_day_by_day_count(self):
+        start = datetime.date(2020, 1, 1)
+        for i in range(150):
+            day = start + datetime.timedelta(days=i)
+            expected = count_working_days(self.week, start, day)
+            assert self.week.count_between(start, day) == expected
+            if self.week.is_working_day(day):
+                assert self.week.select(self.week.count(day.toordinal())) == day.toordinal()
+
+    def test_invalid_working_day_name(self):
+        with pytest.raises(ValueError):
+            WorkingWeek(["mon"], {datetime.date(2020, 1, 1): ["xyz"]})
+
+    def test_equality(self):
+        assert WorkingWeek(["mon", "tue"]) == WorkingWeek(["tuesday", "monday"])
+        assert WorkingWeek(["mon"]) != WorkingWeek(["mon"], {datetime.date(2020, 1, 1): ["tue"]})
+
+
+class TestCalendar(unittest.TestCase):
+    def test_from_definition(self):
+        calendar = Calendar.from_definition(
+            yaml.safe_load(
+                """
+                working_days: [sunday, monday, tuesday, wednesday, thursday]
+                working_days_from:
+                  2022-01-01: [monday, tuesday, wednesday, thursday, friday]
+                """
+            )
+        )
+        assert calendar.working_days_from == {
+            datetime.date(2022, 1, 1): ["mon", "tue", "wed", "thu", "fri"]
+        }
+        assert calendar.is_business_day("2021-12-26")
+        assert not calendar.is_business_day("2022-01-02")
+        assert calendar.business_days_between("2021-12-26", "2022-01-09") == 10
+
+    def test_extra_working_dates_cannot_be_on_working_days(self):
+        with pytest.raises(ValueError):
+            Calendar(extra_working_dates=["2022-01-07"], **uae)
+        Calendar(extra_working_dates=["2021-12-31"], **uae)
+
+    def test_fingerprint_includes_changes(self):
+        assert (
+            Calendar(working_days=uae["working_days"]).fingerprint != Calendar(**uae).fingerprint
+        )
+
+
+@pytest.mark.parametrize("engine", ["reference", "intervals"])
+@pytest.mark.parametrize("seed", range(3))
+def test_engines_across_working_week_changes(engine, seed):
+    rng = random.Random(seed)
+    start = datetime.date(2021, 6, 1)
+    days = [start + datetime.timedelta(days=rng.randrange(400)) for _ in range(40)]
+    calendar = Calendar(
+        holidays=days[:30],
+        extra_working_dates=[d for d in days[30:] if d.weekday() == 5 and d not in days[:30]],
+        engine=engine,
+        **uae,
+    )
+    for _ in range(200):
+        a = start + datetime.timedelta(days=rng.randrange(400))
+        b = a + datetime.timedelta(days=rng.randrange(200))
+        delta = rng.choice([-1, 1]) * rng.randrange(1, 40)
+        expected = sum(
+            calendar.is_business_day(a + datetime.timedelta(days=i)) for i in range((b - a).days)
+        )
+        assert calendar.business_days_between(a, b) == expected
+        result = calendar.add_business_days(a, delta)
+        assert calendar.is_business_day(result)
+        if delta > 0:
+            assert calendar.business_days_between(calendar.roll_forward(a), result) == delta
+        else:
+            assert calendar.business_days_between(result, calendar.roll_backward(a)) == -delta
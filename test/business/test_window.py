@@ -0,0 +1,120 @@
+import datetime
+import pickle
+import random
+import unittest
+
+import pytest
+
+from business.calendar import Calendar
+from business.window import OutsideWindowError
+
+holidays = [
+    datetime.date(2019, 12, 25),
+    datetime.date(2020, 1, 1),
+    datetime.date(2020, 4, 10),
+    datetime.date(2020, 4, 13),
+    datetime.date(2020, 12, 25),
+    datetime.date(2021, 1, 1),
+]
+extra_working_dates = [datetime.date(2020, 4, 11), datetime.date(2021, 4, 10)]
+
+
+class TestWindow(unittest.TestCase):
+    def setUp(self):
+        self.calendar = Calendar(holidays=holidays, extra_working_dates=extra_working_dates)
+        self.window = self.calendar.window("2020-01-01", "2020-12-31")
+
+    def test_window_only_holds_its_dates(self):
+        assert self.window.holidays == holidays[1:5]
+        assert self.window.extra_working_dates == extra_working_dates[:1]
+
+    def test_window_pickles_smaller_than_a_long_calendar(self):
+        calendar = Calendar(
+            holidays=[
+                datetime.date(1990, 1, 1) + datetime.timedelta(days=7 * i) for i in range(2000)
+            ]
+        )
+        window = calendar.window("2020-01-01", "2020-03-31")
+        assert len(window.holidays) == 13
+        assert len(pickle.dumps(window)) * 10 < len(pickle.dumps(calendar))
+        assert pickle.loads(pickle.dumps(window)).business_days_between(
+            "2020-01-01", "2020-02-01"
+        ) == calendar.business_days_between("2020-01-01", "2020-02-01")
+
+    def test_answers_inside_the_window(self):
+        assert self.window.add_business_days("2020-04-09", 1) == datetime.date(2020, 4, 11)
+        assert self.window.business_days_between("2020-01-01", "2021-01-01") == 259
+        assert self.window.get_business_day_of_month("2020-04-14") == 9
+        assert self.window.holidays_between("2020-04-01", "2020-05-01") == holidays[2:4]
+        assert self.window.next_holiday("2020-04-11") == datetime.date(2020, 4, 13)
+
+    def test_fails_outside_the_window(self):
+        for query in [
+            lambda: self.window.is_business_day("2021-01-01"),
+            lambda: self.window.business_days_between("2019-12-31", "2020-02-01"),
+            lambda: self.window.add_business_days("2020-12-30", 3),
+            lambda: self.window.add_business_days("2020-01-03", -3),
+            lambda: self.window.roll_forward("2021-01-01"),
+            lambda: self.window.next_holiday("2020-12-25"),
+            lambda: self.window.holidays_between("2020-06-01", "2021-02-01"),
+        ]:
+            with pytest.raises(OutsideWindowError):
+                query()
+
+    def test_falls_back_to_the_full_calendar(self):
+        window = self.calendar.window("2020-01-01", "2020-12-31", fallback=True)
+        assert window.add_business_days("2020-12-30", 3) == datetime.date(2021, 1, 5)
+        assert window.next_holiday("2020-12-25") == datetime.date(2021, 1, 1)
+        assert not window.is_business_day("2019-12-25")
+
+    def test_window_end_must_not_be_before_its_start(self):
+        with pytest.raises(ValueError):
+            self.calendar.window("2020-12-31", "2020-01-01")
+
+    def test_changes_must_be_within_the_window(self):
+        self.window.add_holidays(["2020-05-08"])
+        assert not self.window.is_business_day("2020-05-08")
+        assert self.calendar.is_business_day("2020-05-08")
+        with pytest.raises(OutsideWindowError):
+            self.window.add_holidays(["2021-05-07"])
+
+
+@pytest.mark.parametrize("dense", [False, True])
+def test_reversed_ranges_inside_the_window(dense):
+    calendar = Calendar(holidays=holidays, extra_working_dates=extra_working_dates)
+    window = calendar.window("2020-12-01", "2020-12-31", dense=dense)
+    assert window.business_days_between("2020-12-31", "2020-12-02") == -20
+    assert window.business_days_between("2020-12-02", "2020-12-31") == 20
+    assert window.business_days_between("2020-12-31", "2020-12-31") == 0
+    with pytest.raises(OutsideWindowError):
+        window.business_days_between("2021-01-04", "2020-12-02")
+
+
+@pytest.mark.parametrize("engine", ["reference", "intervals"])
+@pytest.mark.parametrize("dense", [False, True])
+def test_window_matches_the_full_calendar(engine, dense):
+    rng = random.Random(0)
+    calendar = Calendar(
+        holidays=[
+            datetime.date(2018, 1, 1) + datetime.timedelta(days=rng.randrange(1500))
+            for _ in range(150)
+        ],
+        engine=engine,
+    )
+    start, end = datetime.date(2019, 3, 1), datetime.date(2019, 9, 30)
+    window = calendar.window(start, end, dense=dense)
+    days = (end - start).days
+    for _ in range(300):
+        a = start + datetime.timedelta(days=rng.randrange(days + 1))
+        b = start + datetime.timedelta(days=rng.randrange(days + 1))
+        a, b = min(a, b), max(a, b)
+        delta = rng.randrange(-20, 20)
+        assert window.business_days_between(a, b) == calendar.business_days_between(a, b)
+        assert window.business_days_between(b, a) == calendar.business_days_between(b, a)
+        assert window.is_business_day(a) == calendar.is_business_day(a)
+        try:
+            result = window.add_business_days(a, delta)
+        except OutsideWindowError:
+            assert not start <= calendar.add_business_days(a, delta) <= end
+        else:
+            assert result == calendar.add_business_days(a, delta)